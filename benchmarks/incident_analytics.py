@@ -0,0 +1,132 @@
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from src.config.settings import settings
+from src.services.incident_service import IncidentCounts, IncidentService
+
+STATUSES = ["available", "available", "occupied", "stuck", "error"]
+
+Event = Tuple[float, str, str, str, Any]
+
+
+def generate(events: int, stations: int, sites: int, hours: int, seed: int) -> List[Event]:
+    rng = random.Random(seed)
+    now = time.time()
+    generated = []
+    for _ in range(events):
+        station = rng.randrange(stations)
+        at = now - rng.uniform(0, hours * 3600)
+        if rng.random() < 0.8:
+            generated.append((at, f"ST{station:06d}", f"SITE{station % sites:04d}", "check", rng.choice(STATUSES)))
+        else:
+            generated.append((at, f"ST{station:06d}", f"SITE{station % sites:04d}", "reboot", rng.random() < 0.9))
+    generated.sort()
+    return generated
+
+
+def scan(events: List[Event], hours: int, top: int) -> Dict[str, Any]:
+    """What a dashboard query costs when it re-reads every event in the window."""
+    # Same window as a report: whole buckets, ending with the current one.
+    bucket_seconds = settings.incident_bucket_seconds
+    cutoff = (int(time.time() // bucket_seconds) - hours * 3600 // bucket_seconds + 1) * bucket_seconds
+    totals = IncidentCounts()
+    sites: Dict[str, IncidentCounts] = {}
+    for at, station, site, kind, value in events:
+        if at < cutoff:
+            continue
+        counts = IncidentCounts()
+        if kind == "check":
+            counts.checks = 1
+            counts.stuck = value == "stuck"
+            counts.error = value == "error"
+        else:
+            counts.reboots = 1
+            counts.reboots_succeeded = int(value)
+        totals.merge(counts)
+        sites.setdefault(site, IncidentCounts()).merge(counts)
+    worst = sorted(sites.items(), key=lambda item: -item[1].incidents)[:top]
+    return {"totals": totals, "worst_sites": worst}
+
+
+def timed(function, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    settings.incident_snapshot_path = None
+    settings.incident_retention_hours = max(settings.incident_retention_hours, args.hours)
+    events = generate(args.events, args.stations, args.sites, args.hours, args.seed)
+
+    service = IncidentService()
+    start = time.perf_counter()
+    for at, station, site, kind, value in events:
+        if kind == "check":
+            service.record_check(station, site, value, True, now=at)
+        else:
+            service.record_reboot(station, site, value, now=at)
+    ingest_us = (time.perf_counter() - start) / len(events) * 1e6
+
+    report = service.report(args.window_hours, top=args.top)
+    scanned = scan(events, args.window_hours, args.top)
+    if report.totals != scanned["totals"].to_model():
+        raise RuntimeError(f"Bucketed totals {report.totals} differ from the scan {scanned['totals']}")
+
+    return {
+        "events": len(events),
+        "buckets": report.buckets,
+        "ingest_us_per_event": round(ingest_us, 2),
+        "bucketed_ms": round(timed(lambda: service.report(args.window_hours, top=args.top), args.repeat), 3),
+        "station_ms": round(timed(lambda: service.report(args.window_hours, station_id="ST000001"), args.repeat), 3),
+        "scan_ms": round(timed(lambda: scan(events, args.window_hours, args.top), args.repeat), 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.incident_analytics",
+        description="Compare incident reports from rolling buckets with re-scanning the raw events"
+    )
+    parser.add_argument("--events", type=int, default=500_000, help="Tool outcomes to generate")
+    parser.add_argument("--stations", type=int, default=5_000, help="Distinct stations")
+    parser.add_argument("--sites", type=int, default=500, help="Distinct sites")
+    parser.add_argument("--hours", type=int, default=168, help="Span of the generated events")
+    parser.add_argument("--window-hours", type=int, default=24, help="Window each report covers")
+    parser.add_argument("--top", type=int, default=10, help="Worst sites and stations per report")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the median is reported")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Write results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    report = run(args)
+
+    if args.json:
+        output = json.dumps(report, indent=2)
+        if args.json == "-":
+            print(output)
+            return 0
+        Path(args.json).write_text(output + "\n")
+
+    print(
+        f"events={report['events']} buckets={report['buckets']} ingest={report['ingest_us_per_event']:.2f} us/event\n"
+        f"fleet report (buckets): {report['bucketed_ms']:.3f} ms\n"
+        f"station report (buckets): {report['station_ms']:.3f} ms\n"
+        f"fleet report (scan):     {report['scan_ms']:.3f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+from langchain_core.messages import AIMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.agents.chatbot_agent import ChatbotAgent
+from src.config.settings import settings
+from src.loadtest.fake_llm import ScriptedChatModel, estimate_tokens
+from src.loadtest.fake_station import FakeStationService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+
+FIXTURES = Path(__file__).parent / "fixtures" / "llm_budget"
+PROVIDER = "bench"
+STREAM_MODE = ["messages", "updates", "custom"]
+# Headroom applied when budgets are recorded, so small prompt edits pass but
+# an extra LLM hop or a much longer prompt does not.
+TOKEN_HEADROOM = 1.1
+WALL_HEADROOM = 3.0
+MIN_WALL_BUDGET_MS = 250
+
+
+def load_fixtures(names: List[str]) -> List[Dict[str, Any]]:
+    fixtures = [json.loads(path.read_text()) for path in sorted(FIXTURES.glob("*.json"))]
+    if names:
+        unknown = set(names) - {fixture["name"] for fixture in fixtures}
+        if unknown:
+            raise SystemExit(f"Unknown fixtures: {', '.join(sorted(unknown))}")
+        fixtures = [fixture for fixture in fixtures if fixture["name"] in names]
+    return fixtures
+
+
+def make_agent(station_service: FakeStationService) -> ChatbotAgent:
+    return ChatbotAgent(
+        user_id="bench",
+        session_id=f"bench-{uuid.uuid4().hex[:8]}",
+        provider=PROVIDER,
+        llm_service=LLMService(),
+        chat_service=ChatService(),
+        station_service=station_service,
+        scenario="benchmark"
+    )
+
+
+async def replay(fixture: Dict[str, Any], station_service: FakeStationService) -> Dict[str, Any]:
+    agent = make_agent(station_service)
+    tool_schema_tokens = estimate_tokens(json.dumps([convert_to_openai_tool(tool) for tool in agent.tools]))
+
+    replies = []
+    start = time.perf_counter()
+    for turn in fixture["turns"]:
+        async for mode, chunk in agent.stream_message(turn["user"], STREAM_MODE):
+            if mode == "error":
+                raise RuntimeError(f"{fixture['name']}: {chunk.get('error')}")
+        messages = agent.graph.get_state({"configurable": {"thread_id": agent.session_id}}).values["messages"]
+        replies.append(next(msg.content for msg in reversed(messages) if isinstance(msg, AIMessage)))
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    responses = [msg for msg in messages if isinstance(msg, AIMessage)]
+    ChatService().discard_session(agent.session_id)
+    return {
+        "llm_calls": len(responses),
+        "tool_calls": sum(len(msg.tool_calls) for msg in responses),
+        "prompt_tokens": sum((msg.usage_metadata or {}).get("input_tokens", 0) for msg in responses),
+        "tool_schema_tokens": tool_schema_tokens * len(responses),
+        "wall_ms": round(wall_ms, 1),
+        "replies": replies,
+    }
+
+
+def check(fixture: Dict[str, Any], result: Dict[str, Any]) -> List[str]:
+    failures = [
+        f"{metric} {result[metric]} > budget {limit}"
+        for metric, limit in fixture.get("budget", {}).items()
+        if result[metric] > limit
+    ]
+    for index, (turn, reply) in enumerate(zip(fixture["turns"], result["replies"]), 1):
+        if "assistant" in turn and turn["assistant"] != reply:
+            failures.append(f"turn {index} reply changed: {reply!r}")
+    return failures
+
+
+def record(fixture: Dict[str, Any], result: Dict[str, Any]) -> None:
+    for turn, reply in zip(fixture["turns"], result["replies"]):
+        turn["assistant"] = reply
+    fixture["budget"] = {
+        "llm_calls": result["llm_calls"],
+        "tool_calls": result["tool_calls"],
+        "prompt_tokens": math.ceil(result["prompt_tokens"] * TOKEN_HEADROOM),
+        "tool_schema_tokens": math.ceil(result["tool_schema_tokens"] * TOKEN_HEADROOM),
+        "wall_ms": max(MIN_WALL_BUDGET_MS, math.ceil(result["wall_ms"] * WALL_HEADROOM)),
+    }
+    (FIXTURES / f"{fixture['name']}.json").write_text(json.dumps(fixture, indent=2) + "\n")
+
+
+async def run(fixtures: List[Dict[str, Any]], repeat: int) -> Dict[str, Dict[str, Any]]:
+    settings.llm_routing_enabled = False
+    LLMService().register_client(PROVIDER, ScriptedChatModel(latency_ms=0, tokens_per_second=0))
+    station_service = FakeStationService()
+    station_service.check_latency = station_service.reboot_latency = 0
+
+    results = {}
+    for fixture in fixtures:
+        runs = [await replay(fixture, station_service) for _ in range(repeat)]
+        # Counts are deterministic; wall time takes the best run to cut noise.
+        results[fixture["name"]] = min(runs, key=lambda result: result["wall_ms"])
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.llm_budget",
+        description="Replay recorded support conversations and check LLM hops, tool calls and prompt tokens"
+    )
+    parser.add_argument("scenarios", nargs="*", help="Fixture names to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the fastest is reported")
+    parser.add_argument("--json", help="Write results to this file ('-' for stdout)")
+    parser.add_argument("--record", action="store_true",
+                        help="Re-record replies and budgets into the fixtures instead of checking them")
+    args = parser.parse_args(argv)
+    # Per-turn agent logs would bury the report (and break --json -).
+    logging.disable(logging.INFO)
+
+    fixtures = load_fixtures(args.scenarios)
+    results = asyncio.run(run(fixtures, args.repeat))
+
+    failed = False
+    report = {}
+    for fixture in fixtures:
+        result = results[fixture["name"]]
+        if args.record:
+            record(fixture, result)
+            failures = []
+        else:
+            failures = check(fixture, result)
+        failed = failed or bool(failures)
+        report[fixture["name"]] = {
+            **{key: value for key, value in result.items() if key != "replies"},
+            "budget": fixture.get("budget", {}),
+            "failures": failures,
+        }
+
+    if args.json:
+        output = json.dumps(report, indent=2)
+        if args.json == "-":
+            print(output)
+        else:
+            Path(args.json).write_text(output + "\n")
+
+    if args.json != "-":
+        for name, result in report.items():
+            status = "recorded" if args.record else ("FAIL" if result["failures"] else "ok")
+            print(
+                f"{name:<18} {status:<8} llm_calls={result['llm_calls']:<3} tool_calls={result['tool_calls']:<3} "
+                f"prompt_tokens={result['prompt_tokens']:<6} tool_schema_tokens={result['tool_schema_tokens']:<6} "
+                f"wall={result['wall_ms']:.1f} ms"
+            )
+            for failure in result["failures"]:
+                print(f"    {failure}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.llm_budget import load_fixtures
+from src.agents.chatbot_agent import ChatbotAgent
+from src.config.settings import settings
+from src.loadtest.fake_llm import ScriptedChatModel
+from src.loadtest.fake_station import FakeStationService
+from src.services.cascade_service import CascadeService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService, small_provider_name
+from src.services.usage_service import UsageService
+
+PROVIDER = "bench"
+STREAM_MODE = ["messages", "updates", "custom"]
+# Everyday traffic around the support flows: greetings, thanks and questions
+# that need no tool.
+CHIT_CHAT = [
+    ["Hello", "The connector is stuck", "ST001", "Thanks!", "Bye"],
+    ["Hi there", "My station is offline", "ST002", "What's my station number?", "Thank you"],
+    ["Good morning", "Can you help me?", "How long does a reboot usually take", "Thanks"],
+    ["hey", "what is the station number", "cheers"],
+]
+
+
+def conversations() -> List[List[str]]:
+    return [[turn["user"] for turn in fixture["turns"]] for fixture in load_fixtures([])] + CHIT_CHAT
+
+
+async def replay(turns: List[str], station_service: FakeStationService) -> None:
+    agent = ChatbotAgent(
+        user_id="bench",
+        session_id=f"cascade-{uuid.uuid4().hex[:8]}",
+        provider=PROVIDER,
+        llm_service=LLMService(),
+        chat_service=ChatService(),
+        station_service=station_service,
+        scenario="benchmark"
+    )
+    for turn in turns:
+        async for mode, chunk in agent.stream_message(turn, STREAM_MODE):
+            if mode == "error":
+                raise RuntimeError(chunk.get("error"))
+    ChatService().discard_session(agent.session_id)
+
+
+def provider_usage() -> Dict[str, Dict[str, Any]]:
+    return {provider: dict(totals) for provider, totals in UsageService().summary()["providers"].items()}
+
+
+async def run_mode(enabled: bool, station_service: FakeStationService) -> Dict[str, Any]:
+    settings.llm_cascade_enabled = enabled
+    before = provider_usage()
+    start = time.perf_counter()
+    for turns in conversations():
+        await replay(turns, station_service)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    calls, tokens, llm_seconds, cost = 0, 0, 0.0, 0.0
+    for provider in (PROVIDER, small_provider_name(PROVIDER)):
+        after = provider_usage().get(provider, {})
+        previous = before.get(provider, {})
+        provider_tokens = after.get("total_tokens", 0) - previous.get("total_tokens", 0)
+        calls += after.get("requests", 0) - previous.get("requests", 0)
+        tokens += provider_tokens
+        llm_seconds += after.get("llm_seconds", 0.0) - previous.get("llm_seconds", 0.0)
+        cost += provider_tokens / 1000 * settings.llm_cascade_token_costs.get(provider, 0.0)
+
+    return {
+        "turns": sum(len(turns) for turns in conversations()),
+        "llm_calls": calls,
+        "tokens": tokens,
+        "llm_seconds": round(llm_seconds, 3),
+        "cost_usd": round(cost, 6),
+        "wall_ms": round(wall_ms, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    settings.llm_routing_enabled = False
+    settings.llm_cascade_providers = [PROVIDER]
+    settings.llm_cascade_token_costs = {PROVIDER: args.main_cost, small_provider_name(PROVIDER): args.small_cost}
+    llm_service = LLMService()
+    llm_service.register_client(PROVIDER, ScriptedChatModel(latency_ms=args.main_latency_ms, tokens_per_second=0))
+    llm_service.register_client(
+        small_provider_name(PROVIDER), ScriptedChatModel(latency_ms=args.small_latency_ms, tokens_per_second=0)
+    )
+    station_service = FakeStationService()
+    station_service.check_latency = station_service.reboot_latency = 0
+
+    baseline = await run_mode(False, station_service)
+    cascade = await run_mode(True, station_service)
+    return {"baseline": baseline, "cascade": cascade, "tiers": CascadeService().summary()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.llm_cascade",
+        description="Replay support and chit-chat conversations with and without the model cascade"
+    )
+    parser.add_argument("--main-latency-ms", type=float, default=40.0, help="Scripted main model latency per call")
+    parser.add_argument("--small-latency-ms", type=float, default=10.0, help="Scripted small model latency per call")
+    parser.add_argument("--main-cost", type=float, default=0.5, help="Main model USD per 1K tokens")
+    parser.add_argument("--small-cost", type=float, default=0.05, help="Small model USD per 1K tokens")
+    parser.add_argument("--json", help="Write results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    report = asyncio.run(run(args))
+
+    if args.json:
+        output = json.dumps(report, indent=2)
+        if args.json == "-":
+            print(output)
+            return 0
+        Path(args.json).write_text(output + "\n")
+
+    for mode in ("baseline", "cascade"):
+        result = report[mode]
+        print(
+            f"{mode:<9} turns={result['turns']:<4} llm_calls={result['llm_calls']:<4} tokens={result['tokens']:<7} "
+            f"llm={result['llm_seconds']:.3f} s cost=${result['cost_usd']:.4f} wall={result['wall_ms']:.1f} ms"
+        )
+    provider = report["tiers"]["providers"].get(PROVIDER, {})
+    for tier, totals in provider.get("tiers", {}).items():
+        print(f"  {tier:<13} share={totals['share']:.1%} turns={totals['requests']}")
+    savings = provider.get("estimated_savings", {})
+    print(f"  estimated savings: {savings.get('seconds')} s, ${savings.get('usd')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import ollama
+from langchain_core.messages import HumanMessage
+
+from src.config.settings import settings
+from src.services.llm_service import build_ollama_client
+
+PROMPT = "My charger at station ST003 is not working. What should I do?"
+
+
+async def unload(client: ollama.AsyncClient) -> None:
+    await client.generate(model=settings.ollama_model, prompt="", keep_alive=0)
+    # Unloading is asynchronous on the server; wait until the model is gone.
+    for _ in range(50):
+        loaded = await client.ps()
+        if not any(model.model.startswith(settings.ollama_model) for model in loaded.models):
+            return
+        await asyncio.sleep(0.1)
+
+
+async def measure() -> Dict[str, float]:
+    chat_model = build_ollama_client()
+    start = time.perf_counter()
+    ttft_ms = None
+    async for chunk in chat_model.astream([HumanMessage(content=PROMPT)]):
+        if ttft_ms is None and chunk.content:
+            ttft_ms = (time.perf_counter() - start) * 1000
+    return {"ttft_ms": round(ttft_ms or 0.0, 1), "total_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+async def run(warm_runs: int) -> Dict[str, Any]:
+    client = ollama.AsyncClient(host=settings.ollama_base_url)
+    await unload(client)
+    cold = await measure()
+    warm: List[Dict[str, float]] = [await measure() for _ in range(warm_runs)]
+
+    warm_ttft = [result["ttft_ms"] for result in warm]
+    return {
+        "model": settings.ollama_model,
+        "keep_alive": settings.ollama_keep_alive,
+        "num_ctx": settings.ollama_num_ctx,
+        "num_thread": settings.ollama_num_thread,
+        "cold": cold,
+        "warm": warm,
+        "warm_ttft_p50_ms": round(statistics.median(warm_ttft), 1) if warm_ttft else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.ollama_ttft",
+        description="Compare time to first token for an unloaded Ollama model against a resident one"
+    )
+    parser.add_argument("--warm-runs", type=int, default=5, help="Requests measured after the model is loaded")
+    parser.add_argument("--json", help="Write results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    try:
+        report = asyncio.run(run(args.warm_runs))
+    except (ConnectionError, ollama.ResponseError) as e:
+        print(f"Cannot benchmark Ollama at {settings.ollama_base_url}: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        output = json.dumps(report, indent=2)
+        if args.json == "-":
+            print(output)
+            return 0
+        Path(args.json).write_text(output + "\n")
+
+    print(f"model={report['model']} keep_alive={report['keep_alive']} "
+          f"num_ctx={report['num_ctx']} num_thread={report['num_thread']}")
+    print(f"cold  ttft={report['cold']['ttft_ms']:>8.1f} ms  total={report['cold']['total_ms']:>8.1f} ms")
+    for index, result in enumerate(report["warm"], 1):
+        print(f"warm{index:<2}ttft={result['ttft_ms']:>8.1f} ms  total={result['total_ms']:>8.1f} ms")
+    if report["warm_ttft_p50_ms"] is not None:
+        print(f"warm ttft p50 {report['warm_ttft_p50_ms']:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from typing import Callable, Dict, List
+
+from src.config.settings import settings
+from src.models.schemas import ChatMessage, ChatSession
+from src.services.chat_service import SessionRecord
+
+# Every line has a placeholder so each message owns its text, as real
+# transcripts do, instead of sharing one constant string.
+USER_LINES = [
+    "Hi, the connector at station ST{:03d} is stuck and I can't unplug my car",
+    "It's station ST{:03d}",
+    "Yes please reboot ST{:03d}",
+    "Thanks, ST{:03d} works now",
+    "The screen at ST{:03d} says the station is offline, can you check it?",
+]
+ASSISTANT_LINES = [
+    "I can help with that. Is ST{:03d} the ID printed on the front panel of the station?",
+    "Checking station ST{:03d}... The connector is stuck. Would you like me to reboot the station?",
+    "Done! Station ST{:03d} is rebooting... If you have any other questions, please ask",
+    "You're welcome! Station ST{:03d} should be ready for your car now.",
+]
+
+
+def conversation(rng: random.Random, messages: int) -> List[tuple]:
+    station = rng.randint(1, 999)
+    return [
+        ("user", rng.choice(USER_LINES).format(station)) if i % 2 == 0
+        else ("assistant", rng.choice(ASSISTANT_LINES).format(station))
+        for i in range(messages)
+    ]
+
+
+def build_legacy(sessions: int, messages: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        ChatSession(
+            session_id=f"session-{i}", user_id="bench",
+            messages=[ChatMessage(role=role, content=content) for role, content in conversation(rng, messages)]
+        )
+        for i in range(sessions)
+    ]
+
+
+def build_compact(sessions: int, messages: int, seed: int) -> list:
+    rng = random.Random(seed)
+    records = []
+    for i in range(sessions):
+        session = SessionRecord(f"session-{i}", "bench")
+        for role, content in conversation(rng, messages):
+            session.transcript.append(role, content)
+        records.append(session)
+    return records
+
+
+def measure(build: Callable[[int, int, int], list], sessions: int, messages: int, seed: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build(sessions, messages, seed)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del built
+    return used
+
+
+def run(sessions: int, messages: int, seed: int) -> Dict[str, dict]:
+    # Message text is generated inside the measured region and only kept by
+    # the store, so compressed variants are credited for the text they drop.
+    total_messages = sessions * messages
+
+    variants = {"legacy_pydantic": (build_legacy, None), "compact": (build_compact, 0),
+                "compact_compressed": (build_compact, settings.transcript_live_messages or 40)}
+    report = {}
+    live = settings.transcript_live_messages
+    try:
+        for name, (build, live_messages) in variants.items():
+            if live_messages is not None:
+                settings.transcript_live_messages = live_messages
+            used = measure(build, sessions, messages, seed)
+            report[name] = {
+                "bytes": used,
+                "bytes_per_message": round(used / total_messages, 1),
+                "bytes_per_session": round(used / sessions, 1),
+            }
+    finally:
+        settings.transcript_live_messages = live
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.transcript_memory",
+        description="Heap used by session transcripts: pydantic messages versus the compact store"
+    )
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=120, help="Messages per session")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.sessions, args.messages, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Sessions: {args.sessions}  Messages per session: {args.messages}")
+    baseline = report["legacy_pydantic"]["bytes"]
+    for name, result in report.items():
+        print(
+            f"  {name:<20} {result['bytes'] / 2**20:8.1f} MiB  "
+            f"{result['bytes_per_message']:7.1f} B/message  {result['bytes_per_session']:10.1f} B/session  "
+            f"({result['bytes'] / baseline:.0%} of legacy)"
+        )
+
+
+if __name__ == "__main__":
+    main()
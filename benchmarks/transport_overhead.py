@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import websockets
+
+from src.loadtest.driver import in_process_server, percentile
+from src.loadtest.fake_station import FakeStationService
+
+PROVIDER = "fake"
+# Answered by the scripted model in one call without tools, so the turn is
+# almost all transport and request handling.
+MESSAGE = "Hello, can you help me?"
+
+
+async def sse_session(base_url: str, turns: int) -> List[float]:
+    session_id = f"sse-{uuid.uuid4().hex[:8]}"
+    payload = {"messages": [{"role": "user", "content": MESSAGE}], "provider": PROVIDER, "session_id": session_id}
+    headers = {"Accept": "text/event-stream", "Content-Type": "application/json"}
+
+    latencies = []
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        for _ in range(turns):
+            start = time.perf_counter()
+            async with client.stream("POST", f"{base_url}/chat/completions", json=payload, headers=headers) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line == "data: [DONE]":
+                        break
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def ws_session(base_url: str, turns: int) -> List[float]:
+    url = base_url.replace("http://", "ws://") + f"/chat/ws?provider={PROVIDER}&session_id=ws-{uuid.uuid4().hex[:8]}"
+
+    latencies = []
+    async with websockets.connect(url) as connection:
+        json.loads(await connection.recv())
+        for _ in range(turns):
+            start = time.perf_counter()
+            await connection.send(json.dumps({"type": "message", "content": MESSAGE}))
+            while True:
+                frame = json.loads(await connection.recv())
+                if frame["type"] in ("done", "cancelled", "error"):
+                    break
+            if frame["type"] != "done":
+                raise RuntimeError(f"Turn ended with {frame}")
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def measure(session, base_url: str, sessions: int, turns: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(session(base_url, turns) for _ in range(sessions)))
+    duration = time.perf_counter() - start
+
+    # The first turn of a session also creates its agent; leave it out.
+    latencies = [latency * 1000 for result in results for latency in result[1:]]
+    return {
+        "turns": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "turns_per_second": round(sessions * turns / duration, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    station_service = FakeStationService()
+    station_service.check_latency = station_service.reboot_latency = 0
+
+    report = {}
+    async with in_process_server(latency_ms=0, tokens_per_second=0) as base_url:
+        # One untimed round of each warms imports, the graph and the pools.
+        await sse_session(base_url, 2)
+        await ws_session(base_url, 2)
+        for _ in range(args.repeat):
+            for name, session in (("sse", sse_session), ("websocket", ws_session)):
+                result = await measure(session, base_url, args.sessions, args.turns)
+                if name not in report or result["p50_ms"] < report[name]["p50_ms"]:
+                    report[name] = result
+
+    report["saved_per_turn_ms"] = round(report["sse"]["p50_ms"] - report["websocket"]["p50_ms"], 2)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.transport_overhead",
+        description="Compare per-turn overhead of the SSE endpoint and the WebSocket endpoint"
+    )
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions per transport")
+    parser.add_argument("--turns", type=int, default=50, help="Turns per session")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per transport; the lowest p50 is reported")
+    parser.add_argument("--json", help="Write results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    report = asyncio.run(run(args))
+
+    if args.json:
+        output = json.dumps(report, indent=2)
+        if args.json == "-":
+            print(output)
+            return 0
+        Path(args.json).write_text(output + "\n")
+
+    for name in ("sse", "websocket"):
+        result = report[name]
+        print(
+            f"{name:<10} turns={result['turns']:<5} mean={result['mean_ms']:.2f} ms p50={result['p50_ms']:.2f} ms "
+            f"p95={result['p95_ms']:.2f} ms p99={result['p99_ms']:.2f} ms {result['turns_per_second']} turns/s"
+        )
+    print(f"WebSocket saves {report['saved_per_turn_ms']:.2f} ms per turn at p50")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import re
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from src.config.settings import settings
+
+DETERMINISTIC = "deterministic"
+SMALL = "small"
+MAIN = "main"
+TIERS = (DETERMINISTIC, SMALL, MAIN)
+
+STATION_ID_INSTRUCTIONS = (
+    "To find your station number:\n"
+    "1. Look for a sticker or plate on the charging station\n"
+    "2. The station number usually starts with 'ST' followed by numbers (e.g., ST001)\n"
+    "3. It's typically located near the charging connector or on the front panel\n"
+    "4. If you can't find it, look for a QR code that might contain the station ID"
+)
+
+STATION_ID_PATTERN = re.compile(r"\bST\d+\b", re.IGNORECASE)
+# Anything that may lead to a status check or a reboot goes to the main model,
+# including bare confirmations, which only make sense against earlier context.
+TOOL_INTENT_PATTERN = re.compile(
+    r"\d|\b(?:stuck|reboot\w*|restart\w*|reset|offline|online|status|connector|cable|plug\w*|charg\w*|"
+    r"broken|error|fault\w*|working|site|bays?|other|yes|yeah|yep|sure|ok(?:ay)?|please|go ahead|do it|anyway)\b"
+)
+_FILLER = r"(?:\s+(?:there|again|so much|a lot|very much|all|everyone|team))*"
+DETERMINISTIC_PATTERNS = [
+    ("greeting", re.compile(rf"(?:hi|hello|hey|hiya|good (?:morning|afternoon|evening)){_FILLER}")),
+    ("thanks", re.compile(rf"(?:(?:great|perfect|awesome|cool)\s+)?(?:thanks?|thank you|thx|ty|cheers){_FILLER}")),
+    ("goodbye", re.compile(rf"(?:bye|goodbye|see you|that's all|that is all){_FILLER}")),
+    ("station_number", re.compile(
+        r"(?:what(?:'s| is)|where(?:'s| is| can i find)|how (?:do|can) i find) (?:my |the )?"
+        r"station (?:number|id)(?: again)?"
+    )),
+]
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s']", " ", text.lower())).strip()
+
+
+def classify_turn(messages: List[BaseMessage]) -> Tuple[str, str]:
+    """Pick the cheapest tier that can answer the latest user message.
+
+    Returns ``(tier, reason)``. Only the first model call of a turn is
+    classified; once a tool has run the turn stays on the main model.
+    """
+    if not messages or not isinstance(messages[-1], HumanMessage):
+        return MAIN, "tool_followup"
+
+    text = _clean(str(messages[-1].content))
+    if STATION_ID_PATTERN.search(text) or TOOL_INTENT_PATTERN.search(text):
+        return MAIN, "tool_intent"
+
+    if settings.llm_cascade_deterministic:
+        for reason, pattern in DETERMINISTIC_PATTERNS:
+            if pattern.fullmatch(text):
+                return DETERMINISTIC, reason
+
+    previous = next((msg for msg in reversed(messages[:-1]) if isinstance(msg, AIMessage)), None)
+    if previous is not None and (previous.tool_calls or str(previous.content).rstrip().endswith("?")):
+        return MAIN, "answer"
+
+    if len(text.split()) <= settings.llm_cascade_max_simple_words:
+        return SMALL, "short"
+    return MAIN, "long"
+
+
+def _last_station_id(messages: List[BaseMessage]) -> Optional[str]:
+    for msg in reversed(messages):
+        if isinstance(msg, AIMessage):
+            for tool_call in reversed(msg.tool_calls):
+                if "station_id" in tool_call.get("args", {}):
+                    return tool_call["args"]["station_id"]
+        if isinstance(msg, HumanMessage):
+            matches = STATION_ID_PATTERN.findall(str(msg.content))
+            if matches:
+                return matches[-1].upper()
+    return None
+
+
+def deterministic_reply(reason: str, messages: List[BaseMessage]) -> str:
+    if reason == "greeting":
+        if sum(isinstance(msg, HumanMessage) for msg in messages) > 1:
+            return "Hello again! How can I help with your charging station?"
+        return (
+            "Welcome to the EV Station Support! I can help with common issues like "
+            "'Connector is stuck' or 'Reboot station'."
+        )
+    if reason == "thanks":
+        return "You're welcome! If you have any other questions, please ask."
+    if reason == "goodbye":
+        return "Goodbye, and happy charging!"
+    if reason == "station_number":
+        station_id = _last_station_id(messages)
+        if station_id:
+            return f"You told me your station number is {station_id}."
+        return f"Please tell me your station ID. {STATION_ID_INSTRUCTIONS}"
+    raise ValueError(f"No deterministic reply for {reason}")
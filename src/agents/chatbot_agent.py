@@ -1,7 +1,9 @@
-from typing import Dict, Any, List, Annotated
-import traceback
+import asyncio
+import time
+from functools import partial
+from typing import Dict, Any, List, Annotated, Optional
 
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage, RemoveMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from langgraph.graph.state import CompiledStateGraph
@@ -12,15 +14,37 @@ from langgraph.prebuilt import ToolNode, tools_condition
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.config import get_stream_writer
 
+from src.agents.cascade import DETERMINISTIC, MAIN, SMALL, STATION_ID_INSTRUCTIONS, classify_turn, deterministic_reply
+from src.agents.deadline import degraded_reply, pending_result, remaining
+from src.agents.history import compact_history, summarize_tool_result
+from src.agents.turn_queue import SessionTurnQueue
 from src.services.station_service import StationService
 from src.services.chat_service import ChatService
 from src.services.llm_service import LLMService
-from src.models.schemas import ChatMessage, RebootRequest
+from src.services.usage_service import UsageService
+from src.services.cascade_service import CascadeService
+from src.services.fleet_health_service import FleetHealthService
+from src.services.incident_service import IncidentService
+from src.services.station_event_service import StationEventService
+from src.models.schemas import RebootRequest
 from src.config.settings import settings
 from src.utils import setup_logger
+from src.utils.metrics import (
+    DEADLINE_MISSES, LLM_REQUEST_SECONDS, LLM_TOOL_CALLS, NODE_SECONDS, TOOL_SECONDS, TURN_QUEUE_COALESCED, observe
+)
 
 logger = setup_logger(__name__)
 
+STATION_UPDATES = "station_updates"
+
+
+def describe_duration(seconds: int) -> str:
+    if seconds % 60:
+        return f"{seconds} second{'s' if seconds != 1 else ''}"
+    minutes = seconds // 60
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
 
@@ -39,14 +63,14 @@ async def send_checking_message() -> Dict[str, str]:
         Dict[str, str]: A dictionary containing the message that was sent
     """
     message = " Checking... please wait "
-    logger.info(f"[TOOL] Sending intermediate message: {message}")
+    logger.debug("[TOOL] Sending intermediate message: %s", message)
 
     try:
         writer = get_stream_writer()
         if writer:
             writer({"intermediate_message": message})
     except Exception as e:
-        logger.error(f"[TOOL] Error sending stream: {e}")
+        logger.error("[TOOL] Error sending stream: %s", e)
     
     return {"message": message}
 
@@ -65,14 +89,14 @@ async def send_rebooting_message() -> Dict[str, str]:
         Dict[str, str]: A dictionary containing the message that was sent
     """
     message = " Rebooting the station... please wait "
-    logger.info(f"[TOOL] Sending intermediate message: {message}")
+    logger.debug("[TOOL] Sending intermediate message: %s", message)
 
     try:
         writer = get_stream_writer()
         if writer:
             writer({"intermediate_message": message})
     except Exception as e:
-        logger.error(f"[TOOL] Error sending stream: {e}")
+        logger.error("[TOOL] Error sending stream: %s", e)
     
     return {"message": message}
 
@@ -84,13 +108,7 @@ async def get_station_instructions() -> Dict[str, Any]:
     Returns:
         A dictionary with instructions
     """
-    return {
-        "instructions": "To find your station number:\n"
-            "1. Look for a sticker or plate on the charging station\n"
-            "2. The station number usually starts with 'ST' followed by numbers (e.g., ST001)\n"
-            "3. It's typically located near the charging connector or on the front panel\n"
-            "4. If you can't find it, look for a QR code that might contain the station ID"
-    }
+    return {"instructions": STATION_ID_INSTRUCTIONS}
 
 
 class ChatbotAgent:
@@ -101,19 +119,27 @@ class ChatbotAgent:
         provider: str = None,
         llm_service: LLMService = None,
         chat_service: ChatService = None,
-        station_service: StationService = None
+        station_service: StationService = None,
+        scenario: str = None,
+        incident_service: IncidentService = None,
+        usage_service: UsageService = None,
+        cascade_service: CascadeService = None,
+        station_event_service: StationEventService = None
     ):
         self.user_id = user_id
         self.session_id = session_id
         self.provider = provider or settings.llm_provider
+        self.scenario = scenario
 
         self.llm_service = llm_service
         self.chat_service = chat_service
         self.station_service = station_service
+        self.incident_service = incident_service or IncidentService()
+        self.usage_service = usage_service or UsageService()
+        self.cascade_service = cascade_service or CascadeService()
+        self.station_event_service = station_event_service or StationEventService()
         
-        self.chat_session = self.chat_service.get_session(session_id)
-        if not self.chat_session:
-            self.chat_session = self.chat_service.create_session(user_id, session_id)
+        self.chat_service.ensure_session(user_id, session_id)
         
         self.llm = self.llm_service.get_llm(provider)
 
@@ -122,12 +148,15 @@ class ChatbotAgent:
             send_rebooting_message,
             get_station_instructions,
             self._create_check_station_status_tool(),
-            self._create_reboot_station_tool()
+            self._create_reboot_station_tool(),
+            self._create_check_site_status_tool()
         ]
 
         self.llm_with_tools = self.llm.bind_tools(self.tools)
+        self._models_with_tools = {self.llm_service.resolve_provider(provider): self.llm_with_tools}
         self.memory = MemorySaver()
         self.graph = self._build_graph()
+        self.turn_queue = SessionTurnQueue(session_id, settings.turn_queue_max_depth)
     
     def _create_check_station_status_tool(self):
         async def check_station_status(station_id: str) -> Dict[str, Any]:
@@ -139,12 +168,18 @@ class ChatbotAgent:
             Returns:
                 A dictionary with the station status information
             """
-            logger.info(f"Checking status for station: {station_id}")
-            status = await self.station_service.check_station_status(station_id)
+            station_id = self.station_service.resolve_station_id(station_id)
+            logger.info("Checking status for station: %s", station_id)
+            with observe(TOOL_SECONDS, turn_field="tools", tool="check_station_status") as timer:
+                status = await self.station_service.check_station_status(station_id)
+                if not status:
+                    timer.set_outcome("not_found")
             
             if not status:
                 return {"found": False, "message": f"Station {station_id} not found"}
-            
+
+            self.incident_service.record_check(station_id, status.site_id, status.connector_status, status.is_online)
+            self.station_event_service.watch(self.session_id, station_id)
             return {
                 "found": True,
                 "is_online": status.is_online,
@@ -155,6 +190,40 @@ class ChatbotAgent:
             }
         return check_station_status
 
+    def _create_check_site_status_tool(self):
+        async def check_site_status(station_id: str) -> Dict[str, Any]:
+            """Check whether other charging bays at the same site as a station are affected.
+
+            Args:
+                station_id: The ID of a station at the site (e.g., ST001)
+
+            Returns:
+                A dictionary with the health of every station at the site
+            """
+            station_id = self.station_service.resolve_station_id(station_id)
+            logger.info("Checking site health for station: %s", station_id)
+            with observe(TOOL_SECONDS, turn_field="tools", tool="check_site_status") as timer:
+                site = FleetHealthService(self.station_service).station_site_health(station_id)
+                if not site:
+                    timer.set_outcome("not_found")
+
+            if not site:
+                return {"found": False, "message": f"No site information for station {station_id}"}
+
+            affected = [station for station in site.stations if station.issue and station.station_id != station_id]
+            return {
+                "found": True,
+                "site_id": site.site_id,
+                "total_bays": site.total,
+                "unhealthy_bays": site.unhealthy,
+                "other_affected": [
+                    {"station_id": station.station_id, "issue": station.issue} for station in affected
+                ],
+                "message": f"{len(affected)} other bay(s) at site {site.site_id} have problems"
+                    if affected else f"No other bays at site {site.site_id} are affected"
+            }
+        return check_site_status
+
     def _create_reboot_station_tool(self):
         async def reboot_station(station_id: str) -> Dict[str, Any]:
             """Reboot an EV charging station when the connector is stuck or unresponsive.
@@ -165,19 +234,22 @@ class ChatbotAgent:
             Returns:
                 A dictionary with the reboot result
             """
-            if self.chat_service.should_reset_reboot_count(self.session_id):
+            station_id = self.station_service.resolve_station_id(station_id)
+            if self.chat_service.should_reset_reboot_count(self.session_id, settings.reboot_window_seconds):
                 self.chat_service.reset_reboot_count(self.session_id)
 
             reboot_count = self.chat_service.get_reboot_count(self.session_id)
-            if reboot_count >= 3:
-                logger.info("Station reboot attempts are blocked as you have used 3 attempts.")
+            if reboot_count >= settings.reboot_limit:
+                logger.info("Station reboot attempts are blocked as you have used %d attempts.", reboot_count)
+                TOOL_SECONDS.labels(tool="reboot_station", outcome="blocked").observe(0)
                 return {
                     "success": False,
                     "station_id": station_id,
-                    "message": "Station reboot attempts are blocked as you have used 3 attempts. Please try again after 5 minutes. Thank you."
+                    "message": f"Station reboot attempts are blocked as you have used {reboot_count} attempts. "
+                               f"Please try again after {describe_duration(settings.reboot_window_seconds)}. Thank you."
                 }
                 
-            logger.info(f"Rebooting station: {station_id}, reboot count: {reboot_count}")
+            logger.info("Rebooting station: %s, reboot count: %s", station_id, reboot_count)
             self.chat_service.increment_reboot_count(self.session_id)
 
             request = RebootRequest(
@@ -185,7 +257,18 @@ class ChatbotAgent:
                 reason="User requested reboot due to stuck connector"
             )
 
-            result = await self.station_service.reboot_station(request)
+            async def perform_reboot():
+                with observe(TOOL_SECONDS, turn_field="tools", tool="reboot_station") as timer:
+                    reboot_result = await self.station_service.reboot_station(request)
+                    timer.set_outcome("success" if reboot_result.success else "failed")
+                logger.info("Reboot of station %s finished: %s", station_id, reboot_result.message)
+                station = self.station_service.registry.get(station_id)
+                self.incident_service.record_reboot(station_id, station.site_id if station else None, reboot_result.success)
+                return reboot_result
+
+            # Let a reboot that was already sent finish even if the turn is cancelled.
+            result = await asyncio.shield(perform_reboot())
+            self.station_event_service.watch(self.session_id, station_id)
             
             return {
                 "success": result.success,
@@ -197,17 +280,19 @@ class ChatbotAgent:
     def _build_graph(self) -> CompiledStateGraph:
         graph_builder = StateGraph(AgentState)
         
-        def chatbot_node(state: AgentState) -> Dict[str, Any]:
-            logger.info(f"[AGENT] Processing in chatbot_node with {len(state['messages'])} messages")
+        async def chatbot_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+            with observe(NODE_SECONDS, node="chatbot"):
+                return await call_model(state, config)
 
-            for msg in state["messages"]:
-                self.chat_service.add_agent_message(self.session_id, msg)
+        async def call_model(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+            logger.debug("[AGENT] Processing in chatbot_node with %d messages", len(state["messages"]))
 
             messages = state["messages"]
             system_message_content = (
                 "You are an EV charging station assistant. Your main task is to help users reboot stations "
                 "when connectors are stuck or unresponsive. "
-                "If they've requested 3 or more reboots in the last 5 minutes, "
+                f"If they've requested {settings.reboot_limit} or more reboots in the last "
+                f"{describe_duration(settings.reboot_window_seconds)}, "
                 "inform them they've reached the limit and suggest contacting support. "
                 "Otherwise, help them reboot their station. "
                 "\n\nYou MUST STRICTLY follow this EXACT sequence when helping with station issues:\n"
@@ -227,6 +312,8 @@ class ChatbotAgent:
                 "- You MAY use check_station_status with a station ID that the user has already provided in the current conversation.\n"
                 "- You MAY reboot a station if either: (1) check_station_status confirms the connector is problematic, OR (2) the station is offline AND the user insists on rebooting.\n"
                 "- If the user says 'station is offline' or similar, still ask for the specific station ID.\n"
+                "- If the user asks whether other bays or chargers at the same location are affected, "
+                "use the check_site_status tool with a station ID they provided.\n"
                 "\n"
                 "When a user first connects, welcome them with 'Welcome to the EV Station Support!' and "
                 "suggest they can ask for help with common issues like 'Connector is stuck' or 'Reboot station'."
@@ -234,7 +321,7 @@ class ChatbotAgent:
             
             system_message_found = False
             for i, msg in enumerate(messages):
-                if isinstance(msg, SystemMessage):
+                if isinstance(msg, SystemMessage) and msg.name != STATION_UPDATES:
                     messages[i] = SystemMessage(content=system_message_content)
                     system_message_found = True
                     break
@@ -242,20 +329,71 @@ class ChatbotAgent:
             if not system_message_found:
                 messages.insert(0, SystemMessage(content=system_message_content))
             
-            response = self.llm_with_tools.invoke(messages)
-            logger.info(f"[AGENT] Generated response: {response.content[:50]}...")
-
-            self.chat_service.add_agent_message(self.session_id, response)
+            if settings.history_compaction_enabled:
+                messages = compact_history(messages)
+
+            # A streamed turn was admitted against a routed provider; keep to it.
+            provider = (config.get("configurable") or {}).get("provider") or self.route_provider()
+            tier, reason = MAIN, None
+            if CascadeService.applies_to(provider) and isinstance(messages[-1], HumanMessage):
+                tier, reason = classify_turn(messages)
+
+            if tier == DETERMINISTIC:
+                self.cascade_service.record(provider, tier, reason, 0.0)
+                return {"messages": [AIMessage(content=deterministic_reply(reason, messages))]}
+
+            call_provider = provider
+            # The small model is served by the same provider and counts against its admission lease.
+            if tier == SMALL:
+                call_provider = self.llm_service.small_provider(provider)
+                if call_provider is None:
+                    tier, call_provider = MAIN, provider
+
+            timeout = remaining(config)
+            if timeout is not None and timeout <= 0:
+                logger.warning("No time left for an LLM call in session %s", self.session_id)
+                DEADLINE_MISSES.labels(stage="llm", target=call_provider).inc()
+                return {"messages": [AIMessage(content=degraded_reply(messages))]}
+
+            model = self._model_for_call(call_provider)
+            call_start = time.perf_counter()
+            with observe(LLM_REQUEST_SECONDS, turn_field="llm", provider=call_provider) as timer:
+                try:
+                    response = await asyncio.wait_for(model.ainvoke(messages), timeout)
+                except asyncio.TimeoutError:
+                    timer.set_outcome("timeout")
+                    response = None
+            call_seconds = time.perf_counter() - call_start
+            if response is None:
+                logger.warning("LLM call on %s missed the turn deadline in session %s", call_provider, self.session_id)
+                DEADLINE_MISSES.labels(stage="llm", target=call_provider).inc()
+                return {"messages": [AIMessage(content=degraded_reply(messages))]}
+            self.usage_service.record(self.session_id, call_provider, response, call_seconds, scenario=self.scenario)
+            if reason is not None:
+                self.cascade_service.record(provider, tier, reason, call_seconds, response)
+            logger.debug("[AGENT] Generated response: %.50s...", response.content)
 
             if hasattr(response, "tool_calls") and response.tool_calls:
                 for tool_call in response.tool_calls:
-                    logger.info(f"Tool with name {tool_call.get("name")} is called")
+                    LLM_TOOL_CALLS.labels(provider=call_provider, tool=tool_call.get("name")).inc()
+                    logger.info("Tool with name %s is called", tool_call.get("name"))
             
             return {"messages": [response]}
         
-        graph_builder.add_node("chatbot", chatbot_node)
         tool_node = ToolNode(tools=self.tools)
-        graph_builder.add_node("tools", tool_node)
+
+        async def tools_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+            with observe(NODE_SECONDS, node="tools"):
+                timeout = remaining(config)
+                if timeout is None:
+                    return await tool_node.ainvoke(state, config)
+                return await self._run_tools_until(
+                    tool_node, state["messages"][-1].tool_calls, config,
+                    timeout - settings.turn_deadline_reserve_ms / 1000
+                )
+
+        graph_builder.add_node("chatbot", chatbot_node)
+        graph_builder.add_node("tools", tools_node)
 
         graph_builder.add_conditional_edges(
             "chatbot",
@@ -269,40 +407,155 @@ class ChatbotAgent:
         return graph_builder.compile(checkpointer=self.memory)
 
 
-    async def stream_message(self, message: str, stream_mode):
-        logger.info(f"Streaming message: {message}")
+    async def _run_tools_until(
+        self, tool_node: ToolNode, tool_calls: List[Dict[str, Any]], config: RunnableConfig, timeout: float
+    ) -> Dict[str, Any]:
+        """Run tool calls until the timeout, leaving slower ones to finish in the background.
 
-        self.chat_service.add_message(
-            self.session_id,
-            ChatMessage(role="user", content=message)
-        )
+        A call that misses the deadline is answered with a pending result and
+        reports to the session as a station update once it completes.
+        """
+        tasks = [asyncio.create_task(tool_node.ainvoke([tool_call], config)) for tool_call in tool_calls]
+        try:
+            await asyncio.wait(tasks, timeout=max(0.0, timeout))
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        messages: List[BaseMessage] = []
+        for tool_call, task in zip(tool_calls, tasks):
+            if task.done():
+                messages.extend(task.result()["messages"])
+                continue
+
+            logger.warning("Tool %s missed the turn deadline in session %s", tool_call["name"], self.session_id)
+            DEADLINE_MISSES.labels(stage="tool", target=tool_call["name"]).inc()
+            task.add_done_callback(partial(self._follow_up, tool_call))
+            messages.append(ToolMessage(
+                content=pending_result(tool_call["name"], tool_call["args"]),
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"]
+            ))
+        return {"messages": messages}
+
+    def _follow_up(self, tool_call: Dict[str, Any], task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Background %s failed for session %s: %s", tool_call["name"], self.session_id, task.exception())
+            return
+
+        for message in task.result()["messages"]:
+            summary = summarize_tool_result(tool_call["name"], tool_call["args"], message.content)
+            if summary:
+                logger.info("Following up on %s for session %s", tool_call["name"], self.session_id)
+                self.station_event_service.notify(self.session_id, f"Result of a check that finished after the reply: {summary}")
+
+    def route_provider(self) -> str:
+        """Provider the next model call goes to once budget routing is applied."""
+        return self.llm_service.resolve_provider(self.provider)
+
+    def _model_for_call(self, provider: str):
+        model = self._models_with_tools.get(provider)
+        if model is None:
+            model = self._models_with_tools[provider] = self.llm_service.get_llm(provider).bind_tools(self.tools)
+        return model
+
+    def _station_updates(self) -> List[SystemMessage]:
+        updates = self.station_event_service.drain(self.session_id)
+        if not updates:
+            return []
+
+        logger.info("Passing %d station update(s) to session %s", len(updates), self.session_id)
+        return [SystemMessage(
+            name=STATION_UPDATES,
+            content="Station updates received since the user's last message (tell the user if relevant):\n"
+                + "\n".join(updates)
+        )]
+
+    @staticmethod
+    def _turn_station_ids(messages: List[BaseMessage]) -> List[str]:
+        station_ids = []
+        for msg in reversed(messages):
+            if isinstance(msg, HumanMessage):
+                break
+            if isinstance(msg, AIMessage):
+                station_ids.extend(
+                    tool_call["args"]["station_id"] for tool_call in msg.tool_calls
+                    if "station_id" in tool_call.get("args", {})
+                )
+        return station_ids
+
+    @staticmethod
+    def _close_interrupted_tool_calls(messages: List[BaseMessage]) -> List[ToolMessage]:
+        answered = {msg.tool_call_id for msg in messages if isinstance(msg, ToolMessage)}
+        return [
+            ToolMessage(
+                content="Interrupted by the user before the result was reported. The operation may still have completed.",
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"]
+            )
+            for msg in messages if isinstance(msg, AIMessage)
+            for tool_call in msg.tool_calls if tool_call["id"] not in answered
+        ]
+
+    async def stream_message(
+        self, message: str, stream_mode, budget: Optional[float] = None, provider: Optional[str] = None
+    ):
+        """Run one turn, yielding ``(mode, chunk)`` pairs from the graph.
 
-        human_message = HumanMessage(content=message)
+        With a ``budget`` in seconds, model calls and tools are given only the
+        time left before the turn's deadline. With a ``provider``, every model
+        call in the turn goes to it instead of being routed again.
+        """
+        logger.debug("Streaming message: %s", message)
+        deadline = time.monotonic() + budget if budget else None
+
+        self.chat_service.append_message(self.session_id, "user", message)
 
         config:RunnableConfig = {"configurable": {"thread_id": self.session_id}}
         
         try:
+            if settings.station_id_resolution_enabled:
+                message = self.station_service.id_resolver.normalize_text(message)
+
             current_state = self.graph.get_state(config)
+            messages = current_state.values.get("messages", [])
+
+            removals = []
+            if messages and isinstance(messages[-1], HumanMessage):
+                interrupted = messages[-1]
+                logger.info("Merging utterance from an interrupted turn for session %s", self.session_id)
+                TURN_QUEUE_COALESCED.inc()
+                message = f"{interrupted.content}\n{message}"
+                messages = messages[:-1]
+                removals = [RemoveMessage(id=interrupted.id)]
+
+            human_message = HumanMessage(content=message)
             state = {
-                "messages": current_state.values.get("messages", []) + [human_message]
+                "messages": removals + messages + self._close_interrupted_tool_calls(messages)
+                    + self._station_updates() + [human_message]
             }
 
-            logger.info(f"[AGENT] Streaming graph with {len(state['messages'])} messages")
-            async for mode, chunk in self.graph.astream(state, stream_mode=stream_mode, config=config):
+            logger.debug("[AGENT] Streaming graph with %d messages", len(state["messages"]))
+            run_config: RunnableConfig = {
+                "configurable": {**config["configurable"], "deadline": deadline, "provider": provider}
+            }
+            async for mode, chunk in self.graph.astream(state, stream_mode=stream_mode, config=run_config):
                 yield mode, chunk
 
             final_state = self.graph.get_state(config)
 
-            for msg in reversed(final_state.values.get("messages", [])):
+            final_messages = final_state.values.get("messages", [])
+            for msg in reversed(final_messages):
                 if isinstance(msg, AIMessage):
-                    logger.info(f"[AGENT] Found AI response: {msg.content[:50]}...")
-                    self.chat_service.add_message(
-                        self.session_id,
-                        ChatMessage(role="assistant", content=msg.content)
-                    )
+                    logger.debug("[AGENT] Found AI response: %.50s...", msg.content)
+                    self.chat_service.append_message(self.session_id, "assistant", msg.content)
                     break
+
+            self.chat_service.complete_turn(self.session_id, self._turn_station_ids(final_messages))
                     
         except Exception as e:
-            logger.error(f"[AGENT] Error streaming message: {e}")
-            logger.error(traceback.format_exc())
+            logger.error("[AGENT] Error streaming message: %s", e, exc_info=True)
             yield "error", {"error": str(e)}
@@ -0,0 +1,37 @@
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+STILL_CHECKING_REPLY = "I'm still checking that for you. I'll let you know as soon as I have the result."
+SLOW_REPLY = "Sorry, this is taking longer than usual. Please give me a moment and ask again."
+
+
+def remaining(config: Optional[RunnableConfig]) -> Optional[float]:
+    """Seconds left before the turn's deadline, or None when the turn has none."""
+    deadline = ((config or {}).get("configurable") or {}).get("deadline")
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def pending_result(name: str, args: Dict[str, Any]) -> str:
+    return json.dumps({
+        "pending": True,
+        "station_id": args.get("station_id"),
+        "message": f"{name} is still running. Its result will be sent to the user as a station update.",
+    })
+
+
+def is_pending(message: BaseMessage) -> bool:
+    return isinstance(message, ToolMessage) and isinstance(message.content, str) and '"pending": true' in message.content
+
+
+def degraded_reply(messages: List[BaseMessage]) -> str:
+    """Reply used when the turn's budget runs out before the model answers."""
+    for msg in reversed(messages):
+        if not isinstance(msg, ToolMessage):
+            break
+        if is_pending(msg):
+            return STILL_CHECKING_REPLY
+    return SLOW_REPLY
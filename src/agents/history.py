@@ -0,0 +1,94 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+TOOL_SUMMARY = "tool_summary"
+# Acknowledgement tools only tell the user to wait; nothing in them is worth replaying.
+SILENT_TOOLS = {"send_checking_message", "send_rebooting_message"}
+MAX_SUMMARY_CHARS = 200
+
+
+def _parse(content: Any) -> Dict[str, Any]:
+    if isinstance(content, dict):
+        return content
+    try:
+        parsed = json.loads(content)
+    except (TypeError, ValueError):
+        return {"message": str(content)}
+    return parsed if isinstance(parsed, dict) else {"message": str(parsed)}
+
+
+def summarize_tool_result(name: str, args: Dict[str, Any], content: Any) -> Optional[str]:
+    if name in SILENT_TOOLS:
+        return None
+
+    result = _parse(content)
+    station_id = args.get("station_id")
+    if result.get("pending"):
+        return f"{name} for station {station_id} was still running when the turn ended"
+    if name == "get_station_instructions":
+        return "asked the user for their station ID"
+    if name == "check_station_status":
+        if not result.get("found"):
+            return f"station {station_id} was not found"
+        state = "online" if result.get("is_online") else "offline"
+        return f"station {station_id} was {state} with connector {result.get('connector_status')}"
+    if name == "check_site_status":
+        if not result.get("found"):
+            return f"no site information for station {station_id}"
+        return f"site {result.get('site_id')} of station {station_id}: {result.get('message')}"
+    if name == "reboot_station":
+        outcome = "rebooted" if result.get("success") else "reboot failed"
+        return f"station {station_id} {outcome}: {result.get('message')}"
+
+    return f"{name}: {str(result.get('message', content))[:MAX_SUMMARY_CHARS]}"
+
+
+def compact_history(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """Replace finished tool exchanges from earlier turns with one-line summaries.
+
+    Each AI tool call and its tool results become a single system note, so no
+    tool call is left without its result. The current turn (from the last
+    human message on) is sent unchanged because the model is still acting on
+    it, and so is any earlier exchange that is missing a result.
+    """
+    turn_start = max((i for i, msg in enumerate(messages) if isinstance(msg, HumanMessage)), default=0)
+
+    compacted: List[BaseMessage] = []
+    i = 0
+    while i < turn_start:
+        msg = messages[i]
+        i += 1
+        if not isinstance(msg, AIMessage) or not msg.tool_calls:
+            compacted.append(msg)
+            continue
+
+        # Results follow their call directly; matching them there (not by id
+        # across the whole history) stays correct if a model reuses ids.
+        results: Dict[str, ToolMessage] = {}
+        end = i
+        while end < turn_start and isinstance(messages[end], ToolMessage):
+            results[messages[end].tool_call_id] = messages[end]
+            end += 1
+        if any(call["id"] not in results for call in msg.tool_calls):
+            compacted.append(msg)
+            continue
+        i = end
+
+        if msg.content:
+            compacted.append(AIMessage(content=msg.content))
+        summaries = [
+            summary for call in msg.tool_calls
+            if (summary := summarize_tool_result(call["name"], call["args"], results[call["id"]].content))
+        ]
+        if not summaries:
+            continue
+
+        previous = compacted[-1] if compacted else None
+        if isinstance(previous, SystemMessage) and previous.name == TOOL_SUMMARY:
+            compacted[-1] = SystemMessage(name=TOOL_SUMMARY, content=previous.content + "; " + "; ".join(summaries))
+        else:
+            compacted.append(SystemMessage(name=TOOL_SUMMARY, content="Earlier tool results: " + "; ".join(summaries)))
+
+    return compacted + messages[turn_start:]
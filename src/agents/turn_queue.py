@@ -0,0 +1,96 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from src.utils import setup_logger
+from src.utils.metrics import (
+    TURN_CANCELLATIONS, TURN_QUEUE_COALESCED, TURN_QUEUE_DEPTH, TURN_QUEUE_PENDING, TURN_QUEUE_REJECTED,
+    TURN_QUEUE_WAIT_SECONDS
+)
+
+logger = setup_logger(__name__)
+
+
+class TurnQueueFull(Exception):
+    # Waiting utterances are merged into one turn as soon as the running turn
+    # ends, so the queue frees up quickly.
+    retry_after = 1
+
+
+class TurnTicket:
+    __slots__ = ("text", "enqueued_at")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.enqueued_at = time.perf_counter()
+
+
+class SessionTurnQueue:
+    """Serializes the turns of one session and merges utterances that pile up.
+
+    Only one turn runs the graph at a time. A new submission cancels the turn
+    in flight, and every ticket that is still waiting is folded into the newest
+    one, so rapid utterances become a single LLM turn answered on the latest
+    request.
+    """
+
+    def __init__(self, session_id: str, max_depth: int):
+        self.session_id = session_id
+        self.max_depth = max_depth
+        self.active_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._pending: List[TurnTicket] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def submit(self, text: str) -> TurnTicket:
+        if len(self._pending) >= self.max_depth:
+            TURN_QUEUE_REJECTED.inc()
+            raise TurnQueueFull(f"Too many pending turns for session {self.session_id}")
+
+        ticket = TurnTicket(text)
+        self._pending.append(ticket)
+        TURN_QUEUE_PENDING.inc()
+        TURN_QUEUE_DEPTH.observe(len(self._pending))
+
+        if self.active_task and not self.active_task.done():
+            logger.info("Superseding in-flight turn for session %s", self.session_id)
+            TURN_CANCELLATIONS.labels(reason="superseded").inc()
+            self.active_task.cancel()
+
+        return ticket
+
+    def discard(self, ticket: TurnTicket) -> None:
+        if ticket in self._pending:
+            self._pending.remove(ticket)
+            TURN_QUEUE_PENDING.dec()
+
+    @asynccontextmanager
+    async def turn(self, ticket: TurnTicket) -> AsyncIterator[Optional[str]]:
+        try:
+            await self._lock.acquire()
+        except asyncio.CancelledError:
+            self.discard(ticket)
+            raise
+
+        try:
+            if ticket not in self._pending or self._pending[-1] is not ticket:
+                yield None
+                return
+
+            tickets, self._pending = self._pending, []
+            now = time.perf_counter()
+            for queued in tickets:
+                TURN_QUEUE_WAIT_SECONDS.observe(now - queued.enqueued_at)
+            TURN_QUEUE_PENDING.dec(len(tickets))
+
+            if len(tickets) > 1:
+                logger.info("Merged %d queued utterances into one turn for session %s", len(tickets), self.session_id)
+                TURN_QUEUE_COALESCED.inc(len(tickets) - 1)
+
+            yield "\n".join(queued.text for queued in tickets)
+        finally:
+            self._lock.release()
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from src.dependencies.services import (
+    get_admission_service, get_cascade_service, get_profiling_service, get_station_service,
+    get_usage_service
+)
+from src.services.admission_service import AdmissionService
+from src.services.cascade_service import CascadeService
+from src.services.profiling_service import ProfilingService
+from src.services.station_service import StationService
+from src.services.usage_service import UsageService
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/admission")
+async def admission_stats(
+    admission_service: AdmissionService = Depends(get_admission_service)
+) -> dict:
+    return admission_service.stats()
+
+@router.get("/usage")
+async def usage_summary(
+    usage_service: UsageService = Depends(get_usage_service)
+) -> dict:
+    return usage_service.summary()
+
+@router.get("/usage/sessions/{session_id}")
+async def session_usage(
+    session_id: str,
+    usage_service: UsageService = Depends(get_usage_service)
+) -> dict:
+    usage = usage_service.session_usage(session_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail=f"No usage recorded for session {session_id}")
+    return usage
+
+@router.get("/cascade")
+async def cascade_summary(
+    cascade_service: CascadeService = Depends(get_cascade_service)
+) -> dict:
+    return cascade_service.summary()
+
+@router.get("/profiles")
+async def list_profiles(
+    profiling_service: ProfilingService = Depends(get_profiling_service)
+) -> list:
+    return profiling_service.list_profiles()
+
+@router.get("/profiles/{name}")
+async def download_profile(
+    name: str,
+    profiling_service: ProfilingService = Depends(get_profiling_service)
+) -> FileResponse:
+    path = profiling_service.get_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {name} not found")
+    media_type = "application/json" if name.endswith(".json") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=name)
+
+@router.get("/station-ids")
+async def station_id_resolution(
+    station_service: StationService = Depends(get_station_service)
+) -> dict:
+    return station_service.id_resolver.summary()
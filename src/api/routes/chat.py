@@ -1,9 +1,22 @@
-from fastapi import APIRouter, Depends
+import uuid
+from datetime import datetime
+from typing import AsyncGenerator, Optional, Union
+
+from fastapi import APIRouter, Depends, Query, WebSocket
 from fastapi.responses import StreamingResponse
 
 from src.models.schemas import LLMRequest, AssistantResponse, VapiAssistant
+from src.config.settings import settings
 from src.services.streaming_service import StreamingService
-from src.dependencies.services import get_streaming_service, get_session_info, get_vapi_service, process_vapi_request
+from src.services.websocket_chat_service import WebSocketChatService
+from src.dependencies.services import (
+    get_admission_service, get_chat_service, get_llm_service, get_or_create_agent, get_session_info,
+    get_station_service, get_streaming_service, get_vapi_service, process_vapi_request
+)
+from src.services.admission_service import AdmissionService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+from src.services.station_service import StationService
 from src.services.vapi_service import VapiService
 from src.utils import setup_logger
 
@@ -17,19 +30,57 @@ async def chat_completions(
     request: LLMRequest = Depends(process_vapi_request),
     streaming_service: StreamingService = Depends(get_streaming_service)
 ) -> StreamingResponse:
-    logger.info(f"Received chat completions request for session {session_info['session_id']}")
+    logger.info("Received chat completions request for session %s", session_info["session_id"])
     return await streaming_service.streaming_chat(request)
 
-@router.post("/load_assistants")
+@router.websocket("/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    session_id: Optional[str] = None,
+    user_id: str = "websocket",
+    provider: Optional[str] = None,
+    scenario: Optional[str] = None,
+    voice: bool = False,
+    llm_service: LLMService = Depends(get_llm_service),
+    chat_service: ChatService = Depends(get_chat_service),
+    station_service: StationService = Depends(get_station_service),
+    admission_service: AdmissionService = Depends(get_admission_service)
+) -> None:
+    session_id = session_id or f"ws-{uuid.uuid4().hex}"
+    agent = get_or_create_agent(
+        session_id, user_id, provider or settings.llm_provider, scenario, llm_service, chat_service, station_service
+    )
+    await WebSocketChatService(
+        websocket,
+        llm_service=llm_service,
+        chat_service=chat_service,
+        station_service=station_service,
+        chatbot_agent=agent,
+        admission_service=admission_service,
+        voice=voice and settings.voice_streaming_enabled
+    ).serve()
+
+@router.post("/load_assistants", response_model=None)
 async def load_assistants(
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    cursor: Optional[datetime] = None,
+    stream: bool = False,
     vapi_service: VapiService = Depends(get_vapi_service)
-) -> AssistantResponse:
-    logger.info("Loading all assistants from VAPI... This may take a few minutes. Please be patient.")
-    return await vapi_service.load_all_assistants()
+) -> Union[AssistantResponse, StreamingResponse]:
+    if not stream:
+        logger.info("Loading a page of assistants from VAPI")
+        return await vapi_service.load_assistants_page(limit, cursor)
+
+    async def generate_pages() -> AsyncGenerator[str, None]:
+        async for page in vapi_service.iter_assistant_pages(limit):
+            yield page.model_dump_json() + "\n"
+
+    logger.info("Streaming all assistants from VAPI page by page")
+    return StreamingResponse(generate_pages(), media_type="application/x-ndjson")
 
 @router.post("/create_new_assistant")
 async def create_new_assistant(
     vapi_service: VapiService = Depends(get_vapi_service)
 ) -> VapiAssistant:
-    logger.info("Creating new assistant in VAPI... This may take a few minutes. Please be patient.")
+    logger.info("Creating new assistant in VAPI if it does not exist")
     return await vapi_service.create_new_assistant()
@@ -0,0 +1,44 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.dependencies.services import get_fleet_health_service, get_incident_service
+from src.models.schemas import FleetHealthReport, IncidentReport, RebootCandidate, SiteHealth
+from src.services.fleet_health_service import FleetHealthService
+from src.services.incident_service import IncidentService
+
+router = APIRouter(prefix="/fleet", tags=["fleet"])
+
+@router.get("/health")
+async def fleet_health(
+    top_sites: int = Query(default=10, ge=0, le=1000),
+    fleet_health_service: FleetHealthService = Depends(get_fleet_health_service)
+) -> FleetHealthReport:
+    return fleet_health_service.fleet_report(top_sites)
+
+@router.get("/sites/{site_id}/health")
+async def site_health(
+    site_id: str,
+    fleet_health_service: FleetHealthService = Depends(get_fleet_health_service)
+) -> SiteHealth:
+    site = fleet_health_service.site_health(site_id)
+    if site is None:
+        raise HTTPException(status_code=404, detail=f"Site {site_id} not found")
+    return site
+
+@router.get("/reboot-candidates")
+async def reboot_candidates(
+    limit: int = Query(default=20, ge=1, le=1000),
+    fleet_health_service: FleetHealthService = Depends(get_fleet_health_service)
+) -> List[RebootCandidate]:
+    return fleet_health_service.reboot_candidates(limit)
+
+@router.get("/incidents")
+async def incidents(
+    hours: int = Query(default=24, ge=1, le=24 * 366),
+    site_id: Optional[str] = None,
+    station_id: Optional[str] = None,
+    top: int = Query(default=10, ge=0, le=1000),
+    incident_service: IncidentService = Depends(get_incident_service)
+) -> IncidentReport:
+    return incident_service.report(hours, site_id=site_id, station_id=station_id, top=top)
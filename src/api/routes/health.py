@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.services.warmup_service import WarmupService
+
+router = APIRouter(tags=["health"])
+
+@router.get("/health")
+async def health() -> dict:
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def ready() -> JSONResponse:
+    warmup = WarmupService()
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=warmup.status())
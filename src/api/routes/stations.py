@@ -0,0 +1,101 @@
+import asyncio
+import hmac
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from src.config.settings import settings
+from src.dependencies.services import get_station_event_service, get_station_service
+from src.models.schemas import StationEvent
+from src.services.station_event_service import StationEventService
+from src.services.station_service import StationService
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/stations", tags=["stations"])
+
+
+def _authorized(token: Optional[str]) -> bool:
+    # Ingest stays closed until a shared secret is configured.
+    expected = settings.station_events_token
+    return bool(expected) and token is not None and hmac.compare_digest(token.encode(), expected.encode())
+
+@router.post("/events")
+async def ingest_events(
+    events: Union[StationEvent, List[StationEvent]],
+    x_station_events_token: Optional[str] = Header(default=None),
+    station_service: StationService = Depends(get_station_service),
+    station_event_service: StationEventService = Depends(get_station_event_service)
+) -> dict:
+    if not settings.station_events_token:
+        raise HTTPException(status_code=503, detail="Station event ingest is disabled: STATION_EVENTS_TOKEN is not set")
+    if not _authorized(x_station_events_token):
+        raise HTTPException(status_code=401, detail="Invalid station events token")
+
+    events = events if isinstance(events, list) else [events]
+    for event in events:
+        station_event_service.publish(event, station_service)
+    return {"accepted": len(events)}
+
+@router.websocket("/events/ws")
+async def ingest_events_ws(
+    websocket: WebSocket,
+    station_service: StationService = Depends(get_station_service),
+    station_event_service: StationEventService = Depends(get_station_event_service)
+) -> None:
+    if not _authorized(websocket.headers.get("x-station-events-token")):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    accepted = 0
+    try:
+        while True:
+            payload = await websocket.receive_text()
+            try:
+                event = StationEvent.model_validate_json(payload)
+            except ValidationError as e:
+                logger.warning("Rejected station event: %s", e.errors()[0].get("msg"))
+                continue
+            station_event_service.publish(event, station_service)
+            accepted += 1
+    except WebSocketDisconnect:
+        logger.info("Station event producer disconnected after %d events", accepted)
+
+@router.websocket("/notifications/ws")
+async def session_notifications_ws(
+    websocket: WebSocket,
+    session_id: str,
+    station_event_service: StationEventService = Depends(get_station_event_service)
+) -> None:
+    # Notifications carry what a session's stations are doing; only holders of the token may listen.
+    if not _authorized(websocket.headers.get("x-station-events-token")):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    listener = station_event_service.listen(session_id)
+    receive = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            notification = asyncio.ensure_future(listener.get())
+            done, _ = await asyncio.wait({receive, notification}, return_when=asyncio.FIRST_COMPLETED)
+
+            if receive in done and receive.result()["type"] == "websocket.disconnect":
+                notification.cancel()
+                return
+
+            # Both may be done at once; a notification taken off the queue must still be sent.
+            if notification in done:
+                await websocket.send_json({"session_id": session_id, "message": notification.result()})
+            else:
+                notification.cancel()
+            if receive in done:
+                receive = asyncio.ensure_future(websocket.receive())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receive.cancel()
+        station_event_service.stop_listening(session_id, listener)
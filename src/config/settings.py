@@ -1,5 +1,5 @@
-from typing import Literal, Optional
-from pydantic import Field
+from typing import Dict, List, Literal, Optional
+from pydantic import Field, PositiveInt
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
 
     ollama_base_url: str = Field(default="http://localhost:11434", description="Ollama base URL")
     ollama_model: str = Field(default="llama3", description="Ollama model name")
+    ollama_keep_alive: str = Field(
+        default="30m", description="How long Ollama keeps the model loaded after a request (e.g. 30m, -1m for always)"
+    )
+    ollama_num_ctx: Optional[int] = Field(default=None, description="Ollama context window size in tokens")
+    ollama_num_thread: Optional[int] = Field(default=None, description="CPU threads Ollama uses for inference")
+    ollama_preload: bool = Field(default=True, description="Load the Ollama model into memory during warm-up")
+    ollama_preload_timeout_seconds: float = Field(default=120.0, description="Timeout for loading the Ollama model")
 
     openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key")
     openai_model: Optional[str] = Field(default=None, description="OpenAI model name")
@@ -32,6 +39,174 @@ class Settings(BaseSettings):
     vapi_assistant_name: Optional[str] = Field(default=None, description="VAPI assistant name")
     vapi_assistant_id: Optional[str] = Field(default=None, description="VAPI assistant ID")
     vapi_custom_llm_url: Optional[str] = Field(default=None, description="Custom LLM URL for VAPI integration")
+    vapi_base_url: Optional[str] = Field(default=None, description="VAPI API base URL override, e.g. a local stub")
+    vapi_timeout_seconds: float = Field(default=30.0, description="Timeout for VAPI management API calls")
+    vapi_max_connections: int = Field(default=10, description="Connection pool size of the VAPI management client")
+    vapi_page_size: int = Field(default=100, description="Assistants fetched per VAPI list call")
+    vapi_index_ttl_seconds: int = Field(default=300, description="How long the assistant name to ID index is reused")
+    vapi_ui_max_calls: int = Field(default=4, description="Concurrent browser voice calls from the Chainlit UI")
+
+    voice_streaming_enabled: bool = Field(default=True, description="Stream phrase-sized chunks to VAPI sessions")
+    voice_chunk_min_chars: int = Field(default=10, description="Minimum characters per voice chunk (VAPI inputMinCharacters)")
+    voice_clause_min_chars: int = Field(default=30, description="Minimum buffered characters before flushing at a clause boundary")
+    voice_chunk_max_chars: int = Field(default=250, description="Force a flush at a word boundary beyond this many characters")
+    voice_flush_deadline_ms: int = Field(default=400, description="Flush buffered voice text at a word boundary after this delay")
+
+    disconnect_poll_interval_ms: int = Field(
+        default=250, description="How often an idle SSE stream checks whether the client is still connected"
+    )
+    turn_queue_max_depth: int = Field(
+        default=4, description="Max utterances waiting per session before new ones are rejected with 429"
+    )
+    turn_budget_voice_ms: int = Field(default=8000, description="Deadline for a voice turn (0 for none)")
+    turn_budget_text_ms: int = Field(default=30000, description="Deadline for a text turn (0 for none)")
+    turn_deadline_reserve_ms: int = Field(
+        default=1500, description="Part of the turn budget tools may not use, kept for the model's final reply"
+    )
+    profiling_enabled: bool = Field(
+        default=False, description="Allow turns to be profiled on request (X-Profile header) or by sampling"
+    )
+    profiling_sample_rate: float = Field(default=0.0, description="Fraction of turns profiled without a request")
+    profiling_mode: Literal["sample", "cprofile"] = Field(
+        default="sample", description="Profiler for sampled turns and unrecognised X-Profile values"
+    )
+    profiling_interval_ms: float = Field(default=5.0, description="Stack sampling interval of the sample profiler")
+    profiling_dir: str = Field(default="profiles", description="Directory profiles are written to")
+    profiling_keep: int = Field(default=50, description="Most recent profiles kept on disk")
+    history_compaction_enabled: bool = Field(
+        default=True, description="Send finished tool exchanges from earlier turns to the LLM as short summaries"
+    )
+    transcript_live_messages: int = Field(
+        default=40, description="Recent messages per session kept uncompressed; 0 disables compression"
+    )
+    transcript_compress_batch: int = Field(
+        default=40, description="Number of old messages packed into each compressed transcript block"
+    )
+    session_idle_ttl_seconds: int = Field(
+        default=1800, description="Idle sessions are archived and evicted from memory after this many seconds"
+    )
+
+    archive_dir: Optional[str] = Field(
+        default=None, description="Directory for archived transcripts; unset disables archival"
+    )
+    archive_compress: bool = Field(default=True, description="Gzip archive files")
+    archive_max_file_mb: int = Field(default=64, description="Rotate to a new archive file once it has this many MB on disk")
+    archive_queue_size: int = Field(
+        default=10000, description="Records buffered for the archive writer before new ones are dropped"
+    )
+    archive_batch_size: int = Field(default=256, description="Max records written per batch")
+    archive_flush_seconds: float = Field(
+        default=1.0, description="How long the archive writer waits for records before polling again"
+    )
+    archive_fsync: bool = Field(default=True, description="fsync archive files after every batch")
+
+    warmup_enabled: bool = Field(default=True, description="Warm services, connections and the agent graph at startup")
+    warmup_blocking: bool = Field(
+        default=False, description="Finish warm-up before accepting requests instead of in the background"
+    )
+    warmup_preconnect: bool = Field(default=True, description="Open pooled connections to every LLM provider at startup")
+    warmup_dry_run: bool = Field(default=True, description="Run one agent turn against the scripted fake model at startup")
+    warmup_timeout_seconds: float = Field(default=5.0, description="Timeout for each provider pre-connect")
+
+    llm_routing_enabled: bool = Field(default=False, description="Route away from providers that exceed a budget")
+    llm_routing_order: List[str] = Field(
+        default_factory=list, description="Fallback providers, cheapest or fastest first"
+    )
+    llm_daily_token_budgets: Dict[str, int] = Field(
+        default_factory=dict, description="Per-provider daily token budgets (UTC day)"
+    )
+    llm_latency_budgets_ms: Dict[str, int] = Field(
+        default_factory=dict, description="Per-provider budgets for the moving average LLM call latency"
+    )
+    llm_routing_cooldown_seconds: int = Field(
+        default=60, description="Age after which a provider's latency average no longer blocks it"
+    )
+
+    llm_cascade_enabled: bool = Field(
+        default=False, description="Answer simple turns deterministically or with a small model instead of the main one"
+    )
+    llm_cascade_providers: List[str] = Field(
+        default_factory=list, description="Providers the cascade applies to (empty for all)"
+    )
+    llm_cascade_small_models: Dict[str, str] = Field(
+        default_factory=dict, description="Per-provider small model used for simple turns, e.g. {\"openai\": \"gpt-4o-mini\"}"
+    )
+    llm_cascade_deterministic: bool = Field(
+        default=True, description="Answer greetings, thanks and station number questions without an LLM call"
+    )
+    llm_cascade_max_simple_words: int = Field(
+        default=12, description="Longest user message, in words, that may be sent to the small model"
+    )
+    llm_cascade_token_costs: Dict[str, float] = Field(
+        default_factory=dict, description="USD per 1K tokens by provider or small tier (e.g. openai:small), for savings"
+    )
+
+    admission_max_concurrency: PositiveInt = Field(default=32, description="Default concurrent turns per LLM provider")
+    admission_provider_limits: Dict[str, PositiveInt] = Field(
+        default_factory=dict, description="Per-provider concurrent turn limits overriding the default"
+    )
+    admission_max_queue: int = Field(default=100, description="Max turns waiting per provider before shedding")
+    admission_voice_budget_ms: int = Field(default=1000, description="Max time a voice turn may wait for a slot")
+    admission_text_budget_ms: int = Field(default=5000, description="Max time a text turn may wait for a slot")
+    admission_initial_turn_seconds: float = Field(
+        default=3.0, description="Initial estimate of turn duration used to predict queue wait"
+    )
+
+    log_level: str = Field(default="INFO", description="Default log level")
+    log_levels: Dict[str, str] = Field(
+        default_factory=dict, description="Per-logger level overrides keyed by logger name prefix"
+    )
+    log_format: Literal["text", "json"] = Field(default="text", description="Log output format")
+    log_queue_size: int = Field(default=10000, description="Max records buffered for the background log writer")
+    log_rate_limit_per_second: float = Field(
+        default=20.0, description="Sustained rate per log call site below WARNING (0 disables sampling)"
+    )
+    log_rate_limit_burst: int = Field(default=50, description="Burst allowance per log call site")
+    log_rate_limited: List[str] = Field(
+        default_factory=lambda: ["src.services.streaming_service", "src.agents.chatbot_agent"],
+        description="Logger name prefixes whose records below WARNING are rate limited per call site"
+    )
+
+    station_registry_path: Optional[str] = Field(
+        default=None, description="Fleet export (CSV, JSONL or Parquet) to load stations from; mock stations if unset"
+    )
+    station_registry_cache_dir: Optional[str] = Field(
+        default=None, description="Directory for the memory-mapped columnar copy of the fleet export"
+    )
+
+    reboot_limit: int = Field(default=3, description="Reboots allowed per session, and per station for proactive reboots")
+    reboot_window_seconds: int = Field(default=300, description="Window the reboot limit applies to")
+    fleet_silent_after_seconds: int = Field(
+        default=900, description="Seconds without communication after which a station counts as silent"
+    )
+
+    station_status_ttl_seconds: int = Field(
+        default=30, description="How long a pushed or fetched station status is served without a backend call"
+    )
+    station_watch_ttl_seconds: int = Field(default=900, description="How long a session watches a station it asked about")
+    station_notification_backlog: int = Field(default=10, description="Station notifications kept per session")
+    station_events_token: Optional[str] = Field(
+        default=None, description="Shared secret required in X-Station-Events-Token by the event receivers"
+    )
+    incident_bucket_seconds: int = Field(default=3600, description="Width of the incident analytics time buckets")
+    incident_retention_hours: int = Field(default=168, description="How long incident buckets are kept")
+    incident_live_ttl_seconds: int = Field(
+        default=3600, description="How long a station's latest check counts towards live stuck/error/offline counts"
+    )
+    incident_snapshot_path: Optional[str] = Field(
+        default=None, description="File incident counters are snapshotted to and restored from; unset keeps them in memory"
+    )
+    incident_snapshot_interval_seconds: int = Field(default=60, description="Seconds between incident snapshots")
+    station_id_resolution_enabled: bool = Field(
+        default=True, description="Rewrite spoken or misheard station IDs in user messages before the LLM sees them"
+    )
+
+    fake_llm_enabled: bool = Field(default=False, description="Register the scripted fake LLM as the 'fake' provider")
+    fake_llm_latency_ms: float = Field(default=200.0, description="Fake LLM latency before the first token")
+    fake_llm_tokens_per_second: float = Field(default=50.0, description="Fake LLM token generation rate")
+    fake_station_backend: bool = Field(default=False, description="Use the deterministic fake station backend")
+    fake_station_check_latency_ms: float = Field(default=50.0, description="Fake station status check latency")
+    fake_station_reboot_latency_ms: float = Field(default=100.0, description="Fake station reboot latency")
 
     class Config:
         env_file = ".env"
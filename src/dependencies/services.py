@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Optional
 
 from fastapi import Depends, Request
 
@@ -10,6 +10,14 @@ from src.services.station_service import StationService
 from src.services.streaming_service import StreamingService
 from src.agents.chatbot_agent import ChatbotAgent
 from src.services.vapi_service import VapiService
+from src.services.admission_service import AdmissionService
+from src.services.usage_service import UsageService
+from src.services.cascade_service import CascadeService
+from src.services.fleet_health_service import FleetHealthService
+from src.services.incident_service import IncidentService
+from src.services.profiling_service import ProfilingService
+from src.services.station_event_service import StationEventService
+from src.loadtest.fake_station import FakeStationService
 from src.utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -26,30 +34,77 @@ def get_chat_service() -> ChatService:
 
 
 def get_station_service() -> StationService:
+    if settings.fake_station_backend:
+        return FakeStationService()
     return StationService()
 
 def get_vapi_service() -> VapiService:
     return VapiService()
 
 
+def get_admission_service() -> AdmissionService:
+    return AdmissionService()
+
+
+def get_usage_service() -> UsageService:
+    return UsageService()
+
+
+def get_cascade_service() -> CascadeService:
+    return CascadeService()
+
+
+def get_incident_service() -> IncidentService:
+    return IncidentService()
+
+
+def get_profiling_service() -> ProfilingService:
+    return ProfilingService()
+
+
+def get_station_event_service() -> StationEventService:
+    return StationEventService()
+
+
+def get_fleet_health_service(
+    station_service: StationService = Depends(get_station_service)
+) -> FleetHealthService:
+    return FleetHealthService(station_service)
+
+
 def get_request_info(request: Request):
     return {
         "request": request
     }
 
 
+def vapi_call_id(body: dict) -> Optional[str]:
+    call = body.get("call")
+    call_id = call.get("id") if isinstance(call, dict) else None
+    return str(call_id) if call_id else None
+
+
 async def get_session_info(request_info: dict = Depends(get_request_info)):
     request = request_info["request"]
     body = await request.json()
 
-    session_id = body.get("session_id", settings.vapi_session_id)
+    # VAPI requests carry no session_id; each call gets its own session, so
+    # concurrent callers never share an agent or turn queue.
+    vapi = not body.get("session_id")
+    call_id = vapi_call_id(body)
+    session_id = body.get("session_id") or (f"vapi-{call_id}" if call_id else settings.vapi_session_id)
     user_id = body.get("user_id", "VAPI")
     provider = body.get("provider", settings.llm_provider)
+    scenario = body.get("scenario")
+    voice = vapi or "call" in body
     
     return {
         "session_id": session_id,
         "user_id": user_id,
-        "provider": provider
+        "provider": provider,
+        "scenario": scenario,
+        "voice": voice,
+        "vapi": vapi
     }
 
 
@@ -57,7 +112,8 @@ async def process_vapi_request(
     request: LLMRequest,
     session_info: dict = Depends(get_session_info)
 ) -> LLMRequest:
-    if session_info['session_id'] == settings.vapi_session_id:
+    # VAPI resends the whole call transcript; the agent keeps its own history.
+    if session_info["vapi"]:
         user_messages = [msg for msg in request.messages if msg.get("role") == "user"]
         if user_messages:
             last_user_message = user_messages[-1]
@@ -66,47 +122,82 @@ async def process_vapi_request(
     return request
 
 
-def get_chatbot_agent(
-    session_info: dict = Depends(get_session_info),
-    llm_service: LLMService = Depends(get_llm_service),
-    chat_service: ChatService = Depends(get_chat_service),
-    station_service: StationService = Depends(get_station_service)
+def evict_idle_sessions(chat_service: ChatService) -> List[str]:
+    """Evict idle sessions together with their agents, turn queues, watches and usage."""
+    evicted = chat_service.evict_idle_sessions()
+    for session_id in evicted:
+        agent_sessions.pop(session_id, None)
+        StationEventService().forget_session(session_id)
+        UsageService().forget_session(session_id)
+    return evicted
+
+
+def get_or_create_agent(
+    session_id: str,
+    user_id: str,
+    provider: str,
+    scenario: Optional[str],
+    llm_service: LLMService,
+    chat_service: ChatService,
+    station_service: StationService
 ) -> ChatbotAgent:
-    session_id = session_info["session_id"]
-    user_id = session_info["user_id"]
-    provider = session_info["provider"]
-
-    logger.info(f"session_id: {session_id}, user_id: {user_id}, provider: {provider}")
+    logger.debug("session_id: %s, user_id: %s, provider: %s", session_id, user_id, provider)
 
     if session_id in agent_sessions:
         agent = agent_sessions[session_id]
-        logger.info(f"Using existing agent for session {session_id}")
+        logger.debug("Using existing agent for session %s", session_id)
         return agent
 
-    logger.info(f"Creating new agent for session {session_id}")
+    evict_idle_sessions(chat_service)
+
+    logger.info("Creating new agent for session %s", session_id)
     agent = ChatbotAgent(
         user_id=user_id,
         session_id=session_id,
         provider=provider,
         llm_service=llm_service,
         chat_service=chat_service,
-        station_service=station_service
+        station_service=station_service,
+        scenario=scenario
     )
     agent_sessions[session_id] = agent
     return agent
 
 
+def get_chatbot_agent(
+    session_info: dict = Depends(get_session_info),
+    llm_service: LLMService = Depends(get_llm_service),
+    chat_service: ChatService = Depends(get_chat_service),
+    station_service: StationService = Depends(get_station_service)
+) -> ChatbotAgent:
+    return get_or_create_agent(
+        session_info["session_id"],
+        session_info["user_id"],
+        session_info["provider"],
+        session_info["scenario"],
+        llm_service,
+        chat_service,
+        station_service
+    )
+
+
 def get_streaming_service(
+    request: Request,
     session_info: dict = Depends(get_session_info),
     llm_service: LLMService = Depends(get_llm_service),
     chat_service: ChatService = Depends(get_chat_service),
     station_service: StationService = Depends(get_station_service),
-    chatbot_agent: ChatbotAgent = Depends(get_chatbot_agent)
+    chatbot_agent: ChatbotAgent = Depends(get_chatbot_agent),
+    admission_service: AdmissionService = Depends(get_admission_service)
 ) -> StreamingService:
-    logger.info(f"session_info: {session_info}")
+    logger.debug("session_info: %s", session_info)
     return StreamingService(
         llm_service=llm_service,
         chat_service=chat_service,
         station_service=station_service,
-        chatbot_agent=chatbot_agent
+        chatbot_agent=chatbot_agent,
+        admission_service=admission_service,
+        voice=session_info["voice"] and settings.voice_streaming_enabled,
+        http_request=request,
+        profile=request.headers.get("x-profile")
     )
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from src.config.settings import settings
+from src.loadtest.driver import LoadDriver, in_process_server
+from src.loadtest.scenarios import SCENARIOS, get_scenarios
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadtest",
+        description="Offline load generator for the EV charging chatbot API"
+    )
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess",
+                        help="Start src.main:app in this process or target a running server")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{settings.port}",
+                        help="Base URL of the server in http mode")
+    parser.add_argument("--provider", default="fake", help="LLM provider requested for every turn")
+    parser.add_argument("--sessions", type=int, default=50, help="Total number of scripted sessions")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions running at the same time")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated scenarios to replay ({', '.join(SCENARIOS)})")
+    parser.add_argument("--latency-ms", type=float, default=settings.fake_llm_latency_ms,
+                        help="Fake LLM latency before the first token (inprocess mode)")
+    parser.add_argument("--tokens-per-second", type=float, default=settings.fake_llm_tokens_per_second,
+                        help="Fake LLM token rate (inprocess mode)")
+    parser.add_argument("--server-pid", type=int, default=None,
+                        help="PID of the server process to sample RSS from in http mode")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-turn timeout in seconds")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="Write the report as JSON to this path ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace):
+    scenarios = get_scenarios([name.strip() for name in args.scenarios.split(",") if name.strip()])
+
+    if args.mode == "inprocess":
+        async with in_process_server(args.latency_ms, args.tokens_per_second) as base_url:
+            driver = LoadDriver(base_url, args.provider, args.concurrency, args.timeout)
+            return await driver.run(scenarios, args.sessions)
+
+    driver = LoadDriver(args.url, args.provider, args.concurrency, args.timeout)
+    return await driver.run(scenarios, args.sessions, rss_pid=args.server_pid)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    if args.json_path == "-":
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.format())
+        if args.json_path:
+            with open(args.json_path, "w") as output:
+                json.dump(report.to_dict(), output, indent=2)
+
+    return 1 if report.to_dict()["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import math
+import os
+import resource
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from src.config.settings import settings
+from src.loadtest.fake_llm import ScriptedChatModel
+from src.loadtest.scenarios import Scenario
+from src.services.llm_service import LLMService
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class TurnResult:
+    scenario: str
+    latency: float
+    ttft: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadReport:
+    sessions: int
+    duration: float
+    turns: List[TurnResult] = field(default_factory=list)
+    rss_start: Optional[int] = None
+    rss_end: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        ok_turns = [turn for turn in self.turns if not turn.error]
+        ttfts = [turn.ttft for turn in ok_turns if turn.ttft is not None]
+        latencies = [turn.latency for turn in ok_turns]
+
+        rss_growth = None
+        if self.rss_start is not None and self.rss_end is not None and self.sessions:
+            rss_growth = (self.rss_end - self.rss_start) / self.sessions
+
+        by_scenario = {}
+        for name in sorted({turn.scenario for turn in self.turns}):
+            scenario_latencies = [turn.latency for turn in ok_turns if turn.scenario == name]
+            by_scenario[name] = {
+                "turns": sum(1 for turn in self.turns if turn.scenario == name),
+                "errors": sum(1 for turn in self.turns if turn.scenario == name and turn.error),
+                "latency_p50": percentile(scenario_latencies, 50),
+                "latency_p95": percentile(scenario_latencies, 95),
+            }
+
+        return {
+            "sessions": self.sessions,
+            "turns": len(self.turns),
+            "errors": len(self.turns) - len(ok_turns),
+            "duration_s": self.duration,
+            "throughput_turns_per_s": len(ok_turns) / self.duration if self.duration else 0.0,
+            "throughput_sessions_per_s": self.sessions / self.duration if self.duration else 0.0,
+            "ttft_p50": percentile(ttfts, 50),
+            "ttft_p95": percentile(ttfts, 95),
+            "ttft_p99": percentile(ttfts, 99),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "rss_start_bytes": self.rss_start,
+            "rss_end_bytes": self.rss_end,
+            "rss_growth_per_session_bytes": rss_growth,
+            "scenarios": by_scenario,
+        }
+
+    def format(self) -> str:
+        data = self.to_dict()
+
+        def ms(value: Optional[float]) -> str:
+            return f"{value * 1000:.1f} ms" if value is not None else "n/a"
+
+        lines = [
+            f"Sessions: {data['sessions']}  Turns: {data['turns']}  Errors: {data['errors']}",
+            f"Duration: {data['duration_s']:.2f} s",
+            f"Throughput: {data['throughput_turns_per_s']:.2f} turns/s, {data['throughput_sessions_per_s']:.2f} sessions/s",
+            f"TTFT: p50={ms(data['ttft_p50'])} p95={ms(data['ttft_p95'])} p99={ms(data['ttft_p99'])}",
+            f"Turn latency: p50={ms(data['latency_p50'])} p95={ms(data['latency_p95'])} p99={ms(data['latency_p99'])}",
+        ]
+
+        if data["rss_growth_per_session_bytes"] is not None:
+            lines.append(
+                f"RSS: {data['rss_start_bytes'] / 2**20:.1f} MiB -> {data['rss_end_bytes'] / 2**20:.1f} MiB "
+                f"({data['rss_growth_per_session_bytes'] / 1024:.1f} KiB/session)"
+            )
+
+        for name, stats in data["scenarios"].items():
+            lines.append(
+                f"  {name}: turns={stats['turns']} errors={stats['errors']} "
+                f"p50={ms(stats['latency_p50'])} p95={ms(stats['latency_p95'])}"
+            )
+        return "\n".join(lines)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def read_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        if pid is not None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoadDriver:
+    def __init__(
+        self,
+        base_url: str,
+        provider: str = "fake",
+        concurrency: int = 10,
+        timeout: float = 60.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.provider = provider
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.run_id = uuid.uuid4().hex[:8]
+
+    async def run_turn(
+        self,
+        client: httpx.AsyncClient,
+        session_id: str,
+        user_id: str,
+        scenario: str,
+        text: str
+    ) -> TurnResult:
+        payload = {
+            "messages": [{"role": "user", "content": text}],
+            "provider": self.provider,
+            "session_id": session_id,
+            "user_id": user_id,
+            "scenario": scenario
+        }
+        headers = {"Accept": "text/event-stream", "Content-Type": "application/json"}
+
+        start = time.perf_counter()
+        ttft = None
+
+        try:
+            async with client.stream(
+                "POST", f"{self.base_url}/chat/completions", json=payload, headers=headers, timeout=self.timeout
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    return TurnResult(
+                        scenario=scenario,
+                        latency=time.perf_counter() - start,
+                        error=f"HTTP {response.status_code}"
+                    )
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+
+                    data = line[6:].strip()
+                    if data == "[DONE]":
+                        break
+
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        return TurnResult(
+                            scenario=scenario,
+                            latency=time.perf_counter() - start,
+                            ttft=ttft,
+                            error=str(chunk["error"])
+                        )
+
+                    delta = chunk["choices"][0].get("delta", {})
+                    if ttft is None and delta.get("content"):
+                        ttft = time.perf_counter() - start
+        except (httpx.HTTPError, ValueError) as e:
+            return TurnResult(scenario=scenario, latency=time.perf_counter() - start, ttft=ttft, error=repr(e))
+
+        return TurnResult(scenario=scenario, latency=time.perf_counter() - start, ttft=ttft)
+
+    async def run_session(self, client: httpx.AsyncClient, index: int, scenario: Scenario) -> List[TurnResult]:
+        session_id = f"load-{self.run_id}-{index}"
+        user_id = f"load-user-{index}"
+
+        results = []
+        for text in scenario.turns:
+            result = await self.run_turn(client, session_id, user_id, scenario.name, text)
+            results.append(result)
+            if result.error:
+                logger.warning("[LOAD] Session %s failed on '%s': %s", session_id, text, result.error)
+                break
+        return results
+
+    async def run(self, scenarios: List[Scenario], sessions: int, rss_pid: Optional[int] = None) -> LoadReport:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(limits=limits) as client:
+            async def bounded_session(index: int) -> List[TurnResult]:
+                async with semaphore:
+                    return await self.run_session(client, index, scenarios[index % len(scenarios)])
+
+            rss_start = read_rss_bytes(rss_pid)
+            start = time.perf_counter()
+            session_results = await asyncio.gather(*(bounded_session(i) for i in range(sessions)))
+            duration = time.perf_counter() - start
+            rss_end = read_rss_bytes(rss_pid)
+
+        return LoadReport(
+            sessions=sessions,
+            duration=duration,
+            turns=[turn for results in session_results for turn in results],
+            rss_start=rss_start,
+            rss_end=rss_end
+        )
+
+
+@asynccontextmanager
+async def in_process_server(
+    latency_ms: float = settings.fake_llm_latency_ms,
+    tokens_per_second: float = settings.fake_llm_tokens_per_second
+) -> AsyncIterator[str]:
+    from src.main import app
+
+    settings.fake_station_backend = True
+    LLMService().register_client(
+        "fake",
+        ScriptedChatModel(latency_ms=latency_ms, tokens_per_second=tokens_per_second)
+    )
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        if task.done():
+            task.result()
+            raise RuntimeError("In-process server exited before startup")
+        await asyncio.sleep(0.01)
+
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
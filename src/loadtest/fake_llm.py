@@ -0,0 +1,212 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+STATION_ID_PATTERN = re.compile(r"\bST\d{3}\b", re.IGNORECASE)
+PROBLEM_KEYWORDS = ("stuck", "offline", "reboot", "restart", "not working", "not charging", "broken")
+INSIST_KEYWORDS = ("reboot", "restart", "anyway", "yes")
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4) if text else 0
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic tool-calling chat model that follows the station support script.
+
+    The next message is derived only from the conversation so far, so the same
+    input always yields the same tool calls and replies. Generation time is
+    ``latency_ms`` plus one token per ``1 / tokens_per_second``.
+    """
+
+    latency_ms: float = 200.0
+    tokens_per_second: float = 50.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next_message(messages)
+        time.sleep(self._generation_seconds(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._next_message(messages)
+        await asyncio.sleep(self._generation_seconds(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        time.sleep(self.latency_ms / 1000)
+        for chunk in self._split_chunks(message):
+            time.sleep(self._token_seconds())
+            if run_manager and chunk.content:
+                run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        await asyncio.sleep(self.latency_ms / 1000)
+        for chunk in self._split_chunks(message):
+            await asyncio.sleep(self._token_seconds())
+            if run_manager and chunk.content:
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    def _token_seconds(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _generation_seconds(self, message: AIMessage) -> float:
+        return self.latency_ms / 1000 + message.usage_metadata["output_tokens"] * self._token_seconds()
+
+    def _split_chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        words = re.findall(r"\S+\s*", message.content)
+        chunks = [AIMessageChunk(content=word) for word in words]
+
+        chunks.append(AIMessageChunk(
+            content="",
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ],
+            usage_metadata=message.usage_metadata,
+        ))
+        return chunks
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        turn_start = max(
+            (i for i, msg in enumerate(messages) if isinstance(msg, HumanMessage)),
+            default=-1
+        )
+        user_text = messages[turn_start].content if turn_start >= 0 else ""
+        history_text = " ".join(msg.content for msg in messages[:turn_start] if isinstance(msg, HumanMessage))
+
+        results = {
+            msg.name: self._parse_tool_result(msg.content)
+            for msg in messages[turn_start + 1:]
+            if isinstance(msg, ToolMessage)
+        }
+
+        station_id = self._find_station_id(user_text)
+        insists = any(keyword in user_text.lower() for keyword in INSIST_KEYWORDS)
+        if not station_id and insists:
+            station_id = self._find_station_id(history_text)
+
+        prompt_tokens = sum(estimate_tokens(str(msg.content)) for msg in messages)
+        call_prefix = f"call_{len(messages)}"
+
+        if any(result.get("pending") for result in results.values()):
+            return self._reply(
+                "I'm still checking that for you. I'll let you know as soon as I have the result.", prompt_tokens
+            )
+
+        if "reboot_station" in results:
+            result = results["reboot_station"]
+            if result.get("success"):
+                return self._reply("Done! Station is rebooting... If you have any other questions, please ask", prompt_tokens)
+            return self._reply(result.get("message", "The reboot could not be completed."), prompt_tokens)
+
+        if "check_station_status" in results:
+            status = results["check_station_status"]
+            if not status.get("found"):
+                return self._reply(
+                    f"{status.get('message', 'Station not found')}. Please double-check the station number.",
+                    prompt_tokens
+                )
+            if status.get("is_problematic") or (not status.get("is_online") and insists):
+                return self._tool_calls(
+                    [("send_rebooting_message", {}), ("reboot_station", {"station_id": station_id})],
+                    call_prefix,
+                    prompt_tokens
+                )
+            suffix = " Would you like me to try rebooting it?" if not status.get("is_online") else ""
+            return self._reply(f"{status.get('message')}.{suffix}", prompt_tokens)
+
+        if "get_station_instructions" in results:
+            instructions = results["get_station_instructions"].get("instructions", "")
+            return self._reply(f"Please tell me your station ID. {instructions}", prompt_tokens)
+
+        if station_id:
+            return self._tool_calls(
+                [("send_checking_message", {}), ("check_station_status", {"station_id": station_id})],
+                call_prefix,
+                prompt_tokens
+            )
+
+        if any(keyword in user_text.lower() for keyword in PROBLEM_KEYWORDS):
+            return self._tool_calls([("get_station_instructions", {})], call_prefix, prompt_tokens)
+
+        return self._reply(
+            "Welcome to the EV Station Support! I can help with issues like 'Connector is stuck' or 'Reboot station'.",
+            prompt_tokens
+        )
+
+    @staticmethod
+    def _find_station_id(text: str) -> Optional[str]:
+        matches = STATION_ID_PATTERN.findall(text)
+        return matches[-1].upper() if matches else None
+
+    @staticmethod
+    def _parse_tool_result(content: Any) -> Dict[str, Any]:
+        if isinstance(content, dict):
+            return content
+        try:
+            parsed = json.loads(content)
+        except (TypeError, ValueError):
+            return {"message": str(content)}
+        return parsed if isinstance(parsed, dict) else {"message": str(parsed)}
+
+    @staticmethod
+    def _usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+        return {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _reply(self, content: str, prompt_tokens: int) -> AIMessage:
+        return AIMessage(content=content, usage_metadata=self._usage(prompt_tokens, estimate_tokens(content)))
+
+    def _tool_calls(self, calls: List[tuple], call_prefix: str, prompt_tokens: int) -> AIMessage:
+        tool_calls = [
+            {"name": name, "args": args, "id": f"{call_prefix}_{index}", "type": "tool_call"}
+            for index, (name, args) in enumerate(calls)
+        ]
+        completion_tokens = sum(estimate_tokens(json.dumps(call["args"])) + 1 for call in tool_calls)
+        return AIMessage(content="", tool_calls=tool_calls, usage_metadata=self._usage(prompt_tokens, completion_tokens))
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from src.config.settings import settings
+from src.models.schemas import RebootRequest, RebootResponse, StationStatus
+from src.services.station_registry import StationRegistry
+from src.services.station_service import StationService
+
+FAKE_STATION_PROFILES = {
+    "ST001": (True, "stuck"),
+    "ST002": (False, "error"),
+    "ST003": (True, "available"),
+    "ST004": (True, "occupied"),
+    "ST005": (True, "error"),
+}
+
+
+class FakeStationService(StationService):
+    _instance = None
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            super().__init__(StationRegistry.from_records(
+                {"station_id": station_id, "is_online": is_online, "connector_status": connector_status,
+                 "last_seen": time.time() - (0 if is_online else 45 * 60)}
+                for station_id, (is_online, connector_status) in FAKE_STATION_PROFILES.items()
+            ))
+            self._stations: Dict[str, StationStatus] = {}
+            self.check_latency = settings.fake_station_check_latency_ms / 1000
+            self.reboot_latency = settings.fake_station_reboot_latency_ms / 1000
+
+    def _profile_status(self, station_id: str) -> Optional[StationStatus]:
+        if station_id not in FAKE_STATION_PROFILES:
+            return None
+
+        is_online, connector_status = FAKE_STATION_PROFILES[station_id]
+        return StationStatus(
+            station_id=station_id,
+            is_online=is_online,
+            connector_status=connector_status,
+            last_seen=datetime.now() - (timedelta(0) if is_online else timedelta(minutes=45))
+        )
+
+    async def check_station_status(self, station_id: str) -> Optional[StationStatus]:
+        await asyncio.sleep(self.check_latency)
+
+        station = self._profile_status(station_id)
+        if station:
+            self._stations[station_id] = station
+        return station
+
+    async def reboot_station(self, request: RebootRequest) -> RebootResponse:
+        await asyncio.sleep(self.reboot_latency)
+
+        station_id = request.station_id
+        station = self._stations.get(station_id) or self._profile_status(station_id)
+
+        if not station:
+            return RebootResponse(
+                success=False,
+                message=f"Station {station_id} not found",
+                station_id=station_id
+            )
+
+        if not station.is_online:
+            return RebootResponse(
+                success=False,
+                message=f"Station {station_id} is offline and cannot be rebooted",
+                station_id=station_id
+            )
+
+        self.record_reboot(station_id)
+        return RebootResponse(
+            success=True,
+            message=f"Station {station_id} rebooted successfully",
+            station_id=station_id
+        )
@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import Body, FastAPI, HTTPException, Query
+
+
+class FakeVapiApi:
+    """In-memory stand-in for the VAPI assistant management API.
+
+    Serves the subset of endpoints VapiService uses (``GET/POST /assistant``
+    and ``GET /assistant/{id}``) with the same pagination semantics: newest
+    first, ``limit`` plus a ``createdAtLt`` cursor.
+    """
+
+    def __init__(self, assistants: int = 0, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self.list_calls = 0
+        self.create_calls = 0
+        self._assistants: List[Dict[str, Any]] = []
+        self._org_id = str(uuid.uuid4())
+
+        start = datetime.now(timezone.utc) - timedelta(seconds=assistants)
+        for index in range(assistants):
+            self._add(f"assistant-{index:05d}", start + timedelta(seconds=index))
+
+    def _add(self, name: Optional[str], created_at: datetime, **fields: Any) -> Dict[str, Any]:
+        timestamp = created_at.isoformat().replace("+00:00", "Z")
+        assistant = {
+            **fields,
+            "id": str(uuid.uuid4()),
+            "orgId": self._org_id,
+            "name": name,
+            "createdAt": timestamp,
+            "updatedAt": timestamp,
+        }
+        self._assistants.append(assistant)
+        return assistant
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake VAPI API")
+
+        @app.get("/assistant")
+        async def list_assistants(
+            limit: int = Query(default=100),
+            created_at_lt: Optional[datetime] = Query(default=None, alias="createdAtLt")
+        ) -> List[Dict[str, Any]]:
+            self.list_calls += 1
+            await asyncio.sleep(self.latency)
+
+            assistants = sorted(self._assistants, key=lambda item: item["createdAt"], reverse=True)
+            if created_at_lt is not None:
+                cursor = created_at_lt.isoformat().replace("+00:00", "Z")
+                assistants = [item for item in assistants if item["createdAt"] < cursor]
+            return assistants[:limit]
+
+        @app.post("/assistant")
+        async def create_assistant(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+            self.create_calls += 1
+            await asyncio.sleep(self.latency)
+            fields = {key: value for key, value in payload.items() if key != "name"}
+            return self._add(payload.get("name"), datetime.now(timezone.utc), **fields)
+
+        @app.get("/assistant/{assistant_id}")
+        async def get_assistant(assistant_id: str) -> Dict[str, Any]:
+            await asyncio.sleep(self.latency)
+            for assistant in self._assistants:
+                if assistant["id"] == assistant_id:
+                    return assistant
+            raise HTTPException(status_code=404, detail="Assistant not found")
+
+        return app
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadtest.fake_vapi",
+        description="Local stub of the VAPI assistant API (point VAPI_BASE_URL at it)"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--assistants", type=int, default=250, help="Assistants to seed")
+    parser.add_argument("--latency-ms", type=float, default=150, help="Latency added to every call")
+    args = parser.parse_args(argv)
+
+    app = FakeVapiApi(args.assistants, args.latency_ms).build_app()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
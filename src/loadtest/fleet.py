@@ -0,0 +1,61 @@
+import argparse
+import csv
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+from src.services.station_registry import CONNECTOR_STATUSES
+
+STATUS_WEIGHTS = (0.6, 0.3, 0.05, 0.05)
+FIELDS = ("station_id", "site_id", "is_online", "connector_status", "last_seen")
+
+
+def generate_fleet(stations: int, bays_per_site: int = 8, seed: int = 7) -> Iterator[Dict[str, object]]:
+    rng = random.Random(seed)
+    now = time.time()
+
+    for index in range(stations):
+        is_online = rng.random() > 0.03
+        yield {
+            "station_id": f"ST{index + 1:06d}",
+            "site_id": f"SITE{index // bays_per_site + 1:05d}",
+            "is_online": is_online,
+            "connector_status": rng.choices(CONNECTOR_STATUSES, weights=STATUS_WEIGHTS)[0],
+            "last_seen": now - (rng.uniform(0, 300) if is_online else rng.uniform(900, 86400)),
+        }
+
+
+def write_fleet(path: str, stations: int, bays_per_site: int = 8, seed: int = 7) -> None:
+    target = Path(path)
+    records = generate_fleet(stations, bays_per_site, seed)
+
+    with open(target, "w", newline="") as file:
+        if target.suffix.lower() == ".csv":
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        elif target.suffix.lower() in (".jsonl", ".ndjson"):
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+        else:
+            raise ValueError(f"Unsupported fleet export format: {target.suffix} (expected .csv or .jsonl)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadtest.fleet",
+        description="Write a synthetic fleet export for STATION_REGISTRY_PATH"
+    )
+    parser.add_argument("path", help="Output file (.csv or .jsonl)")
+    parser.add_argument("--stations", type=int, default=100_000)
+    parser.add_argument("--bays-per-site", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    write_fleet(args.path, args.stations, args.bays_per_site, args.seed)
+
+
+if __name__ == "__main__":
+    main()
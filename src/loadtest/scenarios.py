@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    turns: List[str]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "stuck_connector": Scenario(
+        name="stuck_connector",
+        turns=[
+            "The connector is stuck",
+            "ST001",
+        ]
+    ),
+    "offline_station": Scenario(
+        name="offline_station",
+        turns=[
+            "My station is offline",
+            "ST002",
+            "Please reboot it anyway",
+        ]
+    ),
+    "reboot_limit": Scenario(
+        name="reboot_limit",
+        turns=[
+            "I need to reboot my charging station",
+            "ST001",
+            "Reboot ST001 again",
+            "Reboot ST001 again",
+            "Reboot ST001 again",
+        ]
+    ),
+}
+
+
+def get_scenarios(names: List[str]) -> List[Scenario]:
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+    return [SCENARIOS[name] for name in names]
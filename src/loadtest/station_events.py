@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import json
+import random
+from typing import List, Optional
+
+import httpx
+
+from src.config.settings import settings
+from src.models.schemas import StationEvent
+from src.services.station_registry import CONNECTOR_STATUSES
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class StationEventProducer:
+    """Stub station backend that pushes status events to the API.
+
+    Emits random status changes for the given stations and, for a share of
+    them, a reboot that completes after ``reboot_seconds``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        station_ids: List[str],
+        rate: float,
+        reboot_share: float = 0.1,
+        reboot_seconds: float = 5.0,
+        token: Optional[str] = None,
+        seed: int = 7
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.station_ids = station_ids
+        self.rate = rate
+        self.reboot_share = reboot_share
+        self.reboot_seconds = reboot_seconds
+        self.headers = {"X-Station-Events-Token": token} if token else {}
+        self.rng = random.Random(seed)
+        self.sent = 0
+
+    def next_events(self) -> List[StationEvent]:
+        station_id = self.rng.choice(self.station_ids)
+        if self.rng.random() < self.reboot_share:
+            return [StationEvent(station_id=station_id, kind="reboot_started")]
+        return [StationEvent(
+            station_id=station_id,
+            is_online=self.rng.random() > 0.05,
+            connector_status=self.rng.choice(CONNECTOR_STATUSES)
+        )]
+
+    async def _complete_reboot(self, send, station_id: str) -> None:
+        await asyncio.sleep(self.reboot_seconds)
+        await send(StationEvent(
+            station_id=station_id, kind="reboot_completed", is_online=True, connector_status="available"
+        ))
+
+    async def _run(self, send, duration: float) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        reboots = set()
+
+        while loop.time() < deadline:
+            for event in self.next_events():
+                await send(event)
+                if event.kind == "reboot_started":
+                    reboots.add(asyncio.create_task(self._complete_reboot(send, event.station_id)))
+            await asyncio.sleep(1 / self.rate)
+
+        if reboots:
+            await asyncio.wait(reboots)
+
+    async def run_webhook(self, duration: float) -> None:
+        async with httpx.AsyncClient(headers=self.headers) as client:
+            async def send(event: StationEvent) -> None:
+                response = await client.post(
+                    f"{self.base_url}/stations/events", content=event.model_dump_json(),
+                    headers={"Content-Type": "application/json"}
+                )
+                response.raise_for_status()
+                self.sent += 1
+
+            await self._run(send, duration)
+
+    async def run_websocket(self, duration: float) -> None:
+        from websockets.asyncio.client import connect
+
+        url = self.base_url.replace("http", "ws", 1) + "/stations/events/ws"
+        async with connect(url, additional_headers=self.headers) as websocket:
+            async def send(event: StationEvent) -> None:
+                await websocket.send(event.model_dump_json())
+                self.sent += 1
+
+            await self._run(send, duration)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.loadtest.station_events",
+        description="Stub producer that pushes station status events to a running server"
+    )
+    parser.add_argument("--url", default=f"http://127.0.0.1:{settings.port}")
+    parser.add_argument("--transport", choices=["webhook", "websocket"], default="webhook")
+    parser.add_argument("--stations", default="ST001,ST002,ST003,ST004,ST005", help="Comma-separated station IDs")
+    parser.add_argument("--rate", type=float, default=5.0, help="Events per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to produce events for")
+    parser.add_argument("--reboot-share", type=float, default=0.1, help="Share of events that start a reboot")
+    parser.add_argument("--reboot-seconds", type=float, default=5.0, help="Delay before a reboot completes")
+    args = parser.parse_args(argv)
+
+    producer = StationEventProducer(
+        args.url, args.stations.split(","), args.rate, args.reboot_share, args.reboot_seconds,
+        token=settings.station_events_token
+    )
+    runner = producer.run_websocket if args.transport == "websocket" else producer.run_webhook
+    asyncio.run(runner(args.duration))
+    print(json.dumps({"sent": producer.sent}))
+
+
+if __name__ == "__main__":
+    main()
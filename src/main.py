@@ -1,16 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api.routes import chat
+from src.api.routes import admin, chat, fleet, health, metrics, stations
+from src.config.settings import settings
+from src.services.archive_service import ArchiveService
+from src.services.chat_service import ChatService
+from src.services.incident_service import IncidentService
+from src.services.warmup_service import WarmupService
 from src.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = None
+    if settings.warmup_blocking:
+        await WarmupService().run()
+    else:
+        warmup = asyncio.create_task(WarmupService().run())
+    IncidentService().start()
+
+    yield
+
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    await IncidentService().stop()
+    ChatService().archive_all_sessions()
+    await asyncio.to_thread(ArchiveService().stop)
+
+
 app = FastAPI(
     title="EV Charging Station Chatbot",
     description="API for interacting with the EV Charging Station Chatbot",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -21,7 +49,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(health.router)
 app.include_router(chat.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+app.include_router(fleet.router)
+app.include_router(stations.router)
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -16,6 +16,7 @@ class ChatMessage(BaseModel):
 
 class StationStatus(BaseModel):
     station_id: str = Field(description="Station identifier")
+    site_id: Optional[str] = Field(default=None, description="Site the station belongs to")
     is_online: bool = Field(description="Station online status")
     connector_status: Literal["available", "occupied", "stuck", "error"] = Field(
         description="Connector status"
@@ -23,6 +24,83 @@ class StationStatus(BaseModel):
     last_seen: datetime = Field(description="Last communication timestamp")
 
 
+class StationEvent(BaseModel):
+    station_id: str = Field(description="Station identifier")
+    kind: Literal["status", "reboot_started", "reboot_completed", "reboot_failed"] = Field(
+        default="status", description="Event type"
+    )
+    is_online: Optional[bool] = Field(default=None, description="Reported online status")
+    connector_status: Optional[Literal["available", "occupied", "stuck", "error"]] = Field(
+        default=None, description="Reported connector status"
+    )
+    timestamp: datetime = Field(default_factory=datetime.now, description="When the station reported the event")
+
+
+class StationHealth(BaseModel):
+    station_id: str = Field(description="Station identifier")
+    site_id: Optional[str] = Field(default=None, description="Site the station belongs to")
+    is_online: bool = Field(description="Station online status")
+    connector_status: str = Field(description="Connector status")
+    silent_seconds: float = Field(description="Seconds since the station last communicated")
+    issue: Optional[Literal["stuck", "error", "silent"]] = Field(default=None, description="Detected problem")
+
+
+class SiteHealth(BaseModel):
+    site_id: str = Field(description="Site identifier")
+    total: int = Field(description="Stations at the site")
+    unhealthy: int = Field(description="Stations that are stuck, in error or silent")
+    stations: List[StationHealth] = Field(default_factory=list, description="Per-station health")
+
+
+class FleetHealthReport(BaseModel):
+    scanned: int = Field(description="Stations scanned")
+    stuck: int = Field(description="Online stations with a stuck connector")
+    error: int = Field(description="Stations reporting a connector error")
+    silent: int = Field(description="Stations offline or silent beyond the threshold")
+    unhealthy: int = Field(description="Stations with at least one problem")
+    scan_ms: float = Field(description="Scan duration in milliseconds")
+    worst_sites: List[SiteHealth] = Field(default_factory=list, description="Sites with the most unhealthy stations")
+
+
+class IncidentTotals(BaseModel):
+    key: Optional[str] = Field(default=None, description="Station, site or bucket start the totals are for")
+    checks: int = Field(default=0, description="Status checks")
+    stuck: int = Field(default=0, description="Checks that found a stuck connector")
+    error: int = Field(default=0, description="Checks that found a connector error")
+    offline: int = Field(default=0, description="Checks that found the station offline")
+    reboots: int = Field(default=0, description="Reboots attempted")
+    reboots_succeeded: int = Field(default=0, description="Reboots that succeeded")
+    reboot_success_rate: Optional[float] = Field(default=None, description="Share of reboots that succeeded")
+
+
+class HourActivity(BaseModel):
+    hour: int = Field(description="Hour of day (UTC)")
+    events: int = Field(description="Checks and reboots in that hour across the window")
+
+
+class IncidentReport(BaseModel):
+    window_seconds: int = Field(description="Length of the window the totals cover")
+    buckets: int = Field(description="Time buckets read to answer the query")
+    live_stuck: int = Field(description="Stations whose latest check found a stuck connector")
+    live_error: int = Field(description="Stations whose latest check found a connector error")
+    live_offline: int = Field(description="Stations whose latest check found them offline")
+    live_tracked: int = Field(description="Stations checked recently enough to count as live")
+    totals: IncidentTotals = Field(description="Totals over the window")
+    worst_sites: List[IncidentTotals] = Field(default_factory=list, description="Sites with the most incidents")
+    worst_stations: List[IncidentTotals] = Field(default_factory=list, description="Stations with the most incidents")
+    busiest_hours: List[HourActivity] = Field(default_factory=list, description="Hours of day by activity, busiest first")
+    timeline: List[IncidentTotals] = Field(default_factory=list, description="Totals per bucket, oldest first")
+    query_ms: float = Field(description="Query duration in milliseconds")
+
+
+class RebootCandidate(BaseModel):
+    station_id: str = Field(description="Station identifier")
+    site_id: Optional[str] = Field(default=None, description="Site the station belongs to")
+    connector_status: str = Field(description="Connector status")
+    score: float = Field(description="Priority score, higher first")
+    recent_reboots: int = Field(description="Reboots within the reboot limit window")
+
+
 class RebootRequest(BaseModel):
     station_id: str = Field(description="Station identifier")
     reason: str = Field(default="Connector stuck", description="Reason for reboot")
@@ -39,10 +117,11 @@ class VapiAssistant(BaseModel):
 
     @classmethod
     def from_client_assistant(cls, assistant) -> 'VapiAssistant':
-        return cls(id=assistant.id, name=assistant.name)
+        return cls(id=assistant.id, name=assistant.name or "")
 
 class AssistantResponse(BaseModel):
     names: List[VapiAssistant] = Field(description="VAPI assistant's names")
+    next_cursor: Optional[datetime] = Field(default=None, description="Cursor for the next page of assistants")
 
 
 class VapiDeepgramTranscriber(BaseModel):
@@ -80,4 +159,5 @@ class LLMRequest(BaseModel):
     provider: Optional[str] = Field(default=None, description="Model name")
     session_id: Optional[str] = Field(default=None, description="Session identifier")
     user_id: Optional[str] = Field(default=None, description="User identifier")
+    scenario: Optional[str] = Field(default=None, description="Scenario label used for usage accounting")
 
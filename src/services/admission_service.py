@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Optional
+
+from src.config.settings import settings
+from src.utils import setup_logger
+from src.utils.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_SHED, ADMISSION_WAIT_SECONDS
+
+logger = setup_logger(__name__)
+
+VOICE_PRIORITY = 0
+TEXT_PRIORITY = 1
+PRIORITY_NAMES = {VOICE_PRIORITY: "voice", TEXT_PRIORITY: "text"}
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, provider: str, reason: str, retry_after: int):
+        super().__init__(f"Provider {provider} is at capacity ({reason}), retry after {retry_after}s")
+        self.provider = provider
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLease:
+    __slots__ = ("_gate", "_started_at", "_released")
+
+    def __init__(self, gate: "ProviderGate"):
+        self._gate = gate
+        self._started_at = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._gate.release(time.monotonic() - self._started_at)
+
+
+class ProviderGate:
+    def __init__(self, provider: str, limit: int, max_queue: int):
+        self.provider = provider
+        self.limit = limit
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.avg_turn_seconds = settings.admission_initial_turn_seconds
+        self.admitted = 0
+        self.shed: Dict[str, int] = {}
+        self._waiters: List[list] = []
+        self._sequence = itertools.count()
+
+    def _live_waiters(self, priority: Optional[int] = None) -> int:
+        return sum(
+            1 for entry in self._waiters
+            if not entry[2].done() and (priority is None or entry[0] <= priority)
+        )
+
+    def estimated_wait(self, priority: int) -> float:
+        if self.in_flight < self.limit and not self._live_waiters(priority):
+            return 0.0
+        return (self._live_waiters(priority) + 1) / self.limit * self.avg_turn_seconds
+
+    def _reject(self, priority: int, reason: str) -> AdmissionRejected:
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        ADMISSION_SHED.labels(provider=self.provider, priority=PRIORITY_NAMES[priority], reason=reason).inc()
+        retry_after = max(1, math.ceil(self.estimated_wait(priority)))
+        logger.warning("Shedding %s request for provider %s: %s", PRIORITY_NAMES[priority], self.provider, reason)
+        return AdmissionRejected(self.provider, reason, retry_after)
+
+    def _admit(self, priority: int, waited: float) -> AdmissionLease:
+        self.in_flight += 1
+        self.admitted += 1
+        ADMISSION_IN_FLIGHT.labels(provider=self.provider).set(self.in_flight)
+        ADMISSION_WAIT_SECONDS.labels(provider=self.provider, priority=PRIORITY_NAMES[priority]).observe(waited)
+        return AdmissionLease(self)
+
+    async def acquire(self, priority: int, budget: float) -> AdmissionLease:
+        if self.in_flight < self.limit and not self._live_waiters(priority):
+            return self._admit(priority, 0.0)
+
+        if self._live_waiters() >= self.max_queue:
+            raise self._reject(priority, "queue_full")
+
+        if self.estimated_wait(priority) > budget:
+            raise self._reject(priority, "over_budget")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._sequence), future])
+        ADMISSION_QUEUED.labels(provider=self.provider).set(self._live_waiters())
+        start = time.monotonic()
+
+        try:
+            await asyncio.wait_for(future, budget)
+        except asyncio.TimeoutError:
+            raise self._reject(priority, "deadline")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(time.monotonic() - start)
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(provider=self.provider).set(self._live_waiters())
+
+        ADMISSION_WAIT_SECONDS.labels(provider=self.provider, priority=PRIORITY_NAMES[priority]).observe(
+            time.monotonic() - start
+        )
+        return AdmissionLease(self)
+
+    def release(self, duration: float) -> None:
+        self.avg_turn_seconds += 0.1 * (duration - self.avg_turn_seconds)
+
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.admitted += 1
+                future.set_result(None)
+                return
+
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.labels(provider=self.provider).set(self.in_flight)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self._live_waiters(),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "avg_turn_seconds": round(self.avg_turn_seconds, 3),
+        }
+
+
+class AdmissionService:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AdmissionService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._gates: Dict[str, ProviderGate] = {}
+            self._initialized = True
+
+    def _gate(self, provider: str) -> ProviderGate:
+        gate = self._gates.get(provider)
+        if gate is None:
+            limit = settings.admission_provider_limits.get(provider, settings.admission_max_concurrency)
+            gate = self._gates[provider] = ProviderGate(provider, limit, settings.admission_max_queue)
+        return gate
+
+    async def acquire(self, provider: str, voice: bool = False) -> AdmissionLease:
+        if voice:
+            return await self._gate(provider).acquire(VOICE_PRIORITY, settings.admission_voice_budget_ms / 1000)
+        return await self._gate(provider).acquire(TEXT_PRIORITY, settings.admission_text_budget_ms / 1000)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {provider: gate.stats() for provider, gate in self._gates.items()}
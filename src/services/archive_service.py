@@ -0,0 +1,230 @@
+import argparse
+import gzip
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Iterator, List, Optional
+
+from src.config.settings import settings
+from src.utils import setup_logger
+from src.utils.metrics import ARCHIVE_BATCH_SECONDS, ARCHIVE_RECORDS
+
+logger = setup_logger(__name__)
+
+_STOP = object()
+FILE_PREFIX = "transcripts-"
+
+
+class ArchiveService:
+    """Append-only transcript archive written by a background thread.
+
+    Turn and session records are queued without blocking the caller; a full
+    queue drops the record (counted in ``ev_archive_records_total``) rather
+    than slowing a live turn. The writer drains the queue in batches, writes
+    them as JSON lines, fsyncs once per batch and rotates to a new file when
+    ``archive_max_file_mb`` is reached on disk.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ArchiveService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._queue: queue.Queue = queue.Queue(maxsize=settings.archive_queue_size)
+            self._lock = threading.Lock()
+            self._thread: Optional[threading.Thread] = None
+            self._raw: Optional[IO[bytes]] = None
+            self._stream: Optional[IO[bytes]] = None
+            self._sequence = 0
+            self._initialized = True
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.archive_dir)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                Path(settings.archive_dir).mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name="transcript-archiver", daemon=True)
+                self._thread.start()
+                logger.info("Archiving transcripts to %s", settings.archive_dir)
+
+    def submit(self, record: dict) -> bool:
+        if not self.enabled:
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            ARCHIVE_RECORDS.labels(outcome="dropped").inc()
+            logger.warning("Archive queue full, dropping %s record for session %s",
+                           record.get("type"), record.get("session_id"))
+            return False
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Archive queue still full at shutdown, unwritten records are lost")
+            return
+        thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=settings.archive_flush_seconds)
+            except queue.Empty:
+                continue
+
+            batch: List[dict] = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= settings.archive_batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    ARCHIVE_RECORDS.labels(outcome="failed").inc(len(batch))
+                    logger.error("Failed to archive %d record(s): %s", len(batch), e, exc_info=True)
+
+        self._close()
+
+    def _write_batch(self, batch: List[dict]) -> None:
+        start = time.perf_counter()
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in batch
+        ).encode()
+
+        # Sizes are bytes on disk. A gzipped batch is only measured once it is
+        # written, so a compressed file may end up one batch past the limit.
+        size = self._raw.tell() if self._raw is not None else 0
+        incoming = len(data) if self._stream is self._raw else 0
+        if self._stream is None or (size and size + incoming > settings.archive_max_file_mb * 2**20):
+            self._rotate()
+
+        self._stream.write(data)
+        self._stream.flush()
+        if self._stream is not self._raw:
+            self._raw.flush()
+        if settings.archive_fsync:
+            os.fsync(self._raw.fileno())
+
+        ARCHIVE_RECORDS.labels(outcome="written").inc(len(batch))
+        ARCHIVE_BATCH_SECONDS.observe(time.perf_counter() - start)
+
+    def _rotate(self) -> None:
+        self._close()
+        self._sequence += 1
+        suffix = ".jsonl.gz" if settings.archive_compress else ".jsonl"
+        path = Path(settings.archive_dir) / f"{FILE_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence:04d}{suffix}"
+
+        self._raw = open(path, "ab")
+        self._stream = gzip.GzipFile(fileobj=self._raw, mode="ab") if settings.archive_compress else self._raw
+        logger.info("Opened archive file %s", path)
+
+    def _close(self) -> None:
+        if self._stream is not None and self._stream is not self._raw:
+            self._stream.close()
+        if self._raw is not None:
+            self._raw.close()
+        self._stream = self._raw = None
+
+
+def _open_archive(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_archive(
+    directory: str,
+    session_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    station_id: Optional[str] = None,
+    since: Optional[float] = None
+) -> Iterator[dict]:
+    """Stream archived records matching every given filter, oldest file first."""
+    # Encoded the way the writer encodes them, so quotes and backslashes match too.
+    needles = [json.dumps(value, ensure_ascii=False) for value in (session_id, user_id, station_id) if value]
+
+    for path in sorted(Path(directory).glob(f"{FILE_PREFIX}*.jsonl*")):
+        if since is not None and path.stat().st_mtime < since:
+            continue
+
+        with _open_archive(path) as lines:
+            try:
+                for line in lines:
+                    # Cheap substring test first so most lines are never parsed.
+                    if not all(needle in line for needle in needles):
+                        continue
+                    record = json.loads(line)
+                    if session_id and record.get("session_id") != session_id:
+                        continue
+                    if user_id and record.get("user_id") != user_id:
+                        continue
+                    if station_id and station_id not in record.get("station_ids", ()):
+                        continue
+                    if since is not None and record.get("ts", 0) < since:
+                        continue
+                    yield record
+            except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+                # The file still being written, or cut short by a crash.
+                logger.warning("Stopped reading %s early: %s", path, e)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.services.archive_service",
+        description="Query archived transcripts by session, user or station ID"
+    )
+    parser.add_argument("--dir", default=settings.archive_dir, help="Archive directory")
+    parser.add_argument("--session", help="Session ID")
+    parser.add_argument("--user", help="User ID")
+    parser.add_argument("--station", help="Station ID mentioned in the conversation")
+    parser.add_argument("--since", help="Only records at or after this ISO timestamp")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many records")
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        parser.error("no archive directory: pass --dir or set ARCHIVE_DIR")
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    records = iter_archive(args.dir, args.session, args.user, args.station, since)
+    for count, record in enumerate(records, 1):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if args.limit and count >= args.limit:
+            break
+
+
+if __name__ == "__main__":
+    main()
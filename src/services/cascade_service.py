@@ -0,0 +1,94 @@
+from typing import Any, Dict, Optional, Tuple
+
+from src.agents.cascade import DETERMINISTIC, MAIN, SMALL, TIERS
+from src.config.settings import settings
+from src.services.llm_service import small_provider_name
+from src.services.usage_service import UsageTotals, extract_usage
+from src.utils import setup_logger
+from src.utils.metrics import LLM_CASCADE_TURNS
+
+logger = setup_logger(__name__)
+
+
+class CascadeService:
+    """Per-provider accounting of which cascade tier answered each turn.
+
+    Only the first model call of a turn is counted, so the main tier's
+    averages are a fair baseline for what the cheaper tiers would have cost.
+    Savings are estimates against that baseline.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CascadeService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._totals: Dict[Tuple[str, str], UsageTotals] = {}
+            self._reasons: Dict[Tuple[str, str], int] = {}
+            self._initialized = True
+
+    @staticmethod
+    def applies_to(provider: str) -> bool:
+        return settings.llm_cascade_enabled and (
+            not settings.llm_cascade_providers or provider in settings.llm_cascade_providers
+        )
+
+    def record(self, provider: str, tier: str, reason: str, seconds: float, response: Any = None) -> None:
+        input_tokens, output_tokens = extract_usage(response) if tier != DETERMINISTIC else (0, 0)
+        self._totals.setdefault((provider, tier), UsageTotals()).add(input_tokens, output_tokens, seconds)
+        self._reasons[(tier, reason)] = self._reasons.get((tier, reason), 0) + 1
+        LLM_CASCADE_TURNS.labels(provider=provider, tier=tier, reason=reason).inc()
+        logger.debug("Cascade sent a %s turn on %s to the %s tier", reason, provider, tier)
+
+    @staticmethod
+    def _cost(provider: str, tokens: int) -> Optional[float]:
+        price = settings.llm_cascade_token_costs.get(provider)
+        return None if price is None else tokens / 1000 * price
+
+    def _savings(self, provider: str, tiers: Dict[str, UsageTotals]) -> Dict[str, Any]:
+        main = tiers.get(MAIN)
+        if main is None or not main.requests:
+            return {"seconds": None, "usd": None}
+
+        main_seconds = main.llm_seconds / main.requests
+        main_tokens = main.total_tokens / main.requests
+        seconds = 0.0
+        usd: Optional[float] = 0.0
+        for tier, small_provider in ((DETERMINISTIC, None), (SMALL, small_provider_name(provider))):
+            totals = tiers.get(tier)
+            if totals is None:
+                continue
+            seconds += totals.requests * main_seconds - totals.llm_seconds
+            baseline = self._cost(provider, round(totals.requests * main_tokens))
+            spent = self._cost(small_provider, totals.total_tokens) if small_provider else 0.0
+            usd = None if usd is None or baseline is None or spent is None else usd + baseline - spent
+
+        return {"seconds": round(seconds, 3), "usd": None if usd is None else round(usd, 6)}
+
+    def summary(self) -> Dict[str, Any]:
+        by_provider: Dict[str, Dict[str, UsageTotals]] = {}
+        for (provider, tier), totals in self._totals.items():
+            by_provider.setdefault(provider, {})[tier] = totals
+
+        providers = {}
+        for provider, tiers in by_provider.items():
+            turns = sum(totals.requests for totals in tiers.values())
+            providers[provider] = {
+                "turns": turns,
+                "tiers": {
+                    tier: {**tiers[tier].to_dict(), "share": round(tiers[tier].requests / turns, 3)}
+                    for tier in TIERS if tier in tiers
+                },
+                "estimated_savings": self._savings(provider, tiers),
+            }
+
+        return {
+            "enabled": settings.llm_cascade_enabled,
+            "providers": providers,
+            "reasons": {f"{tier}:{reason}": count for (tier, reason), count in sorted(self._reasons.items())},
+        }
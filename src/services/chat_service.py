@@ -1,18 +1,66 @@
 import uuid
 import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 
-from src.models.schemas import ChatSession, ChatMessage, MessageRole
+from src.models.schemas import ChatSession, ChatMessage
+from src.config.settings import settings
+from src.services.archive_service import ArchiveService
+from src.services.transcript_store import Transcript
 from src.utils import setup_logger
 
 logger = setup_logger(__name__)
 
+
+class SessionRecord:
+    __slots__ = (
+        "session_id", "user_id", "transcript", "created_at", "reboot_count", "last_reboot_time",
+        "last_active", "archived", "station_ids", "in_use"
+    )
+
+    def __init__(self, session_id: str, user_id: str) -> None:
+        self.session_id = session_id
+        self.user_id = user_id
+        self.transcript = Transcript()
+        self.created_at = datetime.now()
+        self.reboot_count = 0
+        self.last_reboot_time: Optional[float] = None
+        self.last_active = time.monotonic()
+        self.archived = 0
+        self.station_ids: List[str] = []
+        # Open connections and admitted turns; the session is not evicted while any remain.
+        self.in_use = 0
+
+    def archive_record(self, kind: str, station_ids: Iterable[str] = ()) -> dict:
+        """Build an archive record with the messages not archived yet."""
+        entries = self.transcript.tail(len(self.transcript) - self.archived)
+        self.archived = len(self.transcript)
+        return {
+            "type": kind,
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "ts": time.time(),
+            "station_ids": list(station_ids),
+            "messages": [
+                {"role": entry.role, "content": entry.content, "ts": entry.timestamp} for entry in entries
+            ],
+        }
+
+    def to_model(self) -> ChatSession:
+        return ChatSession(
+            session_id=self.session_id,
+            user_id=self.user_id,
+            messages=self.transcript.to_messages(),
+            created_at=self.created_at,
+            reboot_count=self.reboot_count,
+            last_reboot_time=self.last_reboot_time
+        )
+
+
 class ChatService:
     _instance = None
-    _sessions: Dict[str, ChatSession] = {}
     
     def __new__(cls):
         if cls._instance is None:
@@ -22,61 +70,121 @@ class ChatService:
     
     def __init__(self) -> None:
         if not hasattr(self, '_initialized') or not self._initialized:
+            self._sessions: Dict[str, SessionRecord] = {}
+            self.archive_service = ArchiveService()
+            self._last_sweep = time.monotonic()
             self._initialized = True
 
-    def create_session(self, user_id: str, session_id: str) -> ChatSession:
-        session = ChatSession(
-            session_id=session_id,
-            user_id=user_id,
-            messages=[],
-            reboot_count=0,
-            last_reboot_time=None,
-            created_at=datetime.now()
-        )
+    def create_session(self, user_id: str, session_id: str) -> SessionRecord:
+        session = SessionRecord(session_id, user_id)
 
-        logger.info("Session created: %s", session)
+        logger.info("Session created: %s (user %s)", session_id, user_id)
         self._sessions[session_id] = session
         return session
 
+    def ensure_session(self, user_id: str, session_id: str) -> SessionRecord:
+        return self._sessions.get(session_id) or self.create_session(user_id, session_id)
+
+    def discard_session(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def hold_session(self, user_id: str, session_id: str) -> None:
+        session = self.ensure_session(user_id, session_id)
+        session.in_use += 1
+        session.last_active = time.monotonic()
+
+    def release_session(self, session_id: str) -> None:
+        session = self._sessions.get(session_id)
+        if session and session.in_use:
+            session.in_use -= 1
+            session.last_active = time.monotonic()
+
     def get_session(self, session_id: str) -> Optional[ChatSession]:
         session = self._sessions.get(session_id)
-        logger.info("Session found: %s", session)
-        return session
+        logger.debug("Session lookup: %s found=%s", session_id, session is not None)
+        return session.to_model() if session else None
 
-    def add_message(self, session_id: str, message: ChatMessage) -> bool:
+    def append_message(self, session_id: str, role: str, content: str) -> bool:
         session = self._sessions.get(session_id)
         if session:
-            session.messages.append(message)
+            session.transcript.append(role, content)
+            session.last_active = time.monotonic()
             return True
         return False
+
+    def complete_turn(self, session_id: str, station_ids: Iterable[str] = ()) -> None:
+        session = self._sessions.get(session_id)
+        if not session or not self.archive_service.enabled:
+            return
+
+        station_ids = list(dict.fromkeys(station_ids))
+        for station_id in station_ids:
+            if station_id not in session.station_ids:
+                session.station_ids.append(station_id)
+        self.archive_service.submit(session.archive_record("turn", station_ids))
+
+    def evict_idle_sessions(self) -> List[str]:
+        """Archive and drop sessions idle for longer than ``session_idle_ttl_seconds``.
+
+        Sessions held by an open connection or an admitted turn are kept. Runs
+        at most once a minute, so it can be called on every new session.
+        """
+        now = time.monotonic()
+        if now - self._last_sweep < 60:
+            return []
+        self._last_sweep = now
+
+        cutoff = now - settings.session_idle_ttl_seconds
+        evicted = [
+            session_id for session_id, session in self._sessions.items()
+            if not session.in_use and session.last_active < cutoff
+        ]
+        for session_id in evicted:
+            self._archive_session(self._sessions.pop(session_id), "evicted")
+        if evicted:
+            logger.info("Evicted %d idle session(s)", len(evicted))
+        return evicted
+
+    def archive_all_sessions(self) -> None:
+        for session in self._sessions.values():
+            self._archive_session(session, "shutdown")
+
+    def _archive_session(self, session: SessionRecord, reason: str) -> None:
+        if not self.archive_service.enabled:
+            return
+
+        record = session.archive_record("session", session.station_ids)
+        record.update(
+            reason=reason,
+            created_at=session.created_at.isoformat(),
+            message_count=len(session.transcript),
+            reboot_count=session.reboot_count
+        )
+        self.archive_service.submit(record)
+
+    def add_message(self, session_id: str, message: ChatMessage) -> bool:
+        return self.append_message(session_id, message.role, message.content)
         
     def get_reboot_count(self, session_id: str) -> int:
-        logger.info("Checking reboot count for session id: %s", session_id)
         session = self._sessions.get(session_id)
-        logger.info("Session: %s", session)
-        if session:
-            logger.info("Session count: %s", session.reboot_count)
+        logger.debug("Reboot count for session %s: %s", session_id, session.reboot_count if session else None)
         return session.reboot_count if session else 0
         
     def increment_reboot_count(self, session_id: str) -> bool:
-        logger.info("Incrementing reboot count for session id: %s", session_id)
         session = self._sessions.get(session_id)
-        logger.info("Session: %s", session)
         if session:
             session.reboot_count += 1
             session.last_reboot_time = time.time()
-            logger.info("Session count: %s", session.reboot_count)
+            logger.info("Incremented reboot count for session %s to %s", session_id, session.reboot_count)
             return True
         return False
         
     def reset_reboot_count(self, session_id: str) -> bool:
-        logger.info("Resetting reboot count for session id: %s", session_id)
         session = self._sessions.get(session_id)
-        logger.info("Session: %s", session)
         if session:
             session.reboot_count = 0
             session.last_reboot_time = None
-            logger.info("Session count: %s", session.reboot_count)
+            logger.info("Reset reboot count for session %s", session_id)
             return True
         return False
         
@@ -97,7 +205,4 @@ class ChatService:
         else:
             return False
             
-        return self.add_message(
-            session_id,
-            ChatMessage(role=MessageRole(role), content=message.content)
-        )
\ No newline at end of file
+        return self.append_message(session_id, role, message.content)
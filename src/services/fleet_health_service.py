@@ -0,0 +1,157 @@
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.config.settings import settings
+from src.models.schemas import FleetHealthReport, RebootCandidate, SiteHealth, StationHealth
+from src.services.station_registry import CONNECTOR_STATUSES, STATUS_CODES, StationRegistry
+from src.services.station_service import StationService
+from src.utils import setup_logger
+from src.utils.metrics import FLEET_SCAN_SECONDS, FLEET_UNHEALTHY
+
+logger = setup_logger(__name__)
+
+STUCK = STATUS_CODES["stuck"]
+ERROR = STATUS_CODES["error"]
+
+
+class FleetScan:
+    __slots__ = ("now", "stuck", "error", "silent", "unhealthy", "silent_seconds", "elapsed")
+
+    def __init__(self, registry: StationRegistry, silent_after: float):
+        start = time.perf_counter()
+        self.now = time.time()
+
+        status = registry.status_codes
+        online = registry.online
+        self.silent_seconds = self.now - registry.last_seen
+        self.silent = ~online | (self.silent_seconds > silent_after)
+        self.stuck = online & (status == STUCK)
+        self.error = status == ERROR
+        self.unhealthy = self.stuck | self.error | self.silent
+
+        self.elapsed = time.perf_counter() - start
+
+
+class FleetHealthService:
+    def __init__(self, station_service: StationService):
+        self.station_service = station_service
+        self.registry = station_service.registry
+
+    def scan(self) -> FleetScan:
+        result = FleetScan(self.registry, settings.fleet_silent_after_seconds)
+        FLEET_SCAN_SECONDS.observe(result.elapsed)
+        FLEET_UNHEALTHY.labels(issue="stuck").set(int(result.stuck.sum()))
+        FLEET_UNHEALTHY.labels(issue="error").set(int(result.error.sum()))
+        FLEET_UNHEALTHY.labels(issue="silent").set(int(result.silent.sum()))
+        return result
+
+    def _station_health(self, result: FleetScan, row: int) -> StationHealth:
+        registry = self.registry
+        if result.stuck[row]:
+            issue = "stuck"
+        elif result.error[row]:
+            issue = "error"
+        elif result.silent[row]:
+            issue = "silent"
+        else:
+            issue = None
+
+        return StationHealth(
+            station_id=registry.ids[row].decode(),
+            site_id=registry.sites[registry.site_codes[row]] or None,
+            is_online=bool(registry.online[row]),
+            connector_status=CONNECTOR_STATUSES[registry.status_codes[row]],
+            silent_seconds=round(float(result.silent_seconds[row]), 1),
+            issue=issue
+        )
+
+    def fleet_report(self, top_sites: int = 10) -> FleetHealthReport:
+        result = self.scan()
+        registry = self.registry
+
+        unhealthy_per_site = np.bincount(
+            registry.site_codes[result.unhealthy], minlength=len(registry.sites)
+        )
+        totals_per_site = np.bincount(registry.site_codes, minlength=len(registry.sites))
+
+        top_sites = min(top_sites, int(np.count_nonzero(unhealthy_per_site)))
+        worst = np.argpartition(-unhealthy_per_site, top_sites - 1)[:top_sites] if top_sites else []
+        worst = sorted(worst, key=lambda code: -unhealthy_per_site[code])
+
+        return FleetHealthReport(
+            scanned=len(registry),
+            stuck=int(result.stuck.sum()),
+            error=int(result.error.sum()),
+            silent=int(result.silent.sum()),
+            unhealthy=int(result.unhealthy.sum()),
+            scan_ms=round(result.elapsed * 1000, 3),
+            worst_sites=[
+                SiteHealth(
+                    site_id=registry.sites[code],
+                    total=int(totals_per_site[code]),
+                    unhealthy=int(unhealthy_per_site[code])
+                )
+                for code in worst
+            ]
+        )
+
+    def site_health(self, site_id: str) -> Optional[SiteHealth]:
+        rows = self.registry.site_rows(site_id)
+        if not len(rows):
+            return None
+
+        result = self.scan()
+        return SiteHealth(
+            site_id=site_id,
+            total=len(rows),
+            unhealthy=int(result.unhealthy[rows].sum()),
+            stations=[self._station_health(result, row) for row in rows.tolist()]
+        )
+
+    def station_site_health(self, station_id: str) -> Optional[SiteHealth]:
+        status = self.registry.get(station_id)
+        if status is None or not status.site_id:
+            return None
+        return self.site_health(status.site_id)
+
+    def reboot_candidates(self, limit: int = 20) -> List[RebootCandidate]:
+        result = self.scan()
+        registry = self.registry
+
+        rebootable = (result.stuck | (result.error & registry.online)) & ~result.silent
+        rows = np.flatnonzero(rebootable)
+        if not len(rows):
+            return []
+
+        unhealthy_per_site = np.bincount(
+            registry.site_codes[result.unhealthy], minlength=len(registry.sites)
+        )
+        totals_per_site = np.bincount(registry.site_codes, minlength=len(registry.sites))
+        site_impact = unhealthy_per_site / np.maximum(totals_per_site, 1)
+
+        # Stuck connectors are the failure a reboot fixes most reliably; sites
+        # with more broken bays come first because more drivers are blocked.
+        scores = np.where(result.stuck[rows], 2.0, 1.0) + site_impact[registry.site_codes[rows]]
+        ranking = np.argsort(-scores, kind="stable")
+        order, scores = rows[ranking], scores[ranking]
+
+        candidates = []
+        for row, score in zip(order.tolist(), scores.tolist()):
+            station_id = registry.ids[row].decode()
+            recent = self.station_service.recent_reboots(station_id)
+            if recent >= settings.reboot_limit:
+                continue
+
+            candidates.append(RebootCandidate(
+                station_id=station_id,
+                site_id=registry.sites[registry.site_codes[row]] or None,
+                connector_status=CONNECTOR_STATUSES[registry.status_codes[row]],
+                score=round(score, 3),
+                recent_reboots=recent
+            ))
+            if len(candidates) >= limit:
+                break
+
+        return candidates
@@ -0,0 +1,321 @@
+import asyncio
+import heapq
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import astuple, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.models.schemas import HourActivity, IncidentReport, IncidentTotals
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+UNKNOWN_SITE = "unknown"
+
+
+@dataclass
+class IncidentCounts:
+    checks: int = 0
+    stuck: int = 0
+    error: int = 0
+    offline: int = 0
+    reboots: int = 0
+    reboots_succeeded: int = 0
+
+    @property
+    def incidents(self) -> int:
+        return self.stuck + self.error + self.reboots - self.reboots_succeeded
+
+    @property
+    def events(self) -> int:
+        return self.checks + self.reboots
+
+    def merge(self, other: "IncidentCounts") -> None:
+        self.checks += other.checks
+        self.stuck += other.stuck
+        self.error += other.error
+        self.offline += other.offline
+        self.reboots += other.reboots
+        self.reboots_succeeded += other.reboots_succeeded
+
+    def to_model(self, key: Optional[str] = None) -> IncidentTotals:
+        return IncidentTotals(
+            key=key,
+            **{field.name: getattr(self, field.name) for field in fields(self)},
+            reboot_success_rate=round(self.reboots_succeeded / self.reboots, 3) if self.reboots else None
+        )
+
+
+class _Bucket:
+    __slots__ = ("totals", "sites", "stations")
+
+    def __init__(self):
+        self.totals = IncidentCounts()
+        self.sites: Dict[str, IncidentCounts] = {}
+        self.stations: Dict[str, IncidentCounts] = {}
+
+    def counts(self, station_id: str, site_id: Optional[str]) -> Tuple[IncidentCounts, ...]:
+        return (
+            self.totals,
+            self.sites.setdefault(site_id or UNKNOWN_SITE, IncidentCounts()),
+            self.stations.setdefault(station_id, IncidentCounts()),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "totals": astuple(self.totals),
+            "sites": {key: astuple(counts) for key, counts in self.sites.items()},
+            "stations": {key: astuple(counts) for key, counts in self.stations.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "_Bucket":
+        bucket = cls()
+        bucket.totals = IncidentCounts(*data["totals"])
+        bucket.sites = {key: IncidentCounts(*counts) for key, counts in data["sites"].items()}
+        bucket.stations = {key: IncidentCounts(*counts) for key, counts in data["stations"].items()}
+        return bucket
+
+
+class IncidentService:
+    """Rolling incident counters fed by the agent's station tools.
+
+    Every status check and reboot is added to the time bucket it falls in
+    (``incident_bucket_seconds``), fleet-wide and per site and station, and
+    buckets older than ``incident_retention_hours`` are dropped. A report
+    reads one entry per bucket in its window instead of the events behind
+    them. Live counts come from each station's latest check, until it is
+    older than ``incident_live_ttl_seconds``. With ``incident_snapshot_path``
+    set, the counters are written there every
+    ``incident_snapshot_interval_seconds`` and reloaded on startup.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IncidentService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._buckets: Dict[int, _Bucket] = {}
+            # Station to (connector status, is_online, checked at), least recently checked first.
+            self._live: "OrderedDict[str, Tuple[str, bool, float]]" = OrderedDict()
+            self._live_counts = {"stuck": 0, "error": 0, "offline": 0}
+            self._snapshots: Optional[asyncio.Task] = None
+            self._dirty = False
+            self._initialized = True
+
+    def _bucket(self, now: float) -> _Bucket:
+        index = int(now // settings.incident_bucket_seconds)
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = _Bucket()
+            self._expire_buckets(index)
+        return bucket
+
+    def _expire_buckets(self, current: int) -> None:
+        oldest = current - settings.incident_retention_hours * 3600 // settings.incident_bucket_seconds
+        for index in [index for index in self._buckets if index <= oldest]:
+            del self._buckets[index]
+
+    def _set_live(self, station_id: str, entry: Optional[Tuple[str, bool, float]]) -> None:
+        previous = self._live.pop(station_id, None)
+        for state, delta in ((previous, -1), (entry, 1)):
+            if state is None:
+                continue
+            status, is_online, _ = state
+            if status in ("stuck", "error"):
+                self._live_counts[status] += delta
+            if not is_online:
+                self._live_counts["offline"] += delta
+        if entry is not None:
+            self._live[station_id] = entry
+
+    def _expire_live(self, now: float) -> None:
+        cutoff = now - settings.incident_live_ttl_seconds
+        while self._live:
+            station_id, (_, _, checked_at) = next(iter(self._live.items()))
+            if checked_at > cutoff:
+                break
+            self._set_live(station_id, None)
+
+    def record_check(
+        self, station_id: str, site_id: Optional[str], connector_status: str, is_online: bool,
+        now: Optional[float] = None
+    ) -> None:
+        now = time.time() if now is None else now
+        for counts in self._bucket(now).counts(station_id, site_id):
+            counts.checks += 1
+            if connector_status == "stuck":
+                counts.stuck += 1
+            elif connector_status == "error":
+                counts.error += 1
+            if not is_online:
+                counts.offline += 1
+
+        self._set_live(station_id, (connector_status, is_online, now))
+        self._expire_live(now)
+        self._dirty = True
+
+    def record_reboot(self, station_id: str, site_id: Optional[str], success: bool, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        for counts in self._bucket(now).counts(station_id, site_id):
+            counts.reboots += 1
+            if success:
+                counts.reboots_succeeded += 1
+        self._dirty = True
+
+    def report(
+        self,
+        hours: int = 24,
+        site_id: Optional[str] = None,
+        station_id: Optional[str] = None,
+        top: int = 10
+    ) -> IncidentReport:
+        start = time.perf_counter()
+        now = time.time()
+        self._expire_live(now)
+
+        bucket_seconds = settings.incident_bucket_seconds
+        current = int(now // bucket_seconds)
+        first = current - max(1, hours * 3600 // bucket_seconds) + 1
+        indexes = sorted(index for index in self._buckets if index >= first)
+
+        totals = IncidentCounts()
+        site_incidents: Dict[str, int] = {}
+        station_incidents: Dict[str, int] = {}
+        hours_of_day = [0] * 24
+        timeline = []
+        for index in indexes:
+            bucket = self._buckets[index]
+            if station_id is not None:
+                selected = bucket.stations.get(station_id) or IncidentCounts()
+            elif site_id is not None:
+                selected = bucket.sites.get(site_id) or IncidentCounts()
+            else:
+                selected = bucket.totals
+            totals.merge(selected)
+
+            bucket_start = datetime.fromtimestamp(index * bucket_seconds, timezone.utc)
+            hours_of_day[bucket_start.hour] += selected.events
+            timeline.append(selected.to_model(bucket_start.isoformat()))
+
+            # Rankings are fleet-wide unless narrowed to one site or station.
+            if station_id is None and site_id is None:
+                for groups, incidents in ((bucket.sites, site_incidents), (bucket.stations, station_incidents)):
+                    for key, counts in groups.items():
+                        if counts.incidents:
+                            incidents[key] = incidents.get(key, 0) + counts.incidents
+
+        def worst(incidents: Dict[str, int], group: str) -> List[IncidentTotals]:
+            # Rank on one number per key; full totals are only summed for the keys reported.
+            ranked = heapq.nlargest(top, incidents, key=incidents.__getitem__)
+            reported = []
+            for key in ranked:
+                counts = IncidentCounts()
+                for index in indexes:
+                    found = getattr(self._buckets[index], group).get(key)
+                    if found is not None:
+                        counts.merge(found)
+                reported.append(counts.to_model(key))
+            return reported
+
+        busiest = sorted((hour for hour in range(24) if hours_of_day[hour]), key=lambda hour: -hours_of_day[hour])
+        return IncidentReport(
+            window_seconds=(current - first + 1) * bucket_seconds,
+            buckets=len(indexes),
+            live_stuck=self._live_counts["stuck"],
+            live_error=self._live_counts["error"],
+            live_offline=self._live_counts["offline"],
+            live_tracked=len(self._live),
+            totals=totals.to_model(station_id or site_id),
+            worst_sites=worst(site_incidents, "sites"),
+            worst_stations=worst(station_incidents, "stations"),
+            busiest_hours=[HourActivity(hour=hour, events=hours_of_day[hour]) for hour in busiest],
+            timeline=timeline,
+            query_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "bucket_seconds": settings.incident_bucket_seconds,
+            "buckets": {str(index): bucket.to_json() for index, bucket in self._buckets.items()},
+            "live": [[station_id, *entry] for station_id, entry in self._live.items()],
+        }
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        if data.get("version") != SNAPSHOT_VERSION:
+            logger.warning("Ignoring incident snapshot with version %s", data.get("version"))
+            return
+        if data.get("bucket_seconds") == settings.incident_bucket_seconds:
+            self._buckets = {int(index): _Bucket.from_json(bucket) for index, bucket in data["buckets"].items()}
+            self._expire_buckets(int(time.time() // settings.incident_bucket_seconds))
+        else:
+            logger.warning(
+                "Incident snapshot uses %s s buckets, not %s s; keeping only live statuses",
+                data.get("bucket_seconds"), settings.incident_bucket_seconds
+            )
+        for station_id, status, is_online, checked_at in data["live"]:
+            self._set_live(station_id, (status, is_online, checked_at))
+        self._expire_live(time.time())
+
+    def load(self) -> bool:
+        path = settings.incident_snapshot_path
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path) as file:
+                self.restore(json.load(file))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error("Failed to load incident snapshot from %s: %s", path, e)
+            return False
+        logger.info("Loaded %d incident buckets from %s", len(self._buckets), path)
+        return True
+
+    async def save(self) -> None:
+        path = settings.incident_snapshot_path
+        if not path or not self._dirty:
+            return
+        self._dirty = False
+        data = json.dumps(self.snapshot())
+
+        def write() -> None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            temporary = f"{path}.tmp"
+            with open(temporary, "w") as file:
+                file.write(data)
+            os.replace(temporary, path)
+
+        try:
+            await asyncio.to_thread(write)
+        except OSError as e:
+            self._dirty = True
+            logger.error("Failed to write incident snapshot to %s: %s", path, e)
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.incident_snapshot_interval_seconds)
+            await self.save()
+
+    def start(self) -> None:
+        if not settings.incident_snapshot_path or self._snapshots is not None:
+            return
+        self.load()
+        self._snapshots = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self) -> None:
+        if self._snapshots is not None:
+            self._snapshots.cancel()
+            await asyncio.gather(self._snapshots, return_exceptions=True)
+            self._snapshots = None
+        await self.save()
@@ -1,15 +1,40 @@
-from typing import Any
+import asyncio
+import time
+from typing import Any, Dict, Optional
 
+import ollama
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_ollama import ChatOllama
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 
 from src.config.settings import settings
+from src.services.usage_service import UsageService
 from src.utils.logger import setup_logger
+from src.utils.metrics import LLM_ROUTED
 
 logger = setup_logger(__name__)
 
 
+def ollama_options() -> Dict[str, int]:
+    options = {"num_ctx": settings.ollama_num_ctx, "num_thread": settings.ollama_num_thread}
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def build_ollama_client() -> ChatOllama:
+    return ChatOllama(
+        base_url=settings.ollama_base_url,
+        model=settings.ollama_model,
+        temperature=0.7,
+        keep_alive=settings.ollama_keep_alive,
+        **ollama_options(),
+    )
+
+
+def small_provider_name(provider: str) -> str:
+    return f"{provider}:small"
+
+
 class LLMService:
     _instance = None
     
@@ -36,12 +61,8 @@ class LLMService:
             )
 
         if settings.ollama_base_url:
-            logger.info(f"Initializing Ollama client with base URL: {settings.ollama_base_url}")
-            self._clients["ollama"] = ChatOpenAI(
-                base_url=settings.ollama_base_url,
-                model=settings.ollama_model,
-                temperature=0.7,
-            )
+            logger.info("Initializing Ollama client with base URL: %s", settings.ollama_base_url)
+            self._clients["ollama"] = build_ollama_client()
 
         if settings.together_api_key:
             logger.info("Initializing Together AI client")
@@ -68,15 +89,139 @@ class LLMService:
                 convert_system_message_to_human=True
             )
 
-    def get_llm(self, provider: str = None) -> Any:
-        provider = provider or settings.llm_provider
-        
+        if settings.fake_llm_enabled:
+            from src.loadtest.fake_llm import ScriptedChatModel
+
+            logger.info("Initializing scripted fake LLM client")
+            self._clients["fake"] = ScriptedChatModel(
+                latency_ms=settings.fake_llm_latency_ms,
+                tokens_per_second=settings.fake_llm_tokens_per_second,
+            )
+
+        if settings.llm_cascade_enabled:
+            self._initialize_small_clients()
+
+    def _initialize_small_clients(self) -> None:
+        for provider, model in settings.llm_cascade_small_models.items():
+            client = self._clients.get(provider)
+            if client is None:
+                continue
+            # ChatOpenAI and ChatGroq name the field model_name, the others model.
+            field = next((name for name in ("model_name", "model") if name in type(client).model_fields), None)
+            if field is None:
+                logger.warning("Cannot derive a small model from the %s client", provider)
+                continue
+
+            logger.info("Initializing small model %s for provider %s", model, provider)
+            # A copy shares the underlying HTTP client and its connection pool.
+            self._clients[small_provider_name(provider)] = client.model_copy(update={field: model})
+
+    def small_provider(self, provider: str) -> Optional[str]:
+        name = small_provider_name(provider)
+        return name if name in self._clients else None
+
+    def register_client(self, provider: str, client: Any) -> None:
+        logger.info("Registering LLM client for provider: %s", provider)
+        self._clients[provider] = client
+
+    def unregister_client(self, provider: str) -> None:
+        self._clients.pop(provider, None)
+
+    async def preconnect(self, timeout: float) -> Dict[str, str]:
+        """Open a pooled connection to every provider with a cheap models listing.
+
+        Auth or API errors still leave the TLS connection in the pool, so they
+        are reported but not raised.
+        """
+        async def connect(provider: str, client: Any) -> str:
+            sdk_client = getattr(client, "root_async_client", None) or getattr(
+                getattr(client, "async_client", None), "_client", None
+            )
+            if sdk_client is None or not hasattr(sdk_client, "models"):
+                return "skipped"
+            try:
+                await asyncio.wait_for(sdk_client.models.list(), timeout)
+                return "connected"
+            except asyncio.TimeoutError:
+                logger.warning("Pre-connecting to %s timed out", provider)
+                return "timeout"
+            except Exception as e:
+                logger.info("Pre-connect request to %s failed: %s", provider, type(e).__name__)
+                return "error"
+
+        providers = list(self._clients)
+        results = await asyncio.gather(*(connect(provider, self._clients[provider]) for provider in providers))
+        return dict(zip(providers, results))
+
+    async def preload(self, timeout: float) -> Dict[str, str]:
+        """Load local models into memory so the first turn does not pay for it.
+
+        The preload uses the same options as the chat client; Ollama reloads a
+        model whose ``num_ctx`` changes, which would undo the preload.
+        """
+        if not isinstance(self._clients.get("ollama"), ChatOllama):
+            return {}
+
+        client = ollama.AsyncClient(host=settings.ollama_base_url)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                client.generate(
+                    model=settings.ollama_model, prompt="", keep_alive=settings.ollama_keep_alive,
+                    options=ollama_options()
+                ),
+                timeout
+            )
+        except Exception as e:
+            logger.warning("Preloading Ollama model %s failed: %s", settings.ollama_model, e)
+            return {"ollama": "error"}
+
+        logger.info("Preloaded Ollama model %s in %.1f s", settings.ollama_model, time.perf_counter() - start)
+        return {"ollama": "loaded"}
+
+    def _over_budget(self, provider: str) -> Optional[str]:
+        usage = UsageService()
+
+        token_budget = settings.llm_daily_token_budgets.get(provider)
+        if token_budget and usage.tokens_today(provider) >= token_budget:
+            return "tokens"
+
+        latency_budget = settings.llm_latency_budgets_ms.get(provider)
+        latency = usage.latency(provider, max_age=settings.llm_routing_cooldown_seconds)
+        if latency_budget and latency is not None and latency * 1000 > latency_budget:
+            return "latency"
+
+        return None
+
+    def route(self, provider: str) -> str:
+        if not settings.llm_routing_enabled:
+            return provider
+
+        reason = self._over_budget(provider)
+        if reason is None:
+            return provider
+
+        for candidate in settings.llm_routing_order:
+            if candidate != provider and candidate in self._clients and self._over_budget(candidate) is None:
+                logger.info("Provider %s is over its %s budget, routing to %s", provider, reason, candidate)
+                LLM_ROUTED.labels(source=provider, target=candidate, reason=reason).inc()
+                return candidate
+
+        logger.warning("Provider %s is over its %s budget and no fallback is available", provider, reason)
+        return provider
+
+    def resolve_provider(self, provider: str = None) -> str:
+        provider = self.route(provider or settings.llm_provider)
+
         if provider not in self._clients:
             available_providers = list(self._clients.keys())
             if not available_providers:
                 raise ValueError(f"No LLM providers available. Please check your API keys.")
 
+            logger.warning("Provider %s not available, falling back to %s", provider, available_providers[0])
             provider = available_providers[0]
-            logger.warning(f"Provider {provider} not available, falling back to {provider}")
-        
-        return self._clients[provider]
\ No newline at end of file
+
+        return provider
+
+    def get_llm(self, provider: str = None) -> Any:
+        return self._clients[self.resolve_provider(provider)]
\ No newline at end of file
@@ -0,0 +1,279 @@
+import asyncio
+import cProfile
+import json
+import random
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.config.settings import settings
+from src.utils import setup_logger
+from src.utils.metrics import PROFILES_CAPTURED
+
+logger = setup_logger(__name__)
+
+MODES = ("sample", "cprofile")
+SUFFIXES = {"sample": ".speedscope.json", "cprofile": ".pstats"}
+AWAITING = ("<awaiting>", "", 0)
+
+FrameKey = Tuple[str, str, int]
+
+# The task running on each loop; private to asyncio, so not every Python has it.
+_CURRENT_TASKS: Optional[Dict[asyncio.AbstractEventLoop, asyncio.Task]] = getattr(asyncio.tasks, "_current_tasks", None)
+
+_active_profile: ContextVar[Optional["TurnProfile"]] = ContextVar("active_profile", default=None)
+
+
+def _frame_key(frame: FrameType) -> FrameKey:
+    code = frame.f_code
+    return code.co_qualname, code.co_filename, code.co_firstlineno
+
+
+def _thread_stack(frame: Optional[FrameType]) -> List[FrameKey]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_key(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _await_stack(task: asyncio.Task) -> List[FrameKey]:
+    """Follow a suspended task's await chain down to what it is waiting on."""
+    stack = []
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "ag_frame", None)
+        if frame is not None:
+            stack.append(_frame_key(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "ag_await", None)
+    stack.append(AWAITING)
+    return stack
+
+
+class TurnProfile:
+    """Profile of one turn, captured while the turn's tasks run.
+
+    ``sample`` mode records the turn's stack every ``profiling_interval_ms``:
+    the live stack when one of the turn's tasks is running, otherwise the
+    await chain it is suspended on, so waiting on providers and tools shows
+    up as wall time. ``cprofile`` mode runs cProfile on the event loop thread
+    for the length of the turn, so it also counts concurrent turns.
+    """
+
+    def __init__(self, session_id: str, mode: str, loop: asyncio.AbstractEventLoop):
+        self.session_id = session_id
+        self.mode = mode
+        self.loop = loop
+        self.tasks: Set[asyncio.Task] = set()
+        self.root: Optional[asyncio.Task] = None
+        self.samples: List[Tuple[FrameKey, ...]] = []
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.profiler: Optional[cProfile.Profile] = None
+
+    def sample(self, running: Optional[asyncio.Task], frame: Optional[FrameType]) -> None:
+        if running is not None and running in self.tasks:
+            self.samples.append(tuple(_thread_stack(frame)))
+        elif self.root is not None and not self.root.done():
+            # Await chains stop at async generators, so the turn's innermost
+            # task (the graph, a tool call) says more than its root.
+            stacks = [_await_stack(task) for task in list(self.tasks) if not task.done()]
+            self.samples.append(tuple(max(stacks, key=len)))
+
+    def sample_live(self, frame: Optional[FrameType]) -> None:
+        """Record the loop thread's stack when the running task cannot be told."""
+        if frame is not None and self.root is not None and not self.root.done():
+            self.samples.append(tuple(_thread_stack(frame)))
+
+    def speedscope(self) -> Dict[str, Any]:
+        frames: List[Dict[str, Any]] = []
+        index: Dict[FrameKey, int] = {}
+        samples = []
+        for stack in self.samples:
+            ids = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    name, file, line = key
+                    frames.append({"name": name, "file": file, "line": line} if file else {"name": name})
+                ids.append(index[key])
+            samples.append(ids)
+
+        interval = settings.profiling_interval_ms
+        name = f"turn {self.session_id}"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "ev-charging-chatbot",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(self.duration * 1000, 3),
+                "samples": samples,
+                "weights": [interval] * len(samples),
+            }],
+        }
+
+
+class ProfilingService:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ProfilingService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._lock = threading.Lock()
+            self._active: List[TurnProfile] = []
+            self._sampler: Optional[threading.Thread] = None
+            self._cprofile_busy = False
+            self._initialized = True
+
+    @staticmethod
+    def choose(requested: Optional[str]) -> Optional[str]:
+        """Mode to profile a turn with: the one requested, or a sampled default."""
+        if not settings.profiling_enabled:
+            return None
+        if requested:
+            requested = requested.strip().lower()
+            return requested if requested in MODES else settings.profiling_mode
+        if settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+            return settings.profiling_mode
+        return None
+
+    def start(self, session_id: str, mode: str) -> Optional[TurnProfile]:
+        loop = asyncio.get_running_loop()
+        profile = TurnProfile(session_id, mode, loop)
+
+        if mode == "cprofile":
+            # cProfile hooks the whole thread; a second one would replace the first.
+            if self._cprofile_busy:
+                logger.info("cProfile already running, not profiling turn for session %s", session_id)
+                return None
+            self._cprofile_busy = True
+            profile.profiler = cProfile.Profile()
+            profile.profiler.enable()
+        else:
+            self._install_task_factory(loop)
+            profile.root = asyncio.current_task()
+            profile.tasks.add(profile.root)
+            with self._lock:
+                self._active.append(profile)
+                if self._sampler is None:
+                    self._sampler = threading.Thread(
+                        target=self._sample_loop, args=(threading.get_ident(),), name="turn-profiler", daemon=True
+                    )
+                    self._sampler.start()
+
+        logger.info("Profiling turn for session %s (%s)", session_id, mode)
+        return profile
+
+    def activate(self, profile: TurnProfile):
+        return _active_profile.set(profile)
+
+    def deactivate(self, token) -> None:
+        _active_profile.reset(token)
+
+    @staticmethod
+    def _install_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+        if getattr(loop.get_task_factory(), "_turn_profiler", False):
+            return
+        previous = loop.get_task_factory()
+
+        def factory(loop, coro, **kwargs):
+            task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+            # Tasks started while a profiled turn is active belong to it.
+            profile = _active_profile.get()
+            if profile is not None:
+                profile.tasks.add(task)
+            return task
+
+        factory._turn_profiler = True
+        loop.set_task_factory(factory)
+
+    def _sample_loop(self, loop_thread: int) -> None:
+        interval = settings.profiling_interval_ms / 1000
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                active = list(self._active)
+
+            frame = sys._current_frames().get(loop_thread)
+            running = _CURRENT_TASKS.get(active[0].loop) if _CURRENT_TASKS is not None else None
+            for profile in active:
+                try:
+                    if _CURRENT_TASKS is None:
+                        profile.sample_live(frame)
+                    else:
+                        profile.sample(running, frame)
+                except Exception as e:
+                    # The loop keeps running while we look; a chain can change under us.
+                    logger.debug("Skipped a profile sample: %s", e)
+
+    async def stop(self, profile: TurnProfile) -> Optional[Path]:
+        profile.duration = time.perf_counter() - profile.start
+        if profile.profiler is not None:
+            profile.profiler.disable()
+            self._cprofile_busy = False
+        else:
+            with self._lock:
+                self._active.remove(profile)
+
+        directory = Path(settings.profiling_dir)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(profile.started_at))
+        session = re.sub(r"[^\w.-]", "_", profile.session_id)[:64]
+        path = directory / f"{stamp}-{int(profile.started_at * 1000) % 1000:03d}-{session}{SUFFIXES[profile.mode]}"
+
+        def write() -> None:
+            directory.mkdir(parents=True, exist_ok=True)
+            if profile.profiler is not None:
+                profile.profiler.dump_stats(path)
+            else:
+                path.write_text(json.dumps(profile.speedscope()))
+            self._prune(directory)
+
+        try:
+            await asyncio.to_thread(write)
+        except OSError as e:
+            logger.error("Failed to write profile for session %s: %s", profile.session_id, e)
+            return None
+
+        PROFILES_CAPTURED.labels(mode=profile.mode).inc()
+        logger.info("Wrote %s profile of a %.0f ms turn to %s", profile.mode, profile.duration * 1000, path)
+        return path
+
+    @staticmethod
+    def _files(directory: Path) -> List[Path]:
+        if not directory.is_dir():
+            return []
+        files = [path for path in directory.iterdir() if path.name.endswith(tuple(SUFFIXES.values()))]
+        return sorted(files, key=lambda path: path.stat().st_mtime, reverse=True)
+
+    def _prune(self, directory: Path) -> None:
+        for path in self._files(directory)[settings.profiling_keep:]:
+            path.unlink(missing_ok=True)
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": path.name, "bytes": path.stat().st_size, "created": path.stat().st_mtime}
+            for path in self._files(Path(settings.profiling_dir))
+        ]
+
+    def get_path(self, name: str) -> Optional[Path]:
+        return next((path for path in self._files(Path(settings.profiling_dir)) if path.name == name), None)
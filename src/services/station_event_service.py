@@ -0,0 +1,128 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Set
+
+from src.config.settings import settings
+from src.models.schemas import StationEvent, StationStatus
+from src.utils import setup_logger
+from src.utils.metrics import STATION_EVENTS, STATION_NOTIFICATIONS
+
+logger = setup_logger(__name__)
+
+
+def describe_event(event: StationEvent, previous: Optional[StationStatus], status: Optional[StationStatus]) -> str:
+    if event.kind == "reboot_started":
+        return f"Station {event.station_id} has started rebooting."
+    if event.kind == "reboot_failed":
+        return f"The reboot of station {event.station_id} failed."
+    if status is None:
+        return f"Station {event.station_id} sent an update."
+
+    if event.kind == "reboot_completed":
+        state = "online" if status.is_online else "still offline"
+        return f"Station {event.station_id} finished rebooting and is {state} (connector {status.connector_status})."
+    if not status.is_online:
+        return f"Station {event.station_id} went offline."
+    if previous is not None and not previous.is_online:
+        return f"Station {event.station_id} is back online (connector {status.connector_status})."
+    return f"Station {event.station_id} connector status changed to {status.connector_status}."
+
+
+class StationEventService:
+    """Local pub/sub for station status events.
+
+    Published events are applied to the station service (which refreshes its
+    status cache) and fanned out to the sessions watching that station: each
+    gets the notification queued for its next agent turn, and live listeners
+    (e.g. an open WebSocket) get it immediately.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(StationEventService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._watchers: Dict[str, Dict[str, float]] = defaultdict(dict)
+            self._pending: Dict[str, Deque[str]] = {}
+            self._listeners: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+            self._initialized = True
+
+    def watch(self, session_id: str, station_id: str) -> None:
+        self._watchers[station_id][session_id] = time.monotonic() + settings.station_watch_ttl_seconds
+
+    def unwatch(self, session_id: str, station_id: str) -> None:
+        watchers = self._watchers.get(station_id)
+        if watchers:
+            watchers.pop(session_id, None)
+            if not watchers:
+                del self._watchers[station_id]
+
+    def forget_session(self, session_id: str) -> None:
+        """Drop a session's watches and queued notifications; live listeners stay."""
+        for station_id in [station_id for station_id, watchers in self._watchers.items() if session_id in watchers]:
+            self.unwatch(session_id, station_id)
+        self._pending.pop(session_id, None)
+
+    def _watching_sessions(self, station_id: str) -> List[str]:
+        watchers = self._watchers.get(station_id)
+        if not watchers:
+            return []
+
+        now = time.monotonic()
+        for session_id in [session_id for session_id, expires in watchers.items() if expires < now]:
+            del watchers[session_id]
+        if not watchers:
+            del self._watchers[station_id]
+        return list(watchers)
+
+    def publish(self, event: StationEvent, station_service) -> Optional[StationStatus]:
+        STATION_EVENTS.labels(kind=event.kind).inc()
+        previous, status = station_service.apply_event(event)
+
+        if event.kind == "status" and previous is not None and status is not None and (
+            previous.is_online == status.is_online and previous.connector_status == status.connector_status
+        ):
+            return status
+
+        sessions = self._watching_sessions(event.station_id)
+        if sessions:
+            message = describe_event(event, previous, status)
+            logger.info("Notifying %d session(s) watching station %s", len(sessions), event.station_id)
+            for session_id in sessions:
+                self.notify(session_id, message)
+
+        return status
+
+    def notify(self, session_id: str, message: str) -> None:
+        STATION_NOTIFICATIONS.inc()
+        pending = self._pending.get(session_id)
+        if pending is None:
+            pending = self._pending[session_id] = deque(maxlen=settings.station_notification_backlog)
+        pending.append(message)
+
+        for listener in self._listeners.get(session_id, ()):
+            if listener.full():
+                listener.get_nowait()
+            listener.put_nowait(message)
+
+    def drain(self, session_id: str) -> List[str]:
+        pending = self._pending.pop(session_id, None)
+        return list(pending) if pending else []
+
+    def listen(self, session_id: str) -> asyncio.Queue:
+        listener: asyncio.Queue = asyncio.Queue(maxsize=settings.station_notification_backlog)
+        self._listeners[session_id].add(listener)
+        return listener
+
+    def stop_listening(self, session_id: str, listener: asyncio.Queue) -> None:
+        listeners = self._listeners.get(session_id)
+        if listeners:
+            listeners.discard(listener)
+            if not listeners:
+                del self._listeners[session_id]
@@ -0,0 +1,309 @@
+import re
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.services.station_registry import StationRegistry
+from src.utils import setup_logger
+from src.utils.metrics import STATION_ID_RESOLUTION
+
+logger = setup_logger(__name__)
+
+DIGIT_WORDS = {
+    "zero": 0, "oh": 0, "o": 0, "nil": 0, "one": 1, "won": 1, "two": 2, "to": 2, "too": 2, "three": 3, "tree": 3,
+    "four": 4, "for": 4, "fore": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "ate": 8, "nine": 9, "niner": 9,
+}
+TEEN_WORDS = {
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+TENS_WORDS = {"twenty": 2, "thirty": 3, "forty": 4, "fifty": 5, "sixty": 6, "seventy": 7, "eighty": 8, "ninety": 9}
+REPEAT_WORDS = {"double": 2, "triple": 3}
+
+# How transcribers render a spoken "S T" prefix.
+PREFIX_ALIASES = {"st": "ST", "est": "ST", "esti": "ST", "esty": "ST", "ist": "ST"}
+# Words that introduce a bare station number ("station three", "charger number 12").
+ID_LEAD_WORDS = {"station", "charger", "bay", "stall", "post"}
+FILLER_WORDS = {"number", "no", "id", "is", "num", "#"}
+# Digit-word homophones only count after another digit or before a spoken one,
+# so "to" and "for" in ordinary sentences are left alone.
+WEAK_DIGIT_WORDS = {"o", "to", "too", "for", "fore", "won", "ate", "tree"}
+
+TOKEN = re.compile(r"[A-Za-z]+\d+|\d+|[A-Za-z]+|#")
+GLUED = re.compile(r"^([a-z]+)(\d+)$")
+ID_PARTS = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+
+class StationIdResolver:
+    """Turns spoken or mis-transcribed station IDs into known registry IDs.
+
+    Number words are folded into digits ("zero zero three", "double five",
+    "twenty three"), a spoken prefix ("S T", "est", "station") is attached, and
+    the result is matched against the registry: exactly or by numeric value
+    ("ST3" -> "ST003"). A spoken or malformed ID that matches neither may
+    still be within one edit of a unique registry ID; that ID is only offered
+    as a suggestion for the user to confirm, never substituted, and IDs
+    already in registry format are never fuzzed. Edit candidates are generated
+    from the query and looked up in the registry's ID index, so no extra index
+    is kept per station.
+    """
+
+    def __init__(self, registry: StationRegistry):
+        self.registry = registry
+        self.stats: Counter = Counter()
+        self._numeric: Dict[Tuple[str, int], Optional[str]] = {}
+        self._widths: Dict[str, int] = {}
+        self._indexed_rows = -1
+
+    def ensure_index(self) -> None:
+        if self._indexed_rows == len(self.registry):
+            return
+
+        numeric: Dict[Tuple[str, int], Optional[str]] = {}
+        widths: Dict[str, Counter] = {}
+        for station_id in self.registry.station_ids():
+            match = ID_PARTS.match(station_id)
+            if not match:
+                continue
+            prefix, digits = match.group(1).upper(), match.group(2)
+            key = (prefix, int(digits))
+            numeric[key] = None if key in numeric else station_id
+            widths.setdefault(prefix, Counter())[len(digits)] += 1
+
+        self._numeric = numeric
+        self._widths = {prefix: counts.most_common(1)[0][0] for prefix, counts in widths.items()}
+        self._indexed_rows = len(self.registry)
+
+    @staticmethod
+    def _fold_numbers(tokens: List[str]) -> List[str]:
+        folded: List[str] = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+
+            if token in REPEAT_WORDS and nxt is not None and (nxt in DIGIT_WORDS or nxt.isdigit()):
+                digit = str(DIGIT_WORDS[nxt]) if nxt in DIGIT_WORDS else nxt
+                folded.append(digit * REPEAT_WORDS[token])
+                i += 2
+            elif token in TENS_WORDS:
+                if nxt in DIGIT_WORDS and DIGIT_WORDS[nxt] > 0 and nxt not in WEAK_DIGIT_WORDS:
+                    folded.append(f"{TENS_WORDS[token]}{DIGIT_WORDS[nxt]}")
+                    i += 2
+                else:
+                    folded.append(f"{TENS_WORDS[token]}0")
+                    i += 1
+            elif token in TEEN_WORDS:
+                folded.append(str(TEEN_WORDS[token]))
+                i += 1
+            elif token in DIGIT_WORDS:
+                after_digit = bool(folded) and folded[-1].isdigit()
+                before_digit = nxt in DIGIT_WORDS and nxt not in WEAK_DIGIT_WORDS
+                if token in WEAK_DIGIT_WORDS and not (after_digit or before_digit):
+                    folded.append(token)
+                else:
+                    folded.append(str(DIGIT_WORDS[token]))
+                i += 1
+            else:
+                folded.append(token)
+                i += 1
+
+        return folded
+
+    def _candidates(self, text: str) -> List[Tuple[int, int, Optional[str], str]]:
+        matches = [(m.start(), m.end(), m.group().lower()) for m in TOKEN.finditer(text)]
+        tokens = self._fold_numbers([token for _, _, token in matches])
+        # Folding can merge tokens, so spans are re-aligned by consuming the
+        # original matches in step with the folded list.
+        spans = self._align_spans(matches, tokens)
+
+        candidates = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            prefix: Optional[str] = None
+            start = spans[i][0]
+            j = i + 1
+
+            glued = GLUED.match(token)
+            if glued and self._prefix(glued.group(1)):
+                prefix = self._prefix(glued.group(1))
+                digits, j = glued.group(2), i
+            else:
+                if token == "s" and j < len(tokens) and tokens[j] == "t":
+                    prefix, j = "ST", j + 1
+                elif self._prefix(token):
+                    prefix = self._prefix(token)
+                elif token in ID_LEAD_WORDS:
+                    prefix = None
+                else:
+                    i += 1
+                    continue
+
+                while j < len(tokens) and tokens[j] in FILLER_WORDS:
+                    j += 1
+                digits = ""
+                while j < len(tokens) and tokens[j].isdigit():
+                    digits += tokens[j]
+                    j += 1
+                if not digits:
+                    i += 1
+                    continue
+                j -= 1
+
+            candidates.append((start, spans[j][1], prefix, digits))
+            i = j + 1
+
+        return candidates
+
+    def _prefix(self, word: str) -> Optional[str]:
+        if word in PREFIX_ALIASES:
+            return PREFIX_ALIASES[word]
+        # Single letters are too common in speech to be taken as a prefix.
+        if len(word) > 1 and word.upper() in self._widths:
+            return word.upper()
+        return None
+
+    @staticmethod
+    def _align_spans(matches: List[Tuple[int, int, str]], tokens: List[str]) -> List[Tuple[int, int]]:
+        spans = []
+        k = 0
+        for token in tokens:
+            start = matches[k][0]
+            consumed = 1
+            if not token == matches[k][2] and token.isdigit():
+                # A folded number covers as many words as it took to say it.
+                text = matches[k][2]
+                if text in REPEAT_WORDS or (text in TENS_WORDS and len(token) == 2 and token[1] != "0"):
+                    consumed = 2
+            end = matches[k + consumed - 1][1]
+            spans.append((start, end))
+            k += consumed
+        return spans
+
+    def _well_formed(self, text: str) -> bool:
+        match = ID_PARTS.match(text)
+        return bool(match) and self._widths.get(match.group(1).upper()) == len(match.group(2))
+
+    def _match(self, prefix: Optional[str], digits: str, fuzzy: bool = False) -> Tuple[Optional[str], str]:
+        """Match an ID to the registry.
+
+        Results are ``exact``, ``normalized``, ``ambiguous`` or ``unresolved``.
+        With ``fuzzy``, an ID within one edit is returned as a ``suggested``
+        result, which callers must not treat as resolved.
+        """
+        prefixes = [prefix] if prefix else list(self._widths)
+        found = set()
+        for candidate_prefix in prefixes:
+            exact = candidate_prefix + digits
+            if self.registry.row(exact) is not None:
+                return exact, "exact"
+            station_id = self._numeric.get((candidate_prefix, int(digits)))
+            if station_id:
+                found.add(station_id)
+        if len(found) == 1:
+            return found.pop(), "normalized"
+        if found:
+            return None, "ambiguous"
+        # A bare number ("station three") is only trusted when it matches outright.
+        width = self._widths.get(prefix)
+        if width is None or not fuzzy:
+            return None, "unresolved"
+
+        for variant in self._edits(digits.zfill(width)):
+            if len(variant) == width and self.registry.row(prefix + variant) is not None:
+                found.add(prefix + variant)
+        if len(found) == 1:
+            return found.pop(), "suggested"
+        return None, "ambiguous" if found else "unresolved"
+
+    @staticmethod
+    def _edits(digits: str) -> Iterator[str]:
+        # Queries are already padded to the registry width, so insertions can
+        # never land on an ID; deletions still cover an extra spoken digit.
+        for i in range(len(digits)):
+            yield digits[:i] + digits[i + 1:]
+            for d in "0123456789":
+                if d != digits[i]:
+                    yield digits[:i] + d + digits[i + 1:]
+        for i in range(len(digits) - 1):
+            yield digits[:i] + digits[i + 1] + digits[i] + digits[i + 2:]
+
+    def _record(self, source: str, result: str) -> None:
+        self.stats[(source, result)] += 1
+        STATION_ID_RESOLUTION.labels(source=source, result=result).inc()
+
+    def resolve(self, station_id: str, source: str = "tool") -> str:
+        """Return the registry ID ``station_id`` refers to.
+
+        Unknown IDs come back in canonical spelling (``"st 6"`` -> ``"ST006"``)
+        so callers can still look them up, or unchanged if no ID was found.
+        Tools act on the result, so no edit-distance guess is ever returned.
+        """
+        self.ensure_index()
+
+        if self.registry.row(station_id) is not None:
+            self._record(source, "exact")
+            return station_id
+
+        for _, _, prefix, digits in self._candidates(station_id):
+            resolved, result = self._match(prefix, digits)
+            result = "normalized" if result == "exact" else result
+            self._record(source, result)
+            if resolved:
+                logger.info("Resolved station ID %r to %s (%s)", station_id, resolved, result)
+                return resolved
+            if prefix:
+                return prefix + digits.zfill(self._widths.get(prefix, len(digits)))
+            return station_id
+
+        self._record(source, "unresolved")
+        return station_id
+
+    def normalize_text(self, text: str, source: str = "inbound") -> str:
+        """Rewrite every station ID mention in ``text`` to its registry ID.
+
+        A spoken or malformed ID one edit away from a known ID is left as it
+        is and annotated with the suggestion, so the agent asks the user.
+        """
+        self.ensure_index()
+
+        pieces = []
+        last = 0
+        for start, end, prefix, digits in self._candidates(text):
+            mention = text[start:end]
+            resolved, result = self._match(prefix, digits, fuzzy=not self._well_formed(mention))
+            if result == "suggested":
+                # Reported as ambiguous: a near miss is not a resolution until the user confirms it.
+                self._record(source, "ambiguous")
+                logger.info("Station ID %r is unknown, suggesting %s", mention, resolved)
+                pieces.append(text[last:end])
+                pieces.append(f" (unknown ID, possibly {resolved}; confirm with the user)")
+                last = end
+                continue
+            if result == "exact" and mention != resolved:
+                result = "normalized"
+            self._record(source, result)
+            if resolved and mention != resolved:
+                logger.info("Normalized %r to %s (%s)", mention, resolved, result)
+                pieces.append(text[last:start])
+                pieces.append(resolved if prefix else f"{mention} ({resolved})")
+                last = end
+
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+    def summary(self) -> Dict[str, object]:
+        by_source: Dict[str, Dict[str, int]] = {}
+        for (source, result), count in self.stats.items():
+            by_source.setdefault(source, {})[result] = count
+
+        report: Dict[str, object] = {}
+        for source, results in by_source.items():
+            attempts = sum(results.values())
+            resolved = sum(results.get(result, 0) for result in ("exact", "normalized"))
+            report[source] = {
+                **results,
+                "attempts": attempts,
+                "resolution_rate": round(resolved / attempts, 3) if attempts else None,
+            }
+        return report
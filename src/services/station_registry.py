@@ -0,0 +1,279 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from src.models.schemas import StationStatus
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+CONNECTOR_STATUSES = ("available", "occupied", "stuck", "error")
+STATUS_CODES = {status: code for code, status in enumerate(CONNECTOR_STATUSES)}
+
+_COLUMNS = ("ids", "site_codes", "online", "status_codes", "last_seen")
+_TRUE_VALUES = {"1", "true", "yes", "y", "t", "online"}
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    return str(value).strip().lower() in _TRUE_VALUES
+
+
+def _parse_timestamp(value) -> float:
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def _id_array(station_ids: List[str]) -> np.ndarray:
+    """Station IDs as UTF-8 bytes, as wide as the longest one so none is cut short."""
+    encoded = [station_id.encode() for station_id in station_ids]
+    width = max((len(value) for value in encoded), default=1)
+    return np.array(encoded, dtype=f"S{width}")
+
+
+def _read_csv(path: Path) -> Iterator[dict]:
+    with open(path, newline="") as file:
+        yield from csv.DictReader(file)
+
+
+def _read_jsonl(path: Path) -> Iterator[dict]:
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_parquet(path: Path) -> Iterator[dict]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Loading Parquet fleet exports requires pyarrow (pip install pyarrow)") from e
+
+    for batch in pq.ParquetFile(path).iter_batches():
+        yield from batch.to_pylist()
+
+
+_READERS = {".csv": _read_csv, ".jsonl": _read_jsonl, ".ndjson": _read_jsonl, ".parquet": _read_parquet}
+
+
+class StationRegistry:
+    """Columnar store of the station fleet.
+
+    Every attribute is one NumPy array indexed by row, so the fleet costs a few
+    dozen bytes per station instead of one pydantic model each. Rows are found
+    by ID through a dict built on first lookup; site membership is a CSR-style
+    index (rows sorted by site plus offsets) and connector status keeps a set of
+    rows per status that ``update`` maintains. ``save``/``open`` persist the
+    columns as ``.npy`` files that are memory-mapped copy-on-write, so opening a
+    large fleet does not read it into memory.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        site_codes: np.ndarray,
+        sites: List[str],
+        online: np.ndarray,
+        status_codes: np.ndarray,
+        last_seen: np.ndarray
+    ):
+        self.ids = ids
+        self.site_codes = site_codes
+        self.sites = sites
+        self.online = online
+        self.status_codes = status_codes
+        self.last_seen = last_seen
+
+        self._index: Optional[Dict[str, int]] = None
+        self._site_index: Optional[Dict[str, int]] = None
+        self._site_rows: Optional[np.ndarray] = None
+        self._site_offsets: Optional[np.ndarray] = None
+        self._status_rows: Optional[List[Set[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, station_id: str) -> bool:
+        return self.row(station_id) is not None
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "StationRegistry":
+        ids, site_codes, online, status_codes, last_seen = [], [], [], [], []
+        site_lookup: Dict[str, int] = {}
+
+        for record in records:
+            status = str(record.get("connector_status", "available")).strip().lower()
+            if status not in STATUS_CODES:
+                logger.warning("Unknown connector status %r for station %s", status, record.get("station_id"))
+                status = "error"
+
+            site = str(record.get("site_id") or "")
+            ids.append(str(record["station_id"]).strip())
+            site_codes.append(site_lookup.setdefault(site, len(site_lookup)))
+            online.append(_parse_bool(record.get("is_online", True)))
+            status_codes.append(STATUS_CODES[status])
+            last_seen.append(_parse_timestamp(record.get("last_seen")))
+
+        return cls(
+            ids=_id_array(ids),
+            site_codes=np.array(site_codes, dtype=np.int32),
+            sites=list(site_lookup),
+            online=np.array(online, dtype=np.bool_),
+            status_codes=np.array(status_codes, dtype=np.int8),
+            last_seen=np.array(last_seen, dtype=np.float64)
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "StationRegistry":
+        source = Path(path)
+        reader = _READERS.get(source.suffix.lower())
+        if reader is None:
+            raise ValueError(f"Unsupported fleet export format: {source.suffix} (expected CSV, JSONL or Parquet)")
+        return cls.from_records(reader(source))
+
+    def save(self, directory: str) -> None:
+        target = Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+        for column in _COLUMNS:
+            np.save(target / f"{column}.npy", np.ascontiguousarray(getattr(self, column)))
+        (target / "sites.json").write_text(json.dumps(self.sites))
+
+    @classmethod
+    def open(cls, directory: str) -> "StationRegistry":
+        source = Path(directory)
+        columns = {column: np.load(source / f"{column}.npy", mmap_mode="c") for column in _COLUMNS}
+        return cls(sites=json.loads((source / "sites.json").read_text()), **columns)
+
+    @classmethod
+    def load(cls, path: str, cache_dir: Optional[str] = None) -> "StationRegistry":
+        start = time.perf_counter()
+
+        if cache_dir and cls._cache_is_fresh(path, cache_dir):
+            registry = cls.open(cache_dir)
+            logger.info("Memory-mapped %d stations from %s in %.3fs", len(registry), cache_dir, time.perf_counter() - start)
+            return registry
+
+        registry = cls.from_file(path)
+        logger.info("Loaded %d stations from %s in %.3fs", len(registry), path, time.perf_counter() - start)
+
+        if cache_dir:
+            registry.save(cache_dir)
+            logger.info("Wrote station registry cache to %s", cache_dir)
+
+        return registry
+
+    @staticmethod
+    def _cache_is_fresh(path: str, cache_dir: str) -> bool:
+        marker = Path(cache_dir) / "sites.json"
+        if not marker.exists():
+            return False
+        return not os.path.exists(path) or os.path.getmtime(marker) >= os.path.getmtime(path)
+
+    def station_ids(self) -> List[str]:
+        return [station_id.decode() for station_id in self.ids.tolist()]
+
+    def row(self, station_id: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {station: row for row, station in enumerate(self.station_ids())}
+        return self._index.get(station_id)
+
+    def get(self, station_id: str) -> Optional[StationStatus]:
+        row = self.row(station_id)
+        if row is None:
+            return None
+        return self.status_at(row)
+
+    def status_at(self, row: int) -> StationStatus:
+        return StationStatus(
+            station_id=self.ids[row].decode(),
+            site_id=self.sites[self.site_codes[row]] or None,
+            is_online=bool(self.online[row]),
+            connector_status=CONNECTOR_STATUSES[self.status_codes[row]],
+            last_seen=datetime.fromtimestamp(self.last_seen[row])
+        )
+
+    def _build_site_index(self) -> None:
+        order = np.argsort(self.site_codes, kind="stable")
+        counts = np.bincount(self.site_codes, minlength=len(self.sites))
+        self._site_rows = order
+        self._site_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._site_index = {site: code for code, site in enumerate(self.sites)}
+
+    def site_rows(self, site_id: str) -> np.ndarray:
+        if self._site_index is None:
+            self._build_site_index()
+        code = self._site_index.get(site_id)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self._site_rows[self._site_offsets[code]:self._site_offsets[code + 1]]
+
+    def status_rows(self, connector_status: str) -> Set[int]:
+        if self._status_rows is None:
+            self._status_rows = [
+                set(np.flatnonzero(self.status_codes == code).tolist()) for code in range(len(CONNECTOR_STATUSES))
+            ]
+        return self._status_rows[STATUS_CODES[connector_status]]
+
+    def update(
+        self,
+        station_id: str,
+        is_online: Optional[bool] = None,
+        connector_status: Optional[str] = None,
+        last_seen: Optional[datetime] = None
+    ) -> Optional[StationStatus]:
+        row = self.row(station_id)
+        if row is None:
+            return None
+
+        if is_online is not None:
+            self.online[row] = is_online
+        if connector_status is not None:
+            code = STATUS_CODES[connector_status]
+            if self._status_rows is not None:
+                self._status_rows[self.status_codes[row]].discard(row)
+                self._status_rows[code].add(row)
+            self.status_codes[row] = code
+        if last_seen is not None:
+            self.last_seen[row] = last_seen.timestamp()
+
+        return self.status_at(row)
+
+    def add(self, station: StationStatus) -> None:
+        """Append one station. Copies every column, so it is meant for ad-hoc
+        demo stations, not for bulk loading."""
+        site = station.site_id or ""
+        if site not in self.sites:
+            self.sites.append(site)
+            self._site_index = None
+
+        row = len(self.ids)
+        # Widens the ID column when the new ID is longer than any before it.
+        self.ids = np.append(self.ids, _id_array([station.station_id]))
+        self.site_codes = np.append(self.site_codes, np.int32(self.sites.index(site)))
+        self.online = np.append(self.online, station.is_online)
+        self.status_codes = np.append(self.status_codes, np.int8(STATUS_CODES[station.connector_status]))
+        self.last_seen = np.append(self.last_seen, station.last_seen.timestamp())
+
+        if self._index is not None:
+            self._index[station.station_id] = row
+        if self._status_rows is not None:
+            self._status_rows[STATUS_CODES[station.connector_status]].add(row)
+        self._site_index = None
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, column).nbytes for column in _COLUMNS)
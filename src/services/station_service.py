@@ -1,63 +1,141 @@
 import asyncio
 import random
+import time
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Deque, Dict, Optional, Tuple
 
-from src.models.schemas import RebootRequest, RebootResponse, StationStatus
+from src.config.settings import settings
+from src.models.schemas import RebootRequest, RebootResponse, StationEvent, StationStatus
+from src.services.station_event_service import StationEventService
+from src.services.station_id_resolver import StationIdResolver
+from src.services.station_registry import CONNECTOR_STATUSES, StationRegistry
+from src.utils import setup_logger
+from src.utils.metrics import STATION_STATUS_CACHE
+
+logger = setup_logger(__name__)
 
 
 class StationService:
     _instance = None
-    
-    def __new__(cls):
+
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(StationService, cls).__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
-    def __init__(self) -> None:
+
+    def __init__(self, registry: Optional[StationRegistry] = None) -> None:
+        """``registry`` replaces the one configured in settings, e.g. for a fake backend."""
         if not hasattr(self, '_initialized') or not self._initialized:
-            self._stations: Dict[str, StationStatus] = {}
-            self._initialize_mock_stations()
+            if registry is not None:
+                self.registry = registry
+                self._demo_mode = False
+            elif settings.station_registry_path:
+                self.registry = StationRegistry.load(
+                    settings.station_registry_path, settings.station_registry_cache_dir
+                )
+                self._demo_mode = False
+            else:
+                self.registry = self._initialize_mock_stations()
+                self._demo_mode = True
+            self.id_resolver = StationIdResolver(self.registry)
+            self._reboots: Dict[str, Deque[float]] = defaultdict(deque)
+            self._fresh_until: Dict[str, float] = {}
             self._initialized = True
 
-    def _initialize_mock_stations(self) -> None:
+    def _cached_status(self, station_id: str) -> Optional[StationStatus]:
+        fresh_until = self._fresh_until.get(station_id)
+        if fresh_until is not None and fresh_until > time.monotonic():
+            STATION_STATUS_CACHE.labels(result="hit").inc()
+            return self.registry.get(station_id)
+
+        STATION_STATUS_CACHE.labels(result="miss").inc()
+        return None
+
+    def _mark_fresh(self, station_id: str) -> None:
+        self._fresh_until[station_id] = time.monotonic() + settings.station_status_ttl_seconds
+
+    def apply_event(self, event: StationEvent) -> Tuple[Optional[StationStatus], Optional[StationStatus]]:
+        previous = self.registry.get(event.station_id)
+        if previous is None:
+            logger.debug("Ignoring event for unknown station %s", event.station_id)
+            return None, None
+
+        if event.kind in ("reboot_started", "reboot_failed"):
+            self._fresh_until.pop(event.station_id, None)
+            return previous, previous
+
+        status = self.registry.update(
+            event.station_id,
+            is_online=event.is_online,
+            connector_status=event.connector_status,
+            last_seen=event.timestamp
+        )
+        self._mark_fresh(event.station_id)
+        return previous, status
+
+    def resolve_station_id(self, station_id: str) -> str:
+        return self.id_resolver.resolve(station_id)
+
+    def record_reboot(self, station_id: str) -> None:
+        self._reboots[station_id].append(time.time())
+
+    def recent_reboots(self, station_id: str) -> int:
+        reboots = self._reboots.get(station_id)
+        if not reboots:
+            return 0
+
+        cutoff = time.time() - settings.reboot_window_seconds
+        while reboots and reboots[0] < cutoff:
+            reboots.popleft()
+        return len(reboots)
+
+    @staticmethod
+    def _initialize_mock_stations() -> StationRegistry:
         station_ids = ["ST001", "ST002", "ST003", "ST004", "ST005"]
-        statuses = ["available", "occupied", "stuck", "error"]
 
-        for station_id in station_ids:
-            self._stations[station_id] = StationStatus(
-                station_id=station_id,
-                is_online=random.choice([True, True, True, False]),  # 75% online
-                connector_status=random.choice(statuses),
-                last_seen=datetime.now() - timedelta(minutes=random.randint(1, 60))
-            )
+        return StationRegistry.from_records(
+            {
+                "station_id": station_id,
+                "is_online": random.choice([True, True, True, False]),  # 75% online
+                "connector_status": random.choice(CONNECTOR_STATUSES),
+                "last_seen": (datetime.now() - timedelta(minutes=random.randint(1, 60))).timestamp()
+            }
+            for station_id in station_ids
+        )
 
     async def check_station_status(self, station_id: str) -> Optional[StationStatus]:
+        cached = self._cached_status(station_id)
+        if cached is not None:
+            return cached
+
         await asyncio.sleep(random.uniform(0.5, 2.0))
 
-        if station_id in self._stations:
-            station = self._stations[station_id]
+        if station_id in self.registry:
+            self._mark_fresh(station_id)
+            if not self._demo_mode:
+                return self.registry.get(station_id)
 
             if station_id == "ST001":
-                station.is_online = True
-                station.connector_status = "stuck"
-                station.last_seen = datetime.now()
+                return self.registry.update(
+                    station_id, is_online=True, connector_status="stuck", last_seen=datetime.now()
+                )
             elif random.random() < 0.1:
-                statuses = ["available", "occupied", "stuck", "error"]
-                station.connector_status = random.choice(statuses)
-                station.last_seen = datetime.now()
+                return self.registry.update(
+                    station_id, connector_status=random.choice(CONNECTOR_STATUSES), last_seen=datetime.now()
+                )
 
-            return station
+            return self.registry.get(station_id)
 
-        if station_id.startswith("ST") and len(station_id) == 5:
+        if self._demo_mode and station_id.startswith("ST") and len(station_id) == 5:
             new_station = StationStatus(
                 station_id=station_id,
                 is_online=random.choice([True, True, False]),
-                connector_status=random.choice(["available", "occupied", "stuck", "error"]),
+                connector_status=random.choice(CONNECTOR_STATUSES),
                 last_seen=datetime.now() - timedelta(minutes=random.randint(1, 30))
             )
-            self._stations[station_id] = new_station
+            self.registry.add(new_station)
             return new_station
 
         return None
@@ -66,16 +144,15 @@ class StationService:
         await asyncio.sleep(random.uniform(2.0, 5.0))
 
         station_id = request.station_id
+        station = self.registry.get(station_id)
 
-        if station_id not in self._stations:
+        if station is None:
             return RebootResponse(
                 success=False,
                 message=f"Station {station_id} not found",
                 station_id=station_id
             )
 
-        station = self._stations[station_id]
-
         if not station.is_online:
             return RebootResponse(
                 success=False,
@@ -83,9 +160,12 @@ class StationService:
                 station_id=station_id
             )
 
+        self.record_reboot(station_id)
         if random.random() < 0.9:
-            station.connector_status = "available"
-            station.last_seen = datetime.now()
+            StationEventService().publish(
+                StationEvent(station_id=station_id, kind="reboot_completed", is_online=True, connector_status="available"),
+                self
+            )
 
             return RebootResponse(
                 success=True,
@@ -97,4 +177,4 @@ class StationService:
                 success=False,
                 message=f"Failed to reboot station {station_id}. Please contact technical support.",
                 station_id=station_id
-            )
\ No newline at end of file
+            )
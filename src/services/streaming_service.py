@@ -1,34 +1,304 @@
+import asyncio
 import json
-import traceback
+import time
+from contextlib import aclosing
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable, Optional, Tuple
+
+from langchain_core.messages import AIMessageChunk
 
 from src.models.schemas import LLMRequest
 from fastapi.responses import StreamingResponse
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 
+from src.config.settings import settings
 from src.services.llm_service import LLMService
 from src.services.chat_service import ChatService
 from src.services.station_service import StationService
+from src.services.admission_service import AdmissionLease, AdmissionRejected, AdmissionService
+from src.services.profiling_service import ProfilingService
 from src.agents.chatbot_agent import ChatbotAgent
+from src.agents.turn_queue import TurnQueueFull, TurnTicket
 from src.utils import setup_logger
 from src.utils.openai_mapper import create_streaming_openai_chunk
+from src.utils.voice_chunker import SentenceChunker
+from src.utils.metrics import (
+    GRAPH_OVERHEAD_SECONDS, SSE_CHUNKS, SSE_EMIT_SECONDS, TURN_CANCELLATIONS, TURN_SECONDS, TURN_TTFT_SECONDS,
+    TurnTimings, current_turn
+)
 
 logger = setup_logger(__name__)
 
 
+class TurnStreamingResponse(StreamingResponse):
+    """SSE response for an admitted turn that ends the turn when the response does.
+
+    A body generator that never started never runs its ``finally``, e.g.
+    when the client disconnects before the first chunk, and one abandoned
+    mid-stream only runs it when garbage collected. So the response closes
+    the generator and releases the turn itself.
+    """
+
+    def __init__(self, content: Any, release: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self.release = release
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                self.release()
+
+
 class StreamingService:
     def __init__(
-        self, 
+        self,
         llm_service: LLMService,
         chat_service: ChatService,
         station_service: StationService,
-        chatbot_agent: ChatbotAgent
+        chatbot_agent: ChatbotAgent,
+        admission_service: Optional[AdmissionService] = None,
+        voice: bool = False,
+        http_request: Optional[Request] = None,
+        profile: Optional[str] = None
     ):
         self.llm_service = llm_service
         self.chat_service = chat_service
         self.station_service = station_service
         self.chatbot_agent = chatbot_agent
+        self.admission_service = admission_service or AdmissionService()
+        self.voice = voice
+        self.http_request = http_request
+        self.profile = profile
+        self.cancelled = False
+        self.provider: Optional[str] = None
+        self._holding = False
+
+    async def _agent_stream(
+        self, user_message: str, stream_mode: list, tick: float
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
+        agent = self.chatbot_agent
+        queue: asyncio.Queue = asyncio.Queue()
+
+        budget_ms = settings.turn_budget_voice_ms if self.voice else settings.turn_budget_text_ms
+
+        async def pump() -> None:
+            try:
+                async for item in agent.stream_message(
+                    user_message, stream_mode=stream_mode, budget=budget_ms / 1000, provider=self.provider
+                ):
+                    queue.put_nowait(item)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(pump())
+        agent.turn_queue.active_task = task
+
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), tick)
+                except asyncio.TimeoutError:
+                    if self.http_request is not None and await self.http_request.is_disconnected():
+                        logger.info("Client disconnected, cancelling turn for session %s", agent.session_id)
+                        TURN_CANCELLATIONS.labels(reason="disconnect").inc()
+                        self.cancelled = True
+                        return
+                    yield "tick", None
+                    continue
+
+                if item is None:
+                    return
+                yield item
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.wait({task})
+            if agent.turn_queue.active_task is task:
+                agent.turn_queue.active_task = None
+
+    async def _text_events(self, user_message: str) -> AsyncGenerator[Tuple[str, str], None]:
+        poll_interval = settings.disconnect_poll_interval_ms / 1000
+
+        async for mode, chunk in self._agent_stream(user_message, ["updates", "custom"], poll_interval):
+            if mode == "tick":
+                continue
+
+            logger.debug("[STREAM] Received %s chunk: %s", mode, chunk)
+
+            if mode == "error":
+                yield "error", chunk.get("error", "")
+
+            if mode == "custom" and "intermediate_message" in chunk:
+                logger.debug("[STREAM] Sending intermediate message: %s", chunk["intermediate_message"])
+                yield "intermediate", chunk["intermediate_message"]
+
+            if mode == "updates" and isinstance(chunk, dict) and "chatbot" in chunk:
+                chatbot_data = chunk["chatbot"]
+                if isinstance(chatbot_data, dict) and "messages" in chatbot_data:
+                    messages = chatbot_data["messages"]
+                    if messages and len(messages) > 0:
+                        last_message = messages[-1]
+                        if hasattr(last_message, "content") and last_message.content:
+                            yield "content", last_message.content
+
+    async def _voice_events(self, user_message: str) -> AsyncGenerator[Tuple[str, str], None]:
+        chunker = SentenceChunker(
+            min_chars=settings.voice_chunk_min_chars,
+            clause_min_chars=settings.voice_clause_min_chars,
+            max_chars=settings.voice_chunk_max_chars
+        )
+        flush_delay = settings.voice_flush_deadline_ms / 1000
+        tick = min(settings.disconnect_poll_interval_ms / 1000, flush_delay / 4)
+        loop = asyncio.get_running_loop()
+        deadline = None
+        streamed_tokens = False
+
+        async for mode, chunk in self._agent_stream(user_message, ["messages", "updates", "custom"], tick):
+            if deadline is not None and loop.time() >= deadline:
+                piece = chunker.flush_partial()
+                if piece:
+                    yield "voice", piece
+                deadline = loop.time() + flush_delay if chunker.pending else None
+
+            if mode == "error":
+                yield "error", chunk.get("error", "")
+
+            elif mode == "custom" and "intermediate_message" in chunk:
+                piece = chunker.flush()
+                if piece:
+                    yield "voice", piece
+                deadline = None
+                yield "intermediate", chunk["intermediate_message"].strip()
+
+            elif mode == "messages":
+                message, metadata = chunk
+                if (
+                    isinstance(message, AIMessageChunk)
+                    and metadata.get("langgraph_node") == "chatbot"
+                    and isinstance(message.content, str)
+                    and message.content
+                ):
+                    streamed_tokens = True
+                    for piece in chunker.push(message.content):
+                        yield "voice", piece
+                    if chunker.pending and deadline is None:
+                        deadline = loop.time() + flush_delay
+                    elif not chunker.pending:
+                        deadline = None
+
+            elif mode == "updates" and isinstance(chunk, dict) and "chatbot" in chunk:
+                if not streamed_tokens:
+                    messages = (chunk["chatbot"] or {}).get("messages") or []
+                    content = getattr(messages[-1], "content", "") if messages else ""
+                    if isinstance(content, str) and content:
+                        for piece in chunker.push(content + " "):
+                            yield "voice", piece
+                piece = chunker.flush()
+                if piece:
+                    yield "voice", piece
+                deadline = None
+                streamed_tokens = False
+
+        piece = chunker.flush()
+        if piece:
+            yield "voice", piece
+
+    async def admit(self, user_message: str) -> Tuple[AdmissionLease, TurnTicket]:
+        agent = self.chatbot_agent
+        # Held from admission to the end of the turn, so the session is not evicted under it.
+        agent.chat_service.hold_session(agent.user_id, agent.session_id)
+        self._holding = True
+        try:
+            # Routed before admission so the lease is on the provider the turn will call.
+            self.provider = agent.route_provider()
+            lease = await self.admission_service.acquire(self.provider, voice=self.voice)
+            try:
+                ticket = agent.turn_queue.submit(user_message)
+            except TurnQueueFull:
+                lease.release()
+                raise
+        except BaseException:
+            self._release_session()
+            raise
+        return lease, ticket
+
+    def end_turn(self, lease: AdmissionLease, ticket: TurnTicket) -> None:
+        """Release what ``admit`` took; safe to call more than once."""
+        lease.release()
+        self.chatbot_agent.turn_queue.discard(ticket)
+        self._release_session()
+
+    def _release_session(self) -> None:
+        if self._holding:
+            self._holding = False
+            self.chatbot_agent.chat_service.release_session(self.chatbot_agent.session_id)
+
+    async def turn_events(self, lease: AdmissionLease, ticket: TurnTicket) -> AsyncGenerator[Tuple[str, str], None]:
+        """Run an admitted turn and yield its ``(kind, content)`` events.
+
+        Kinds are ``content`` (or ``voice``), ``intermediate`` and ``error``.
+        The time a transport spends sending an event counts as emission time
+        in the turn metrics. ``self.cancelled`` is set when the turn was cut
+        short.
+        """
+        provider = self.provider or self.chatbot_agent.provider
+        turn_queue = self.chatbot_agent.turn_queue
+        events = self._voice_events if self.voice else self._text_events
+
+        timings = TurnTimings()
+        current_turn.set(timings)
+        profiling_service = ProfilingService()
+        mode = profiling_service.choose(self.profile)
+        profile = profiling_service.start(self.chatbot_agent.session_id, mode) if mode else None
+        profile_token = profiling_service.activate(profile) if profile else None
+        start = time.perf_counter()
+        first_content_at = None
+        outcome = "ok"
+
+        try:
+            async with turn_queue.turn(ticket) as turn_text:
+                if turn_text is None:
+                    logger.debug("Utterance merged into a newer turn for session %s", turn_queue.session_id)
+                else:
+                    async with aclosing(events(turn_text)) as stream:
+                        async for kind, content in stream:
+                            emit_start = time.perf_counter()
+                            if kind == "error":
+                                outcome = "error"
+                            elif first_content_at is None:
+                                first_content_at = emit_start
+                                TURN_TTFT_SECONDS.labels(provider=provider).observe(emit_start - start)
+                            yield kind, content
+                            timings.sse += time.perf_counter() - emit_start
+
+            if self.cancelled:
+                outcome = "cancelled"
+        except (asyncio.CancelledError, GeneratorExit):
+            logger.info("Client disconnected, cancelling turn for session %s", self.chatbot_agent.session_id)
+            TURN_CANCELLATIONS.labels(reason="disconnect").inc()
+            outcome = "cancelled"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self.end_turn(lease, ticket)
+            elapsed = time.perf_counter() - start
+            TURN_SECONDS.labels(provider=provider, outcome=outcome).observe(elapsed)
+            SSE_EMIT_SECONDS.labels(provider=provider).observe(timings.sse)
+            GRAPH_OVERHEAD_SECONDS.labels(provider=provider).observe(
+                max(0.0, elapsed - timings.llm - timings.tools - timings.sse)
+            )
+            if profile is not None:
+                profiling_service.deactivate(profile_token)
+                await profiling_service.stop(profile)
 
     async def streaming_chat(self, request: LLMRequest) -> StreamingResponse:
         try:
@@ -37,42 +307,45 @@ class StreamingService:
             if not user_message:
                 raise HTTPException(status_code=400, detail="No user message provided")
 
+            lease, ticket = await self.admit(user_message)
+
             async def generate_stream() -> AsyncGenerator[str, None]:
+                def encode(chunk: dict, kind: str) -> str:
+                    SSE_CHUNKS.labels(kind=kind).inc()
+                    return f"data: {json.dumps(chunk)}\n\n"
+
                 first_chunk = await create_streaming_openai_chunk(role="assistant")
-                yield f"data: {json.dumps(first_chunk)}\n\n"
-
-                async for mode, chunk in self.chatbot_agent.stream_message(user_message, stream_mode=["updates", "custom"]):
-                    logger.info(f"[STREAM] Received {mode} chunk: {chunk}")
-
-                    if mode == "custom" and "intermediate_message" in chunk:
-                        message = chunk["intermediate_message"]
-                        logger.info(f"[STREAM] Sending intermediate message: {message}")
-                        content_chunk = await create_streaming_openai_chunk(content=message)
-                        yield f"data: {json.dumps(content_chunk)}\n\n"
-
-                    if mode == "updates" and isinstance(chunk, dict) and "chatbot" in chunk:
-                        chatbot_data = chunk["chatbot"]
-                        if isinstance(chatbot_data, dict) and "messages" in chatbot_data:
-                            messages = chatbot_data["messages"]
-                            if messages and len(messages) > 0:
-                                last_message = messages[-1]
-                                if hasattr(last_message, "content") and last_message.content:
-                                    content_chunk = await create_streaming_openai_chunk(content=last_message.content)
-                                    yield f"data: {json.dumps(content_chunk)}\n\n"
+                yield encode(first_chunk, "role")
+
+                async with aclosing(self.turn_events(lease, ticket)) as stream:
+                    async for kind, content in stream:
+                        if kind == "error":
+                            continue
+                        content_chunk = await create_streaming_openai_chunk(content=content)
+                        yield encode(content_chunk, kind)
+
+                if self.cancelled:
+                    return
 
                 final_chunk = await create_streaming_openai_chunk(finish_reason="stop")
-                yield f"data: {json.dumps(final_chunk)}\n\n"
+                yield encode(final_chunk, "finish")
                 yield "data: [DONE]\n\n"
 
-            return StreamingResponse(
+            return TurnStreamingResponse(
                 generate_stream(),
+                lambda: self.end_turn(lease, ticket),
                 media_type="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
                     "Connection": "keep-alive",
                 }
             )
+        except AdmissionRejected as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        except TurnQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error in chat_completions: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error("Error in chat_completions: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail=str(e))
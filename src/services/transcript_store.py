@@ -0,0 +1,87 @@
+import json
+import sys
+import time
+import zlib
+from array import array
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from src.config.settings import settings
+from src.models.schemas import ChatMessage, MessageRole
+
+ROLES: Tuple[str, ...] = tuple(sys.intern(role.value) for role in MessageRole)
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+
+class TranscriptEntry(NamedTuple):
+    role: str
+    content: str
+    timestamp: float
+
+
+class Transcript:
+    """Append-only message log for one session.
+
+    Roles are stored as one-byte codes and timestamps in a float array, so a
+    message costs little more than its content string. Once more than
+    ``transcript_live_messages`` are held, the oldest
+    ``transcript_compress_batch`` are packed into a zlib-compressed block that
+    is only expanded when the full transcript is read.
+    """
+
+    __slots__ = ("_blocks", "_compressed", "_roles", "_contents", "_timestamps")
+
+    def __init__(self) -> None:
+        self._blocks: List[bytes] = []
+        self._compressed = 0
+        self._roles = array("B")
+        self._contents: List[str] = []
+        self._timestamps = array("d")
+
+    def __len__(self) -> int:
+        return self._compressed + len(self._contents)
+
+    def append(self, role: str, content: str, timestamp: Optional[float] = None) -> None:
+        self._roles.append(ROLE_CODES[role])
+        self._contents.append(content)
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+
+        live = settings.transcript_live_messages
+        batch = settings.transcript_compress_batch
+        if live and len(self._contents) >= live + batch:
+            self._compress(batch)
+
+    def _compress(self, count: int) -> None:
+        records = [
+            [self._roles[i], self._timestamps[i], self._contents[i]] for i in range(count)
+        ]
+        self._blocks.append(zlib.compress(json.dumps(records, separators=(",", ":")).encode()))
+        self._compressed += count
+        del self._roles[:count]
+        del self._contents[:count]
+        del self._timestamps[:count]
+
+    def _live(self, start: int = 0) -> Iterator[TranscriptEntry]:
+        for i in range(start, len(self._contents)):
+            yield TranscriptEntry(ROLES[self._roles[i]], self._contents[i], self._timestamps[i])
+
+    def __iter__(self) -> Iterator[TranscriptEntry]:
+        for block in self._blocks:
+            for role, timestamp, content in json.loads(zlib.decompress(block)):
+                yield TranscriptEntry(ROLES[role], content, timestamp)
+        yield from self._live()
+
+    def tail(self, count: int) -> List[TranscriptEntry]:
+        if count > len(self._contents):
+            return list(self)[-count:]
+        return list(self._live(len(self._contents) - count))
+
+    def to_messages(self) -> List[ChatMessage]:
+        return [ChatMessage(role=entry.role, content=entry.content) for entry in self]
+
+    def nbytes(self) -> int:
+        return (
+            sum(len(block) for block in self._blocks)
+            + self._roles.itemsize * len(self._roles)
+            + self._timestamps.itemsize * len(self._timestamps)
+            + sum(sys.getsizeof(content) for content in self._contents)
+        )
@@ -0,0 +1,128 @@
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils import setup_logger
+from src.utils.metrics import LLM_TOKENS
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class UsageTotals:
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    llm_seconds: float = 0.0
+
+    def add(self, input_tokens: int, output_tokens: int, seconds: float) -> None:
+        self.requests += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.total_tokens += input_tokens + output_tokens
+        self.llm_seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["llm_seconds"] = round(self.llm_seconds, 3)
+        return data
+
+
+def extract_usage(response: Any) -> Tuple[int, int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    usage = metadata.get("token_usage") or metadata.get("usage") or {}
+    return (
+        usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0,
+        usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0,
+    )
+
+
+class UsageService:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(UsageService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._sessions: Dict[str, UsageTotals] = {}
+            self._providers: Dict[str, UsageTotals] = {}
+            self._scenarios: Dict[str, UsageTotals] = {}
+            self._days: Dict[Tuple[str, str], UsageTotals] = {}
+            self._latency_ewma: Dict[str, float] = {}
+            self._latency_updated_at: Dict[str, float] = {}
+            self._initialized = True
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def record(
+        self,
+        session_id: str,
+        provider: str,
+        response: Any,
+        seconds: float,
+        scenario: Optional[str] = None
+    ) -> Tuple[int, int]:
+        input_tokens, output_tokens = extract_usage(response)
+
+        buckets = [
+            self._sessions.setdefault(session_id, UsageTotals()),
+            self._providers.setdefault(provider, UsageTotals()),
+            self._days.setdefault((self._today(), provider), UsageTotals()),
+        ]
+        if scenario:
+            buckets.append(self._scenarios.setdefault(scenario, UsageTotals()))
+        for totals in buckets:
+            totals.add(input_tokens, output_tokens, seconds)
+
+        previous = self._latency_ewma.get(provider)
+        self._latency_ewma[provider] = seconds if previous is None else previous + 0.2 * (seconds - previous)
+        self._latency_updated_at[provider] = time.monotonic()
+
+        LLM_TOKENS.labels(provider=provider, kind="input").inc(input_tokens)
+        LLM_TOKENS.labels(provider=provider, kind="output").inc(output_tokens)
+        logger.debug(
+            "Usage for session %s on %s: %d input, %d output tokens", session_id, provider, input_tokens, output_tokens
+        )
+        return input_tokens, output_tokens
+
+    def tokens_today(self, provider: str) -> int:
+        totals = self._days.get((self._today(), provider))
+        return totals.total_tokens if totals else 0
+
+    def latency(self, provider: str, max_age: Optional[float] = None) -> Optional[float]:
+        updated_at = self._latency_updated_at.get(provider)
+        if updated_at is None or (max_age is not None and time.monotonic() - updated_at > max_age):
+            return None
+        return self._latency_ewma[provider]
+
+    def session_usage(self, session_id: str) -> Optional[Dict[str, Any]]:
+        totals = self._sessions.get(session_id)
+        return totals.to_dict() if totals else None
+
+    def forget_session(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def summary(self) -> Dict[str, Any]:
+        days: Dict[str, Dict[str, Any]] = {}
+        for (day, provider), totals in sorted(self._days.items()):
+            days.setdefault(day, {})[provider] = totals.to_dict()
+
+        return {
+            "providers": {provider: totals.to_dict() for provider, totals in self._providers.items()},
+            "scenarios": {scenario: totals.to_dict() for scenario, totals in self._scenarios.items()},
+            "days": days,
+            "sessions": len(self._sessions),
+            "latency_ewma_seconds": {provider: round(value, 3) for provider, value in self._latency_ewma.items()},
+        }
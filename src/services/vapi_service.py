@@ -1,3 +1,9 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
 from vapi import Vapi
 
 from src.config.settings import settings
@@ -8,36 +14,98 @@ from src.utils import setup_logger
 logger = setup_logger(__name__)
 
 class VapiService:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(VapiService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
     def __init__(self) -> None:
-        self._client = Vapi(token=settings.vapi_api_private_key)
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self._client = Vapi(
+                token=settings.vapi_api_private_key,
+                base_url=settings.vapi_base_url or None,
+                httpx_client=httpx.Client(
+                    timeout=settings.vapi_timeout_seconds,
+                    limits=httpx.Limits(max_connections=settings.vapi_max_connections),
+                ),
+            )
+            self._name_index: Dict[str, str] = {}
+            self._index_loaded_at: Optional[float] = None
+            self._index_lock = asyncio.Lock()
+            self._initialized = True
+
+    def _index_fresh(self) -> bool:
+        return (
+            self._index_loaded_at is not None
+            and time.monotonic() - self._index_loaded_at < settings.vapi_index_ttl_seconds
+        )
 
-    async def load_all_assistants(self) -> AssistantResponse:
-        assistants = self._client.assistants.list()
+    def _index(self, assistant) -> None:
+        if assistant.name:
+            self._name_index.setdefault(assistant.name, assistant.id)
+
+    async def load_assistants_page(
+        self, limit: Optional[int] = None, cursor: Optional[datetime] = None
+    ) -> AssistantResponse:
+        limit = limit or settings.vapi_page_size
+        assistants = await asyncio.to_thread(self._client.assistants.list, limit=limit, created_at_lt=cursor)
 
         for assistant in assistants:
-            logger.info(f"Assistant: {assistant}")
+            logger.debug("Assistant: %s", assistant.id)
+            self._index(assistant)
+
+        return AssistantResponse(
+            names=[VapiAssistant.from_client_assistant(assistant) for assistant in assistants],
+            next_cursor=assistants[-1].created_at if len(assistants) >= limit else None
+        )
 
-        vapi_assistants = [
-            VapiAssistant.from_client_assistant(assistant)
-            for assistant in assistants
-        ]
+    async def iter_assistant_pages(self, limit: Optional[int] = None) -> AsyncIterator[AssistantResponse]:
+        cursor = None
+        while True:
+            page = await self.load_assistants_page(limit, cursor)
+            yield page
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def load_all_assistants(self) -> AssistantResponse:
+        vapi_assistants = []
+        name_index: Dict[str, str] = {}
+
+        async for page in self.iter_assistant_pages():
+            vapi_assistants.extend(page.names)
+
+        for assistant in vapi_assistants:
+            if assistant.name:
+                name_index.setdefault(assistant.name, assistant.id)
+        self._name_index = name_index
+        self._index_loaded_at = time.monotonic()
 
         return AssistantResponse(names=vapi_assistants)
 
+    async def find_assistant_id(self, name: str) -> Optional[str]:
+        if name in self._name_index and self._index_fresh():
+            return self._name_index[name]
+
+        async with self._index_lock:
+            if not self._index_fresh():
+                logger.info("Refreshing VAPI assistant index")
+                await self.load_all_assistants()
+
+        return self._name_index.get(name)
+
     async def create_new_assistant(self) -> VapiAssistant:
-        assistants = self._client.assistants.list()
         assistant_name = settings.vapi_assistant_name
+        assistant_id = await self.find_assistant_id(assistant_name)
 
-        existing_assistant = next(
-            (assistant for assistant in assistants if assistant.name == assistant_name),
-            None
-        )
-
-        if existing_assistant:
-            logger.info(f"Found existing assistant: {assistant_name}")
-            return existing_assistant
+        if assistant_id:
+            logger.info("Found existing assistant: %s", assistant_name)
+            return VapiAssistant(id=assistant_id, name=assistant_name)
 
-        logger.info(f"Assistant '{assistant_name}' not found, creating new one...")
+        logger.info("Assistant '%s' not found, creating new one...", assistant_name)
 
         return await self._create_custom_assistant()
 
@@ -59,10 +127,11 @@ class VapiService:
             provider='openai',
             voiceId='alloy',
             model='gpt-4o-mini-tts',
-            inputMinCharacters=10
+            inputMinCharacters=settings.voice_chunk_min_chars
         )
 
-        assistant = self._client.assistants.create(
+        assistant = await asyncio.to_thread(
+            self._client.assistants.create,
             transcriber=transcriber,
             model=model,
             voice=voice,
@@ -72,7 +141,6 @@ class VapiService:
             end_call_message='Goodbye.'
         )
 
-        logger.info(f"Created custom assistant: {assistant.name}")
+        self._name_index[assistant.name] = assistant.id
+        logger.info("Created custom assistant: %s", assistant.name)
         return VapiAssistant.from_client_assistant(assistant)
-
-
@@ -0,0 +1,184 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from src.agents.chatbot_agent import ChatbotAgent
+from src.config.settings import settings
+from src.dependencies.services import get_station_service
+from src.loadtest.fake_llm import ScriptedChatModel
+from src.loadtest.fake_station import FakeStationService
+from src.services.admission_service import AdmissionService
+from src.services.archive_service import ArchiveService
+from src.services.cascade_service import CascadeService
+from src.services.chat_service import ChatService
+from src.services.fleet_health_service import FleetHealthService
+from src.services.incident_service import IncidentService
+from src.services.llm_service import LLMService
+from src.services.station_event_service import StationEventService
+from src.services.usage_service import UsageService
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+WARMUP_PROVIDER = "warmup"
+DRY_RUN_MESSAGE = "Is station ST003 available?"
+
+
+def _isolated(cls):
+    """A private instance of a singleton service, so the dry run leaves the shared one untouched."""
+    instance = object.__new__(cls)
+    instance.__init__()
+    return instance
+
+
+class _DiscardArchive:
+    enabled = False
+
+    def submit(self, record: dict) -> bool:
+        return False
+
+
+class WarmupService:
+    """Pays the lazy start-up costs before the worker reports ready.
+
+    Steps run in order: build the service singletons, index the station
+    registry, open pooled provider connections, load local models, compile an
+    agent graph and, optionally, run one turn against the scripted fake model.
+    Only a failure to build the services fails readiness; the other steps are
+    best effort.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(WarmupService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if not hasattr(self, '_initialized') or not self._initialized:
+            self.state = "pending"
+            self.steps: Dict[str, Dict[str, Any]] = {}
+            self.elapsed_ms: float = 0.0
+            self._initialized = True
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def status(self) -> Dict[str, Any]:
+        return {"state": self.state, "elapsed_ms": self.elapsed_ms, "steps": self.steps}
+
+    async def _step(self, name: str, step: Callable[[], Awaitable[Any]]) -> bool:
+        start = time.perf_counter()
+        try:
+            detail = await step()
+            self.steps[name] = {"ok": True, "ms": round((time.perf_counter() - start) * 1000, 1)}
+            if detail:
+                self.steps[name]["detail"] = detail
+            return True
+        except Exception as e:
+            logger.error("Warm-up step %s failed: %s", name, e, exc_info=True)
+            self.steps[name] = {"ok": False, "ms": round((time.perf_counter() - start) * 1000, 1), "error": str(e)}
+            return False
+
+    async def run(self) -> None:
+        if not settings.warmup_enabled:
+            self.state = "ready"
+            return
+
+        self.state = "running"
+        start = time.perf_counter()
+        logger.info("Warming up")
+
+        if not await self._step("services", self._build_services):
+            self.state = "failed"
+        else:
+            await self._step("station_index", self._index_stations)
+            if settings.warmup_preconnect:
+                await self._step("preconnect", self._preconnect)
+            if settings.ollama_preload:
+                await self._step("preload", self._preload)
+            await self._step("agent", self._warm_agent)
+            self.state = "ready"
+
+        self.elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info("Warm-up %s in %.0f ms", self.state, self.elapsed_ms)
+
+    async def _build_services(self) -> Dict[str, str]:
+        llm_service = LLMService()
+        ChatService()
+        AdmissionService()
+        UsageService()
+        StationEventService()
+        ArchiveService()
+        # Loading a station registry file can take a while; keep the loop free.
+        await asyncio.to_thread(get_station_service)
+        return {"default_provider": llm_service.resolve_provider()}
+
+    async def _index_stations(self) -> Dict[str, int]:
+        station_service = get_station_service()
+
+        def build() -> None:
+            station_service.id_resolver.ensure_index()
+            FleetHealthService(station_service).scan()
+
+        await asyncio.to_thread(build)
+        return {"stations": len(station_service.registry)}
+
+    async def _preconnect(self) -> Dict[str, str]:
+        results = await LLMService().preconnect(settings.warmup_timeout_seconds)
+        if settings.vapi_api_private_key:
+            from src.services.vapi_service import VapiService
+
+            try:
+                await asyncio.wait_for(VapiService().load_all_assistants(), settings.warmup_timeout_seconds)
+                results["vapi"] = "connected"
+            except Exception as e:
+                logger.info("Pre-loading VAPI assistants failed: %s", e)
+                results["vapi"] = "error"
+        return results
+
+    async def _preload(self) -> Dict[str, str]:
+        return await LLMService().preload(settings.ollama_preload_timeout_seconds)
+
+    async def _warm_agent(self) -> Dict[str, Any]:
+        """Compile an agent graph and optionally run one turn through it.
+
+        The turn is not real traffic: it runs against private chat, usage,
+        cascade, incident, station event and fake station services, and its
+        transcript is discarded instead of archived.
+        """
+        llm_service = LLMService()
+        chat_service = _isolated(ChatService)
+        chat_service.archive_service = _DiscardArchive()
+        session_id = f"warmup-{uuid.uuid4().hex[:8]}"
+
+        llm_service.register_client(WARMUP_PROVIDER, ScriptedChatModel(latency_ms=0, tokens_per_second=0))
+        try:
+            agent = ChatbotAgent(
+                user_id="warmup",
+                session_id=session_id,
+                provider=WARMUP_PROVIDER,
+                llm_service=llm_service,
+                chat_service=chat_service,
+                station_service=_isolated(FakeStationService),
+                scenario="warmup",
+                incident_service=_isolated(IncidentService),
+                usage_service=_isolated(UsageService),
+                cascade_service=_isolated(CascadeService),
+                station_event_service=_isolated(StationEventService)
+            )
+            if not settings.warmup_dry_run:
+                return {"dry_run": False}
+
+            chunks = 0
+            async for mode, chunk in agent.stream_message(DRY_RUN_MESSAGE, ["messages", "updates", "custom"]):
+                if mode == "error":
+                    raise RuntimeError(chunk.get("error"))
+                chunks += 1
+            return {"dry_run": True, "chunks": chunks}
+        finally:
+            llm_service.unregister_client(WARMUP_PROVIDER)
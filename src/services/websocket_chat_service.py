@@ -0,0 +1,184 @@
+import asyncio
+import json
+from contextlib import aclosing
+from functools import partial
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from src.agents.chatbot_agent import ChatbotAgent
+from src.agents.turn_queue import TurnQueueFull
+from src.services.admission_service import AdmissionRejected, AdmissionService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+from src.services.station_service import StationService
+from src.services.streaming_service import StreamingService
+from src.utils import setup_logger
+from src.utils.metrics import TURN_CANCELLATIONS, WS_CONNECTIONS, WS_FRAMES
+
+logger = setup_logger(__name__)
+
+
+class WebSocketChatService:
+    """Carries every turn of one chat session over a single WebSocket.
+
+    The session and its agent are resolved once when the connection opens.
+    Client frames are ``{"type": "message", "content": ..., "turn_id": ...}``
+    (optionally with ``"profile"``, as the ``X-Profile`` header does over HTTP),
+    ``{"type": "cancel"}`` and ``{"type": "ping"}``. Each message runs as its
+    own task, so the connection keeps reading while a turn streams, and a
+    cancel or a newer message cuts the running turn short. A message that
+    reuses the ``turn_id`` of a running turn is refused. Server frames are
+    ``session``, ``delta``, ``intermediate``, then one of ``done``,
+    ``cancelled`` or ``error`` per turn, and ``pong``.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        llm_service: LLMService,
+        chat_service: ChatService,
+        station_service: StationService,
+        chatbot_agent: ChatbotAgent,
+        admission_service: AdmissionService,
+        voice: bool = False
+    ):
+        self.websocket = websocket
+        self.llm_service = llm_service
+        self.chat_service = chat_service
+        self.station_service = station_service
+        self.chatbot_agent = chatbot_agent
+        self.admission_service = admission_service
+        self.voice = voice
+        self._send_lock = asyncio.Lock()
+        self._turns: Dict[str, asyncio.Task] = {}
+        self._turn_count = 0
+
+    async def _send(self, frame: Dict[str, Any]) -> None:
+        # Turns stream from their own tasks; one frame is written at a time.
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(frame))
+        WS_FRAMES.labels(kind=frame["type"]).inc()
+
+    async def serve(self) -> None:
+        await self.websocket.accept()
+        WS_CONNECTIONS.inc()
+        session_id = self.chatbot_agent.session_id
+        self.chatbot_agent.chat_service.hold_session(self.chatbot_agent.user_id, session_id)
+        logger.info("WebSocket connected for session %s", session_id)
+
+        try:
+            await self._send({"type": "session", "session_id": session_id, "provider": self.chatbot_agent.provider})
+            while True:
+                raw = await self.websocket.receive_text()
+                try:
+                    frame = json.loads(raw)
+                except ValueError:
+                    await self._send({"type": "error", "detail": "Frames must be JSON objects"})
+                    continue
+                if not isinstance(frame, dict):
+                    await self._send({"type": "error", "detail": "Frames must be JSON objects"})
+                    continue
+                await self._handle(frame)
+        except WebSocketDisconnect:
+            logger.info("WebSocket disconnected for session %s", session_id)
+        finally:
+            WS_CONNECTIONS.dec()
+            self.chatbot_agent.chat_service.release_session(session_id)
+            turns = list(self._turns.values())
+            for task in turns:
+                task.cancel()
+            await asyncio.gather(*turns, return_exceptions=True)
+
+    async def _handle(self, frame: Dict[str, Any]) -> None:
+        kind = frame.get("type")
+
+        if kind == "message":
+            content = frame.get("content")
+            if not isinstance(content, str) or not content.strip():
+                await self._send({"type": "error", "turn_id": frame.get("turn_id"), "detail": "No user message provided"})
+                return
+
+            self._turn_count += 1
+            turn_id = str(frame.get("turn_id") or self._turn_count)
+            running = self._turns.get(turn_id)
+            if running is not None and not running.done():
+                await self._send({
+                    "type": "error", "turn_id": turn_id, "status": 409, "detail": f"Turn {turn_id} is already running"
+                })
+                return
+
+            profile = frame.get("profile") if isinstance(frame.get("profile"), str) else None
+            task = asyncio.create_task(self._run_turn(turn_id, content, profile))
+            self._turns[turn_id] = task
+            task.add_done_callback(partial(self._forget_turn, turn_id))
+
+        elif kind == "cancel":
+            active = self.chatbot_agent.turn_queue.active_task
+            if active is not None and not active.done():
+                logger.info("Client cancelled the turn for session %s", self.chatbot_agent.session_id)
+                TURN_CANCELLATIONS.labels(reason="client").inc()
+                active.cancel()
+
+        elif kind == "ping":
+            await self._send({"type": "pong"})
+
+        else:
+            await self._send({"type": "error", "detail": f"Unknown frame type: {kind}"})
+
+    def _forget_turn(self, turn_id: str, task: asyncio.Task) -> None:
+        # A finished turn's id may already belong to a newer turn.
+        if self._turns.get(turn_id) is task:
+            del self._turns[turn_id]
+
+    async def _run_turn(self, turn_id: str, content: str, profile: Optional[str] = None) -> None:
+        streaming = StreamingService(
+            llm_service=self.llm_service,
+            chat_service=self.chat_service,
+            station_service=self.station_service,
+            chatbot_agent=self.chatbot_agent,
+            admission_service=self.admission_service,
+            voice=self.voice,
+            profile=profile
+        )
+
+        try:
+            try:
+                lease, ticket = await streaming.admit(content)
+            except AdmissionRejected as e:
+                await self._send({
+                    "type": "error", "turn_id": turn_id, "status": 429, "detail": str(e), "retry_after": e.retry_after
+                })
+                return
+            except TurnQueueFull as e:
+                await self._send({
+                    "type": "error", "turn_id": turn_id, "status": 429, "detail": str(e), "retry_after": e.retry_after
+                })
+                return
+
+            error = None
+            try:
+                async with aclosing(streaming.turn_events(lease, ticket)) as stream:
+                    async for kind, text in stream:
+                        if kind == "error":
+                            error = text
+                            continue
+                        frame_type = "intermediate" if kind == "intermediate" else "delta"
+                        await self._send({"type": frame_type, "turn_id": turn_id, "content": text})
+            finally:
+                streaming.end_turn(lease, ticket)
+
+            if streaming.cancelled:
+                await self._send({"type": "cancelled", "turn_id": turn_id})
+            elif error is not None:
+                await self._send({"type": "error", "turn_id": turn_id, "status": 500, "detail": error})
+            else:
+                await self._send({"type": "done", "turn_id": turn_id})
+        except (asyncio.CancelledError, WebSocketDisconnect):
+            raise
+        except Exception as e:
+            logger.error("Error in WebSocket turn for session %s: %s", self.chatbot_agent.session_id, e, exc_info=True)
+            try:
+                await self._send({"type": "error", "turn_id": turn_id, "status": 500, "detail": str(e)})
+            except Exception as send_error:
+                logger.debug("Could not report the error to session %s: %s", self.chatbot_agent.session_id, send_error)
@@ -1,12 +1,14 @@
 import uuid
 import json
 import chainlit as cl
-import httpx
 import sys
+import websockets
 from pathlib import Path
 from enum import Enum
+from urllib.parse import urlencode
 
 from src.config.settings import settings
+from src.ui.voice_calls import VoiceCallLimitReached, VoiceCalls
 from src.utils import setup_logger
 from vapi_python import Vapi
 
@@ -17,7 +19,32 @@ class CallStatus(str, Enum):
     ACTIVE = "active"
     LOADING = "loading"
 
-vapi_instance = None
+voice_calls = VoiceCalls(lambda: Vapi(api_key=settings.vapi_api_public_key), settings.vapi_ui_max_calls)
+
+async def get_chat_connection(session_id: str, user_id: str, provider: str):
+    """Return the chat's WebSocket to the API, opening it on first use.
+
+    One connection carries every turn of the chat, so a message does not pay
+    for a new HTTP request and session lookup.
+    """
+    connection = cl.user_session.get("chat_connection")
+    if connection is not None and connection.state is websockets.protocol.State.OPEN:
+        return connection
+
+    query = urlencode({"session_id": session_id, "user_id": user_id, "provider": provider})
+    url = f"ws://{settings.host}:{settings.port}/chat/ws?{query}"
+    logger.debug("Connecting to %s", url)
+    connection = await websockets.connect(url, open_timeout=10)
+    json.loads(await connection.recv())
+    cl.user_session.set("chat_connection", connection)
+    return connection
+
+
+async def close_chat_connection() -> None:
+    connection = cl.user_session.get("chat_connection")
+    if connection is not None:
+        cl.user_session.set("chat_connection", None)
+        await connection.close()
 
 @cl.action_callback("reboot")
 async def on_reboot(action):
@@ -46,23 +73,22 @@ async def on_provider_change(action):
     provider = action.payload.get("provider")
     if provider:
         cl.user_session.set("llm_provider", provider)
+        await close_chat_connection()
         logger.info(f"Changed LLM provider to: {provider}")
         await cl.Message(content=f"LLM provider changed to: **{provider.capitalize()}**", author="System").send()
 
 @cl.action_callback("voice_call")
 async def toggle_voice_call(action):
-    global vapi_instance
+    session_id = cl.user_session.get("session_id")
     current_status = action.payload.get("status", CallStatus.INACTIVE)
+
+    if current_status == CallStatus.LOADING:
+        return
     
     if current_status == CallStatus.ACTIVE:
         await cl.Message(content="Ending voice call...", author="System").send()
 
-        if vapi_instance:
-            try:
-                vapi_instance.stop()
-                logger.info("VAPI call stopped successfully")
-            except Exception as e:
-                logger.error(f"Error stopping VAPI call: {str(e)}")
+        await voice_calls.stop(session_id)
         
         cl.user_session.set("call_status", CallStatus.INACTIVE)
         await show_voice_button()
@@ -80,23 +106,29 @@ async def toggle_voice_call(action):
             logger.info(f"VAPI API key length: {len(settings.vapi_api_public_key) if settings.vapi_api_public_key else 0}")
             logger.info(f"VAPI assistant ID: {settings.vapi_assistant_id}")
 
-            vapi_instance = Vapi(api_key=settings.vapi_api_public_key)
-
             assistant_overrides = {
                 "recordingEnabled": False,
                 "interruptionsEnabled": False,
             }
 
-            call = vapi_instance.start(
+            call = await voice_calls.start(
+                session_id,
                 assistant_id=settings.vapi_assistant_id,
                 assistant_overrides=assistant_overrides
             )
+            if not voice_calls.active(session_id):
+                return
 
             logger.info(f"VAPI call started successfully {call}")
             
             cl.user_session.set("call_status", CallStatus.ACTIVE)
             await show_voice_button()
             await cl.Message(content="Voice call active! Start speaking now...", author="System").send()
+        except VoiceCallLimitReached as e:
+            logger.warning("Voice call refused for session %s: %s", session_id, e)
+            cl.user_session.set("call_status", CallStatus.INACTIVE)
+            await show_voice_button()
+            await cl.Message(content=str(e), author="System").send()
         except Exception as e:
             logger.error(f"Error making VAPI call: {str(e)}")
             cl.user_session.set("call_status", CallStatus.INACTIVE)
@@ -212,82 +244,42 @@ async def on_message(message: cl.Message) -> None:
     msg = cl.Message(content=content)
     await msg.send()
 
-    async with httpx.AsyncClient() as client:
-        url = f"http://{settings.host}:{settings.port}/chat/completions"
-        payload = {
-            "messages": [{"role": "user", "content": message.content}],
-            "provider": llm_provider,
-            "session_id": session_id,
-            "user_id": user_id
-        }
-        
-        logger.info(f"Using LLM provider: {llm_provider}")
-
-        headers = {
-            "Accept": "text/event-stream",
-            "Content-Type": "application/json"
-        }
-
-        logger.info(f"Making request to {url}")
-
-        try:
-            async with client.stream("POST", url, json=payload, headers=headers, timeout=60.0) as response:
-                if response.status_code != 200:
-                    error_text = await response.text()
-                    msg.content = f"Error: {response.status_code} - {error_text}"
-                    await msg.update()
-                    return
-
-                try:
-                    async for line in response.aiter_lines():
-                        if not line.strip():
-                            continue
-
-                        if line == "[DONE]" or line == "data: [DONE]":
-                            logger.info("Received DONE signal, ending stream")
-                            break
-
-                        json_str = line
-                        if line.startswith("data: "):
-                            json_str = line[6:].strip()
-                        
-                        if not json_str:
-                            continue
-                        
-                        try:
-                            data = json.loads(json_str)
-                            if "choices" in data and len(data["choices"]) > 0:
-                                delta = data["choices"][0].get("delta", {})
-                                if "content" in delta:
-                                    content += delta["content"]
-                                    msg.content = content
-                                    await msg.update()
-
-                            logger.info(f"Received chunk: {json_str[:50]}...")
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Error parsing JSON: {e}, line: {json_str[:50]}...")
-                            continue
-                except httpx.ReadError as e:
-                    logger.warning(f"Stream reading error: {e}")
-                    if content:
-                        msg.content = content
-                        await msg.update()
-                    else:
-                        msg.content = "Error: Connection closed unexpectedly"
-                        await msg.update()
-        except httpx.NetworkError as e:
-            logger.error(f"Network error: {e}")
-            msg.content = "Error: Network error"
-            await msg.update()
-        except httpx.TimeoutException as e:
-            logger.error(f"Timeout exception: {e}")
-            msg.content = "Error: Timeout exception"
-            await msg.update()
-        except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
-            msg.content = "Error: Unexpected error"
-            await msg.update()
-
+    try:
+        connection = await get_chat_connection(session_id, user_id, llm_provider)
+        await connection.send(json.dumps({"type": "message", "content": message.content}))
+
+        while True:
+            frame = json.loads(await connection.recv())
+            if frame["type"] in ("delta", "intermediate"):
+                content += frame["content"]
+                msg.content = content
+                await msg.update()
+            elif frame["type"] == "error":
+                msg.content = f"Error: {frame.get('status', '')} - {frame.get('detail')}"
+                await msg.update()
+                return
+            elif frame["type"] in ("done", "cancelled"):
+                logger.debug("Turn %s ended with %s", frame.get("turn_id"), frame["type"])
+                return
+    except websockets.ConnectionClosed as e:
+        logger.warning("Chat connection closed: %s", e)
+        cl.user_session.set("chat_connection", None)
+        msg.content = content or "Error: Connection closed unexpectedly"
+        await msg.update()
+    except OSError as e:
+        logger.error("Network error: %s", e)
+        msg.content = "Error: Network error"
+        await msg.update()
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        msg.content = "Error: Unexpected error"
+        await msg.update()
+
+
+@cl.on_chat_end
+async def on_chat_end():
+    await close_chat_connection()
+    await voice_calls.stop(cl.user_session.get("session_id"))
 
 if __name__ == "__main__":
     project_root = Path(__file__).parent.parent.parent
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from src.utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class VoiceCallLimitReached(Exception):
+    pass
+
+
+class _Slot:
+    def __init__(self):
+        self.vapi: Optional[Any] = None
+
+
+class VoiceCalls:
+    """Browser voice calls of the Chainlit UI, one per chat session.
+
+    At most ``max_calls`` calls run at once across the process. ``Vapi.start``
+    and ``Vapi.stop`` make blocking HTTP and WebRTC calls, so they run in a
+    worker thread and other users' chats keep streaming meanwhile.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_calls: int):
+        self.factory = factory
+        self.max_calls = max_calls
+        # A slot is reserved when a call starts setting up, so starting calls count towards the limit.
+        self._slots: Dict[str, _Slot] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def active(self, key: str) -> bool:
+        slot = self._slots.get(key)
+        return slot is not None and slot.vapi is not None
+
+    async def start(self, key: str, **kwargs) -> Any:
+        if key in self._slots:
+            await self.stop(key)
+        if len(self._slots) >= self.max_calls:
+            raise VoiceCallLimitReached(f"All {self.max_calls} voice lines are busy, please try again shortly")
+        slot = self._slots[key] = _Slot()
+
+        try:
+            vapi = self.factory()
+            call = await asyncio.to_thread(vapi.start, **kwargs)
+        except BaseException:
+            if self._slots.get(key) is slot:
+                del self._slots[key]
+            raise
+
+        if self._slots.get(key) is not slot:
+            # The session ended or hung up while the call was being set up.
+            logger.info("Voice call for %s was stopped while starting", key)
+            await asyncio.to_thread(vapi.stop)
+            return None
+
+        slot.vapi = vapi
+        logger.info("Voice call started for %s (%d active)", key, len(self._slots))
+        return call
+
+    async def stop(self, key: str) -> bool:
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        if slot.vapi is not None:
+            try:
+                await asyncio.to_thread(slot.vapi.stop)
+            except Exception as e:
+                logger.error("Error stopping voice call for %s: %s", key, e)
+        logger.info("Voice call stopped for %s (%d active)", key, len(self._slots))
+        return True
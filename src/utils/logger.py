@@ -1,23 +1,194 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Set, Tuple, Union
 
+from src.config.settings import settings
 
-def setup_logger(name: str) -> logging.Logger:
-    numeric_level = getattr(logging, "INFO", logging.INFO)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_rate_limit_filter: Optional["RateLimitFilter"] = None
+_setup_lock = threading.Lock()
+_invalid_levels: Set[str] = set()
+
+# Not set up through setup_logger, so problems with the logging settings still reach stderr.
+_logger = logging.getLogger(__name__)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per (logger, message template) for records below WARNING.
+
+    Only attached to the loggers listed in ``log_rate_limited``. Hot-path log
+    calls use %-style templates, so each call site maps to one bucket no
+    matter how many distinct arguments it is called with.
+    """
+
+    max_keys = 4096
+
+    def __init__(self, rate_per_second: float, burst: int) -> None:
+        super().__init__()
+        self.rate = rate_per_second
+        self.burst = burst
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [float(self.burst), now]
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                self.suppressed += 1
+                return False
+
+            bucket[0] = tokens - 1
+            return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        return JsonFormatter()
+
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 
-    logger = logging.getLogger(name)
-    logger.setLevel(numeric_level)
 
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(numeric_level)
+def _get_queue_handler() -> QueueHandler:
+    global _queue_handler, _listener
 
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
+    with _setup_lock:
+        if _queue_handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
 
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(_build_formatter())
+
+            _queue_handler = DroppingQueueHandler(log_queue)
+
+            _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+
+    return _queue_handler
+
+
+def _matches(name: str, prefix: str) -> bool:
+    return name == prefix or name.startswith(prefix + ".")
+
+
+def _get_rate_limit_filter() -> "RateLimitFilter":
+    global _rate_limit_filter
+
+    with _setup_lock:
+        if _rate_limit_filter is None:
+            _rate_limit_filter = RateLimitFilter(settings.log_rate_limit_per_second, settings.log_rate_limit_burst)
+
+    return _rate_limit_filter
+
+
+def _parse_level(level: Union[str, int]) -> Optional[int]:
+    if isinstance(level, int):
+        return level
+    level = level.strip().upper()
+    if level.isdigit():
+        return int(level)
+    number = logging.getLevelName(level)
+    return number if isinstance(number, int) else None
+
+
+def _warn_invalid_level(setting: str, level: Union[str, int], fallback: str) -> None:
+    key = f"{setting}={level}"
+    if key not in _invalid_levels:
+        _invalid_levels.add(key)
+        _logger.warning("Invalid log level %r in %s, using %s", level, setting, fallback)
+
+
+def resolve_level(name: str) -> int:
+    default = _parse_level(settings.log_level)
+    if default is None:
+        _warn_invalid_level("LOG_LEVEL", settings.log_level, "INFO")
+        default = logging.INFO
+
+    level, setting, matched = None, None, -1
+    for prefix, prefix_level in settings.log_levels.items():
+        if _matches(name, prefix) and len(prefix) > matched:
+            level, setting, matched = prefix_level, f"LOG_LEVELS[{prefix!r}]", len(prefix)
+
+    if level is None:
+        return default
+
+    number = _parse_level(level)
+    if number is None:
+        _warn_invalid_level(setting, level, logging.getLevelName(default))
+        return default
+    return number
+
+
+def setup_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(resolve_level(name))
+
+    handler = _get_queue_handler()
+    if handler not in logger.handlers:
         logger.addHandler(handler)
 
+    if any(_matches(name, prefix) for prefix in settings.log_rate_limited):
+        rate_limit_filter = _get_rate_limit_filter()
+        if rate_limit_filter not in logger.filters:
+            logger.addFilter(rate_limit_filter)
+
     return logger
@@ -0,0 +1,240 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+TURN_SECONDS = Histogram(
+    "ev_turn_duration_seconds",
+    "End-to-end duration of a chat turn, from request to the final SSE chunk",
+    ["provider", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+TURN_TTFT_SECONDS = Histogram(
+    "ev_turn_ttft_seconds",
+    "Time from the start of a turn to the first streamed content chunk",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+GRAPH_OVERHEAD_SECONDS = Histogram(
+    "ev_graph_overhead_seconds",
+    "Turn time not spent in LLM calls, tools or SSE emission",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_SECONDS = Histogram(
+    "ev_graph_node_duration_seconds",
+    "Duration of a single LangGraph node execution",
+    ["node", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "ev_llm_request_duration_seconds",
+    "Duration of a single LLM provider call",
+    ["provider", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+TOOL_SECONDS = Histogram(
+    "ev_tool_duration_seconds",
+    "Duration of a station tool execution",
+    ["tool", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+SSE_EMIT_SECONDS = Histogram(
+    "ev_sse_emit_duration_seconds",
+    "Time spent encoding and writing SSE chunks during a turn",
+    ["provider"],
+    buckets=LATENCY_BUCKETS,
+)
+SSE_CHUNKS = Counter(
+    "ev_sse_chunks_total",
+    "SSE chunks sent to clients",
+    ["kind"],
+)
+WS_CONNECTIONS = Gauge(
+    "ev_ws_connections",
+    "Open chat WebSocket connections",
+)
+WS_FRAMES = Counter(
+    "ev_ws_frames_total",
+    "Frames sent to chat WebSocket clients",
+    ["kind"],
+)
+TURN_CANCELLATIONS = Counter(
+    "ev_turn_cancellations_total",
+    "In-flight agent turns cancelled before completion",
+    ["reason"],
+)
+DEADLINE_MISSES = Counter(
+    "ev_deadline_misses_total",
+    "Turn stages cut short by the turn deadline, by stage (llm or tool) and provider or tool name",
+    ["stage", "target"],
+)
+PROFILES_CAPTURED = Counter(
+    "ev_profiles_captured_total",
+    "Turn profiles written to disk, by profiler mode",
+    ["mode"],
+)
+TURN_QUEUE_PENDING = Gauge(
+    "ev_turn_queue_pending",
+    "Utterances waiting for their session's turn lock, across all sessions",
+)
+TURN_QUEUE_DEPTH = Histogram(
+    "ev_turn_queue_depth",
+    "Session queue depth observed when an utterance is submitted",
+    buckets=(1, 2, 3, 4, 6, 8, 16),
+)
+TURN_QUEUE_WAIT_SECONDS = Histogram(
+    "ev_turn_queue_wait_seconds",
+    "Time an utterance waited for its session's turn lock",
+    buckets=LATENCY_BUCKETS,
+)
+TURN_QUEUE_COALESCED = Counter(
+    "ev_turn_queue_coalesced_total",
+    "Utterances merged into a later turn instead of running their own",
+)
+TURN_QUEUE_REJECTED = Counter(
+    "ev_turn_queue_rejected_total",
+    "Utterances rejected because the session queue was full",
+)
+LLM_TOKENS = Counter(
+    "ev_llm_tokens_total",
+    "Prompt and completion tokens reported by LLM responses",
+    ["provider", "kind"],
+)
+LLM_CASCADE_TURNS = Counter(
+    "ev_llm_cascade_turns_total",
+    "Turns by the cascade tier (deterministic, small or main model) that answered them",
+    ["provider", "tier", "reason"],
+)
+LLM_ROUTED = Counter(
+    "ev_llm_routed_total",
+    "LLM calls moved to another provider because a budget was exceeded",
+    ["source", "target", "reason"],
+)
+FLEET_SCAN_SECONDS = Histogram(
+    "ev_fleet_scan_seconds",
+    "Duration of the vectorized fleet health scan",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+FLEET_UNHEALTHY = Gauge(
+    "ev_fleet_unhealthy_stations",
+    "Stations found unhealthy by the last fleet scan",
+    ["issue"],
+)
+STATION_EVENTS = Counter(
+    "ev_station_events_total",
+    "Station events ingested",
+    ["kind"],
+)
+STATION_NOTIFICATIONS = Counter(
+    "ev_station_notifications_total",
+    "Station event notifications queued for watching sessions",
+)
+STATION_STATUS_CACHE = Counter(
+    "ev_station_status_cache_total",
+    "Station status lookups answered from pushed or recent state versus the backend",
+    ["result"],
+)
+STATION_ID_RESOLUTION = Counter(
+    "ev_station_id_resolution_total",
+    "Station ID mentions matched against the registry, by where they came from and how they matched",
+    ["source", "result"],
+)
+ARCHIVE_RECORDS = Counter(
+    "ev_archive_records_total",
+    "Transcript archive records by outcome (written, dropped on a full queue, failed)",
+    ["outcome"],
+)
+ARCHIVE_BATCH_SECONDS = Histogram(
+    "ev_archive_batch_seconds",
+    "Time to write and fsync one batch of archive records",
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "ev_admission_in_flight",
+    "Turns currently holding a provider concurrency slot",
+    ["provider"],
+)
+ADMISSION_QUEUED = Gauge(
+    "ev_admission_queued",
+    "Turns waiting for a provider concurrency slot",
+    ["provider"],
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "ev_admission_wait_seconds",
+    "Time a turn waited for a provider concurrency slot",
+    ["provider", "priority"],
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_SHED = Counter(
+    "ev_admission_shed_total",
+    "Turns rejected with 429 by admission control",
+    ["provider", "priority", "reason"],
+)
+LLM_TOOL_CALLS = Counter(
+    "ev_llm_tool_calls_total",
+    "Tool calls requested by the LLM",
+    ["provider", "tool"],
+)
+
+
+@dataclass
+class TurnTimings:
+    llm: float = 0.0
+    tools: float = 0.0
+    sse: float = 0.0
+
+
+current_turn: ContextVar[Optional[TurnTimings]] = ContextVar("current_turn", default=None)
+
+
+class observe:
+    """Time a block into a histogram with an ``outcome`` label.
+
+    The outcome defaults to ``ok``, becomes ``error`` or ``cancelled`` when the
+    block raises, and can be overridden with ``set_outcome``. When ``turn_field``
+    is given, the elapsed time is also added to the current turn's timings.
+    """
+
+    __slots__ = ("histogram", "labels", "turn_field", "outcome", "start")
+
+    def __init__(self, histogram: Histogram, turn_field: Optional[str] = None, **labels: str):
+        self.histogram = histogram
+        self.labels = labels
+        self.turn_field = turn_field
+        self.outcome = "ok"
+        self.start = 0.0
+
+    def set_outcome(self, outcome: str) -> None:
+        self.outcome = outcome
+
+    def __enter__(self) -> "observe":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self.start
+
+        if exc_type is not None:
+            if issubclass(exc_type, (asyncio.CancelledError, GeneratorExit)):
+                self.outcome = "cancelled"
+            else:
+                self.outcome = "error"
+
+        self.histogram.labels(outcome=self.outcome, **self.labels).observe(elapsed)
+
+        if self.turn_field:
+            timings = current_turn.get()
+            if timings is not None:
+                setattr(timings, self.turn_field, getattr(timings, self.turn_field) + elapsed)
+        return False
+
+
+def render_metrics() -> bytes:
+    return generate_latest()
+
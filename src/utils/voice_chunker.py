@@ -0,0 +1,74 @@
+import re
+from typing import List, Optional
+
+SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+CLAUSE_END = re.compile(r"[,;:—–]\s+|\s+-\s+")
+WHITESPACE = re.compile(r"\s+")
+
+
+class SentenceChunker:
+    """Buffers streamed LLM text into phrases that are natural to speak.
+
+    ``push`` returns complete pieces as soon as a sentence ends, or a clause
+    ends once ``clause_min_chars`` are buffered. ``flush_partial`` is meant for
+    a latency deadline and cuts at the last word boundary; ``flush`` returns
+    everything that is left at the end of a reply.
+    """
+
+    def __init__(self, min_chars: int = 10, clause_min_chars: int = 30, max_chars: int = 250):
+        self.min_chars = min_chars
+        self.clause_min_chars = clause_min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._buffer.strip())
+
+    def push(self, text: str) -> List[str]:
+        self._buffer += text
+        pieces = []
+
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            piece, self._buffer = self._buffer[:cut], self._buffer[cut:]
+            if piece.strip():
+                pieces.append(piece.strip())
+
+        return pieces
+
+    def flush_partial(self) -> Optional[str]:
+        if len(self._buffer.strip()) < self.min_chars:
+            return None
+
+        cut = self._last_word_boundary(len(self._buffer))
+        if cut is None:
+            return None
+
+        piece, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return piece.strip() or None
+
+    def flush(self) -> Optional[str]:
+        piece, self._buffer = self._buffer.strip(), ""
+        return piece or None
+
+    def _find_cut(self) -> Optional[int]:
+        for match in SENTENCE_END.finditer(self._buffer):
+            if len(self._buffer[:match.end()].strip()) >= self.min_chars:
+                return match.end()
+
+        for match in CLAUSE_END.finditer(self._buffer):
+            if len(self._buffer[:match.end()].strip()) >= self.clause_min_chars:
+                return match.end()
+
+        if len(self._buffer) > self.max_chars:
+            return self._last_word_boundary(self.max_chars)
+
+        return None
+
+    def _last_word_boundary(self, limit: int) -> Optional[int]:
+        boundaries = [match.end() for match in WHITESPACE.finditer(self._buffer, 0, limit)]
+        boundaries = [end for end in boundaries if len(self._buffer[:end].strip()) >= self.min_chars]
+        return boundaries[-1] if boundaries else None
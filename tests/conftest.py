@@ -0,0 +1,44 @@
+import os
+
+# The LLM service needs at least one configured provider to import cleanly.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest  # noqa: E402
+
+from src.config.settings import settings
+from src.dependencies import services
+from src.loadtest.fake_llm import ScriptedChatModel
+from src.loadtest.fake_station import FakeStationService
+from src.services.admission_service import AdmissionService
+from src.services.cascade_service import CascadeService
+from src.services.chat_service import ChatService
+from src.services.incident_service import IncidentService
+from src.services.llm_service import LLMService
+from src.services.station_event_service import StationEventService
+from src.services.usage_service import UsageService
+
+FAKE_PROVIDER = "fake"
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    """Fresh session state on the scripted model and fake stations, under provider ``fake``."""
+    monkeypatch.setattr(settings, "fake_station_backend", True)
+    monkeypatch.setattr(settings, "llm_provider", FAKE_PROVIDER)
+    monkeypatch.setattr(settings, "archive_dir", None)
+    monkeypatch.setattr(settings, "incident_snapshot_path", None)
+    monkeypatch.setattr(settings, "llm_cascade_enabled", False)
+    monkeypatch.setattr(settings, "llm_routing_enabled", False)
+    monkeypatch.setattr(settings, "profiling_enabled", False)
+    monkeypatch.setattr(settings, "fake_station_check_latency_ms", 0)
+    monkeypatch.setattr(settings, "fake_station_reboot_latency_ms", 0)
+    for service in (
+        AdmissionService, CascadeService, ChatService, FakeStationService, IncidentService, StationEventService,
+        UsageService
+    ):
+        monkeypatch.setattr(service, "_instance", None)
+    monkeypatch.setattr(services, "agent_sessions", {})
+
+    model = ScriptedChatModel(latency_ms=0, tokens_per_second=0)
+    monkeypatch.setitem(LLMService()._clients, FAKE_PROVIDER, model)
+    return model
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from src.config.settings import Settings
+from src.services.admission_service import TEXT_PRIORITY, VOICE_PRIORITY, AdmissionRejected, ProviderGate
+
+
+def test_voice_waiters_are_admitted_before_text():
+    async def run():
+        gate = ProviderGate("openai", limit=1, max_queue=10)
+        lease = await gate.acquire(TEXT_PRIORITY, 5)
+        admitted = []
+
+        async def wait(priority, name):
+            next_lease = await gate.acquire(priority, 5)
+            admitted.append(name)
+            next_lease.release()
+
+        waiters = [asyncio.create_task(wait(TEXT_PRIORITY, "text")), asyncio.create_task(wait(VOICE_PRIORITY, "voice"))]
+        await asyncio.sleep(0)
+        lease.release()
+        await asyncio.gather(*waiters)
+        return admitted, gate.in_flight
+
+    assert asyncio.run(run()) == (["voice", "text"], 0)
+
+
+@pytest.mark.parametrize("max_queue, avg_turn_seconds, reason", [(0, 1.0, "queue_full"), (10, 30.0, "over_budget")])
+def test_requests_are_shed_up_front(max_queue, avg_turn_seconds, reason):
+    async def run():
+        gate = ProviderGate("openai", limit=1, max_queue=max_queue)
+        gate.avg_turn_seconds = avg_turn_seconds
+        await gate.acquire(TEXT_PRIORITY, 5)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await gate.acquire(TEXT_PRIORITY, 5)
+        return gate, rejected.value
+
+    gate, rejected = asyncio.run(run())
+    assert rejected.reason == reason
+    assert rejected.retry_after >= 1
+    assert gate.shed == {reason: 1}
+    assert gate.in_flight == 1
+
+
+def test_waiter_past_its_budget_is_shed_and_leases_release_once():
+    async def run():
+        gate = ProviderGate("openai", limit=1, max_queue=10)
+        gate.avg_turn_seconds = 0.01
+        lease = await gate.acquire(VOICE_PRIORITY, 1)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await gate.acquire(VOICE_PRIORITY, 0.05)
+        lease.release()
+        lease.release()
+        return gate, rejected.value
+
+    gate, rejected = asyncio.run(run())
+    assert rejected.reason == "deadline"
+    assert gate.in_flight == 0
+
+
+@pytest.mark.parametrize("overrides", [{"admission_max_concurrency": 0}, {"admission_provider_limits": {"ollama": 0}}])
+def test_limits_below_one_are_rejected(overrides):
+    with pytest.raises(ValidationError):
+        Settings(**overrides)
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from src.config.settings import settings
+from src.services.archive_service import ArchiveService, iter_archive
+
+
+@pytest.fixture
+def archive(monkeypatch, tmp_path) -> ArchiveService:
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "archive_fsync", False)
+    monkeypatch.setattr(settings, "archive_queue_size", 2)
+    monkeypatch.setattr(ArchiveService, "_instance", None)
+    service = ArchiveService()
+    yield service
+    service._close()
+
+
+def record(session_id: str, station_id: str) -> dict:
+    return {"type": "turn", "session_id": session_id, "user_id": "user", "station_ids": [station_id],
+            "ts": 0, "messages": [{"role": "user", "content": "x" * 200}]}
+
+
+def test_files_rotate_at_the_size_limit_and_read_back(archive, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "archive_compress", False)
+    # Room for two records per file.
+    size = len(json.dumps(record("session-0", "ST001"), separators=(",", ":"))) + 1
+    monkeypatch.setattr(settings, "archive_max_file_mb", 2.5 * size / 2**20)
+
+    for i in range(6):
+        archive._write_batch([record(f"session-{i}", "ST001" if i % 2 else "ST002")])
+    archive._close()
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 3
+    assert all(path.name.endswith(".jsonl") for path in files)
+    assert [r["session_id"] for r in iter_archive(str(tmp_path))] == [f"session-{i}" for i in range(6)]
+    assert [r["session_id"] for r in iter_archive(str(tmp_path), station_id="ST001")] == [
+        "session-1", "session-3", "session-5"
+    ]
+
+
+def test_compressed_files_rotate_on_their_size_on_disk(archive, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "archive_compress", True)
+    size = len(json.dumps(record("session-0", "ST001"), separators=(",", ":"))) + 1
+    # Room for four uncompressed records per file.
+    limit = 4 * size
+    monkeypatch.setattr(settings, "archive_max_file_mb", limit / 2**20)
+
+    for i in range(100):
+        archive._write_batch([record(f"session-{i}", "ST001")])
+    archive._close()
+
+    files = sorted(tmp_path.iterdir())
+    assert all(path.name.endswith(".jsonl.gz") for path in files)
+    # Far fewer files than the 25 the uncompressed size would need.
+    assert 1 < len(files) < 5
+    assert all(limit < path.stat().st_size < limit + size for path in files[:-1])
+    assert [r["session_id"] for r in iter_archive(str(tmp_path))] == [f"session-{i}" for i in range(100)]
+
+
+@pytest.mark.parametrize("session_id", ['say "hi"', "C:\\calls\\1", "łódź"])
+def test_filters_match_values_that_need_escaping(archive, tmp_path, session_id):
+    archive._write_batch([record(session_id, "ST001"), record("other", "ST001")])
+    archive._close()
+
+    assert [r["session_id"] for r in iter_archive(str(tmp_path), session_id=session_id)] == [session_id]
+
+
+def test_full_queue_drops_records_instead_of_blocking(archive, monkeypatch):
+    monkeypatch.setattr(archive, "_ensure_started", lambda: None)
+    assert [archive.submit(record(f"session-{i}", "ST001")) for i in range(3)] == [True, True, False]
+
+
+def test_disabled_archive_accepts_nothing(archive, monkeypatch):
+    monkeypatch.setattr(settings, "archive_dir", None)
+    assert not archive.enabled
+    assert not archive.submit(record("session", "ST001"))
@@ -0,0 +1,106 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.agents.cascade import (
+    DETERMINISTIC, MAIN, SMALL, STATION_ID_INSTRUCTIONS, classify_turn, deterministic_reply
+)
+from src.config.settings import settings
+
+SYSTEM = SystemMessage(content="You are an EV charging station assistant.")
+WELCOME = "Welcome to the EV Station Support! I can help with a stuck connector."
+
+
+@pytest.fixture(autouse=True)
+def cascade_settings(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cascade_deterministic", True)
+    monkeypatch.setattr(settings, "llm_cascade_max_simple_words", 8)
+
+
+def turn(text: str, previous: str = WELCOME) -> list:
+    return [SYSTEM, HumanMessage(content="hi"), AIMessage(content=previous), HumanMessage(content=text)]
+
+
+@pytest.mark.parametrize("text, reason", [
+    ("Hi", "greeting"),
+    ("hello there!", "greeting"),
+    ("Good morning, team", "greeting"),
+    ("Thanks", "thanks"),
+    ("great, thank you so much!", "thanks"),
+    ("cheers", "thanks"),
+    ("bye", "goodbye"),
+    ("That's all", "goodbye"),
+    ("What's my station number?", "station_number"),
+    ("where can I find the station ID", "station_number"),
+])
+def test_canned_turns_skip_the_model(text, reason):
+    assert classify_turn(turn(text)) == (DETERMINISTIC, reason)
+
+
+@pytest.mark.parametrize("text", [
+    "ST001",
+    "it's st12",
+    "the number is 4",
+    "yes",
+    "Yeah go ahead",
+    "ok",
+    "please reboot it",
+    "restarting didn't help",
+    "thanks, is it online now?",
+    "hi, my connector is stuck",
+])
+def test_tool_intent_goes_to_the_main_model(text):
+    assert classify_turn(turn(text)) == (MAIN, "tool_intent")
+
+
+@pytest.mark.parametrize("text", ["hmm", "the one by the entrance"])
+def test_reply_to_a_question_goes_to_the_main_model(text):
+    assert classify_turn(turn(text, previous="Which site are you at?")) == (MAIN, "answer")
+    assert classify_turn(turn(text)) == (SMALL, "short")
+
+
+def test_reply_after_a_tool_call_goes_to_the_main_model():
+    messages = [
+        SYSTEM,
+        HumanMessage(content="help"),
+        AIMessage(content="", tool_calls=[{"name": "get_station_instructions", "args": {}, "id": "a"}]),
+        ToolMessage(content="{}", tool_call_id="a"),
+        HumanMessage(content="hmm"),
+    ]
+    assert classify_turn(messages) == (MAIN, "answer")
+
+
+def test_long_and_tool_follow_up_turns_go_to_the_main_model():
+    assert classify_turn(turn("I would like to know more about how your company handles invoices")) == (MAIN, "long")
+    assert classify_turn([SYSTEM, HumanMessage(content="hi"), ToolMessage(content="{}", tool_call_id="a")]) == (
+        MAIN, "tool_followup"
+    )
+
+
+def test_canned_replies_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(settings, "llm_cascade_deterministic", False)
+    assert classify_turn(turn("thanks")) == (SMALL, "short")
+
+
+def test_greeting_reply_depends_on_the_conversation():
+    assert deterministic_reply("greeting", [SYSTEM, HumanMessage(content="hi")]).startswith("Welcome")
+    assert deterministic_reply("greeting", turn("hi")).startswith("Hello again")
+
+
+def test_station_number_reply_uses_the_last_known_station():
+    assert deterministic_reply("station_number", turn("what's my station number")) == (
+        f"Please tell me your station ID. {STATION_ID_INSTRUCTIONS}"
+    )
+
+    told = [SYSTEM, HumanMessage(content="It's st004"), AIMessage(content="Checking."), HumanMessage(content="?")]
+    assert deterministic_reply("station_number", told) == "You told me your station number is ST004."
+
+    checked = told[:2] + [
+        AIMessage(content="", tool_calls=[{"name": "check_station_status", "args": {"station_id": "ST002"}, "id": "a"}]),
+        ToolMessage(content="{}", tool_call_id="a"),
+    ]
+    assert deterministic_reply("station_number", checked) == "You told me your station number is ST002."
+
+
+def test_unknown_reason_has_no_reply():
+    with pytest.raises(ValueError):
+        deterministic_reply("short", turn("hmm"))
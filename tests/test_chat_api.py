@@ -0,0 +1,55 @@
+import asyncio
+import json
+from typing import List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.routes import chat
+from src.dependencies import services
+
+
+@pytest.fixture
+def app(fake_backends) -> FastAPI:
+    app = FastAPI()
+    app.include_router(chat.router)
+    return app
+
+
+def contents(response: httpx.Response) -> List[str]:
+    chunks = [line[6:] for line in response.text.splitlines() if line.startswith("data: ")]
+    return [
+        delta["content"]
+        for chunk in chunks if chunk != "[DONE]"
+        for delta in [json.loads(chunk)["choices"][0]["delta"]] if delta.get("content")
+    ]
+
+
+def vapi_body(call_id: str, *utterances: str) -> dict:
+    messages = [{"role": "user", "content": utterance} for utterance in utterances]
+    return {"model": "gpt-4o", "messages": messages, "call": {"id": call_id}}
+
+
+def test_concurrent_vapi_calls_get_their_own_sessions(app, fake_backends):
+    fake_backends.latency_ms = 200
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(
+                client.post("/chat/completions", json=vapi_body("call-a", "Hi", "My connector is stuck"))
+            )
+            # The second caller speaks while the first call's turn is waiting on the model.
+            await asyncio.sleep(0.1)
+            second = await client.post("/chat/completions", json=vapi_body("call-b", "Hello"))
+            return await first, second
+
+    first, second = asyncio.run(run())
+    assert first.status_code == second.status_code == 200
+    assert contents(first) and contents(second)
+    assert sorted(services.agent_sessions) == ["vapi-call-a", "vapi-call-b"]
+
+    # Only the latest utterance is sent on; the call's agent keeps the history itself.
+    history = services.agent_sessions["vapi-call-a"].chat_service.get_session("vapi-call-a").messages
+    assert [message.content for message in history if message.role == "user"] == ["My connector is stuck"]
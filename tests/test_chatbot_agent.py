@@ -0,0 +1,63 @@
+import asyncio
+
+from langchain_core.messages import SystemMessage
+
+from src.agents.chatbot_agent import ChatbotAgent, describe_duration
+from src.config.settings import settings
+from src.loadtest.fake_llm import ScriptedChatModel
+from src.loadtest.fake_station import FakeStationService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+
+STREAM_MODE = ["updates"]
+
+
+def agent() -> ChatbotAgent:
+    return ChatbotAgent("user", "session", settings.llm_provider, LLMService(), ChatService(), FakeStationService())
+
+
+def replies(chatbot: ChatbotAgent, *messages: str) -> list:
+    async def run():
+        for message in messages:
+            async for mode, chunk in chatbot.stream_message(message, STREAM_MODE):
+                assert mode != "error", chunk
+
+    asyncio.run(run())
+    history = chatbot.chat_service.get_session(chatbot.session_id).messages
+    return [message.content for message in history if message.role == "assistant"]
+
+
+def test_describe_duration():
+    assert describe_duration(300) == "5 minutes"
+    assert describe_duration(60) == "1 minute"
+    assert describe_duration(90) == "90 seconds"
+
+
+def test_system_prompt_follows_the_reboot_limit_settings(fake_backends, monkeypatch):
+    monkeypatch.setattr(settings, "reboot_limit", 5)
+    monkeypatch.setattr(settings, "reboot_window_seconds", 120)
+    prompts = []
+    next_message = ScriptedChatModel._next_message
+
+    def recording(self, messages):
+        prompts.extend(message.content for message in messages if isinstance(message, SystemMessage))
+        return next_message(self, messages)
+
+    monkeypatch.setattr(ScriptedChatModel, "_next_message", recording)
+    replies(agent(), "Hello")
+
+    assert any("requested 5 or more reboots in the last 2 minutes" in prompt for prompt in prompts)
+    assert not any("3 or more reboots" in prompt for prompt in prompts)
+
+
+def test_reboots_past_the_limit_are_blocked(fake_backends, monkeypatch):
+    monkeypatch.setattr(settings, "reboot_limit", 1)
+    monkeypatch.setattr(settings, "reboot_window_seconds", 120)
+    chatbot = agent()
+
+    first, second = replies(chatbot, "Reboot station ST001", "Reboot station ST001 again")
+
+    assert first.startswith("Done! Station is rebooting")
+    assert second.startswith("Station reboot attempts are blocked as you have used 1 attempts")
+    assert "2 minutes" in second
+    assert chatbot.station_service.recent_reboots("ST001") == 1
@@ -0,0 +1,89 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, ToolMessage
+from prometheus_client import REGISTRY
+
+from src.agents.chatbot_agent import ChatbotAgent
+from src.agents.deadline import SLOW_REPLY, STILL_CHECKING_REPLY, is_pending
+from src.config.settings import settings
+from src.loadtest.fake_station import FakeStationService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+from src.services.station_event_service import StationEventService
+
+STREAM_MODE = ["updates"]
+
+
+def agent() -> ChatbotAgent:
+    return ChatbotAgent("user", "session", settings.llm_provider, LLMService(), ChatService(), FakeStationService())
+
+
+def misses(stage: str, target: str) -> float:
+    return REGISTRY.get_sample_value("ev_deadline_misses_total", {"stage": stage, "target": target}) or 0.0
+
+
+async def run_turn(chatbot: ChatbotAgent, message: str, budget: float) -> list:
+    return [mode async for mode, _ in chatbot.stream_message(message, STREAM_MODE, budget=budget)]
+
+
+def messages(chatbot: ChatbotAgent) -> list:
+    return chatbot.graph.get_state({"configurable": {"thread_id": "session"}}).values["messages"]
+
+
+def test_slow_model_call_gets_the_degraded_reply(fake_backends):
+    fake_backends.latency_ms = 1000
+    chatbot = agent()
+    before = misses("llm", settings.llm_provider)
+
+    asyncio.run(asyncio.wait_for(run_turn(chatbot, "Hello", budget=0.1), 1))
+
+    assert messages(chatbot)[-1].content == SLOW_REPLY
+    assert chatbot.chat_service.get_session("session").messages[-1].content == SLOW_REPLY
+    assert misses("llm", settings.llm_provider) == before + 1
+
+
+def test_slow_tool_is_answered_as_pending_and_followed_up(fake_backends, monkeypatch):
+    monkeypatch.setattr(settings, "turn_deadline_reserve_ms", 100)
+    chatbot = agent()
+    chatbot.station_service.check_latency = 0.5
+    before = misses("tool", "check_station_status")
+
+    async def run():
+        await run_turn(chatbot, "Is station ST003 online?", budget=0.3)
+        assert StationEventService().drain("session") == []
+        await asyncio.sleep(0.5)
+
+    asyncio.run(run())
+
+    history = messages(chatbot)
+    pending = [message for message in history if isinstance(message, ToolMessage) and is_pending(message)]
+    assert [message.name for message in pending] == ["check_station_status"]
+    assert history[-1].content == STILL_CHECKING_REPLY
+    assert misses("tool", "check_station_status") == before + 1
+    assert StationEventService().drain("session") == [
+        "Result of a check that finished after the reply: station ST003 was online with connector available"
+    ]
+
+
+def test_cancelled_turn_still_finishes_the_reboot(fake_backends):
+    chatbot = agent()
+    stations = chatbot.station_service
+    stations.reboot_latency = 0.2
+
+    async def run():
+        turn = asyncio.create_task(run_turn(chatbot, "Reboot station ST001", budget=10))
+        while chatbot.chat_service.get_reboot_count("session") == 0:
+            await asyncio.sleep(0.01)
+        turn.cancel()
+        await asyncio.wait({turn})
+        assert stations.recent_reboots("ST001") == 0
+        await asyncio.sleep(0.3)
+        return turn
+
+    turn = asyncio.run(run())
+
+    assert turn.cancelled()
+    assert stations.recent_reboots("ST001") == 1
+    assert not any(
+        isinstance(message, AIMessage) and "rebooting" in message.content for message in messages(chatbot)
+    )
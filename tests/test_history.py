@@ -0,0 +1,133 @@
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.agents.history import TOOL_SUMMARY, compact_history
+from src.loadtest.fake_llm import estimate_tokens
+
+SYSTEM = SystemMessage(content="You are an EV charging station assistant.")
+STATUS = {"found": True, "is_online": False, "connector_status": "stuck", "station_id": "ST001",
+          "last_seen": "2026-10-19T07:00:00", "message": "Station ST001 is offline with a stuck connector."}
+
+
+def call(name: str, call_id: str, **args) -> dict:
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+def result(call_id: str, content) -> ToolMessage:
+    return ToolMessage(content=json.dumps(content) if isinstance(content, dict) else content, tool_call_id=call_id)
+
+
+def check_exchange(prefix: str, station_id: str = "ST001") -> list:
+    return [
+        AIMessage(content="", tool_calls=[call("send_checking_message", f"{prefix}-ack")]),
+        result(f"{prefix}-ack", "Checking the station, one moment."),
+        AIMessage(content="", tool_calls=[call("check_station_status", f"{prefix}-check", station_id=station_id)]),
+        result(f"{prefix}-check", {**STATUS, "station_id": station_id}),
+        AIMessage(content=f"Station {station_id} is offline with a stuck connector."),
+    ]
+
+
+def prompt_tokens(messages) -> int:
+    return sum(
+        estimate_tokens(str(msg.content)) + estimate_tokens(json.dumps(getattr(msg, "tool_calls", None) or []))
+        for msg in messages
+    )
+
+
+def summaries(messages) -> list:
+    return [msg.content for msg in messages if isinstance(msg, SystemMessage) and msg.name == TOOL_SUMMARY]
+
+
+def test_parallel_tool_calls_become_one_note():
+    messages = [
+        SYSTEM,
+        HumanMessage(content="Check ST001 and ST002"),
+        AIMessage(content="Checking both.", tool_calls=[
+            call("check_station_status", "a", station_id="ST001"),
+            call("check_site_status", "b", station_id="ST002"),
+        ]),
+        # Results may come back in either order.
+        result("b", {"found": True, "site_id": "SITE1", "message": "2 of 4 stations online"}),
+        result("a", STATUS),
+        AIMessage(content="Done."),
+        HumanMessage(content="Thanks"),
+    ]
+
+    compacted = compact_history(messages)
+
+    assert not any(isinstance(msg, ToolMessage) for msg in compacted)
+    assert compacted[2] == AIMessage(content="Checking both.")
+    assert summaries(compacted) == [
+        "Earlier tool results: station ST001 was offline with connector stuck; "
+        "site SITE1 of station ST002: 2 of 4 stations online"
+    ]
+
+
+def test_call_missing_a_result_is_kept_verbatim():
+    unanswered = AIMessage(content="", tool_calls=[
+        call("check_station_status", "a", station_id="ST001"),
+        call("reboot_station", "b", station_id="ST001"),
+    ])
+    messages = [SYSTEM, HumanMessage(content="Reboot ST001"), unanswered, result("a", STATUS),
+                HumanMessage(content="Hello?")]
+
+    assert compact_history(messages) == messages
+
+
+def test_silent_exchanges_leave_no_note():
+    messages = [
+        SYSTEM,
+        HumanMessage(content="Is ST001 ok?"),
+        AIMessage(content="", tool_calls=[call("send_checking_message", "a")]),
+        result("a", "Checking the station, one moment."),
+        AIMessage(content="", tool_calls=[call("send_rebooting_message", "b"), call("send_checking_message", "c")]),
+        result("b", "Rebooting."),
+        result("c", "Checking."),
+        HumanMessage(content="Still there?"),
+    ]
+
+    assert compact_history(messages) == [SYSTEM, messages[1], messages[-1]]
+
+
+def test_current_turn_is_left_untouched():
+    current = [HumanMessage(content="Is ST002 online?")] + check_exchange("now", "ST002")[:4]
+    messages = [SYSTEM, HumanMessage(content="Is ST001 online?")] + check_exchange("before") + current
+
+    compacted = compact_history(messages)
+
+    assert compacted[-len(current):] == current
+    assert summaries(compacted) == ["Earlier tool results: station ST001 was offline with connector stuck"]
+
+
+def test_consecutive_summaries_are_merged():
+    messages = [
+        SYSTEM,
+        HumanMessage(content="Reboot ST001"),
+        AIMessage(content="", tool_calls=[call("check_station_status", "a", station_id="ST001")]),
+        result("a", STATUS),
+        AIMessage(content="", tool_calls=[call("reboot_station", "b", station_id="ST001")]),
+        result("b", {"success": True, "message": "Reboot started"}),
+        AIMessage(content="Done! Station is rebooting..."),
+        HumanMessage(content="Thanks"),
+    ]
+
+    compacted = compact_history(messages)
+
+    assert summaries(compacted) == [
+        "Earlier tool results: station ST001 was offline with connector stuck; "
+        "station ST001 rebooted: Reboot started"
+    ]
+    assert compacted[-2:] == messages[-2:]
+
+
+def test_compaction_shrinks_the_prompt():
+    messages = [SYSTEM]
+    for index, station_id in enumerate(("ST001", "ST002", "ST003")):
+        messages += [HumanMessage(content=f"Is {station_id} online?")] + check_exchange(str(index), station_id)
+    messages.append(HumanMessage(content="Thanks"))
+
+    compacted = compact_history(messages)
+
+    assert len(compacted) == 11
+    assert prompt_tokens(compacted) < prompt_tokens(messages) / 2
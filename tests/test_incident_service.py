@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from src.agents.chatbot_agent import ChatbotAgent
+from src.config.settings import settings
+from src.loadtest.fake_station import FakeStationService
+from src.services.chat_service import ChatService
+from src.services.incident_service import IncidentService
+from src.services.llm_service import LLMService
+
+
+@pytest.fixture
+def incidents(monkeypatch, tmp_path) -> IncidentService:
+    monkeypatch.setattr(settings, "incident_bucket_seconds", 3600)
+    monkeypatch.setattr(settings, "incident_retention_hours", 48)
+    monkeypatch.setattr(settings, "incident_live_ttl_seconds", 600)
+    monkeypatch.setattr(settings, "incident_snapshot_path", str(tmp_path / "incidents.json"))
+    monkeypatch.setattr(IncidentService, "_instance", None)
+    return IncidentService()
+
+
+def test_outcomes_are_bucketed_per_station_and_site(incidents):
+    now = time.time()
+    incidents.record_check("ST001", "SITE1", "stuck", True, now=now)
+    incidents.record_check("ST002", "SITE1", "error", False, now=now - 3600)
+    incidents.record_reboot("ST001", "SITE1", True, now=now)
+    incidents.record_reboot("ST001", "SITE1", False, now=now)
+
+    report = incidents.report(hours=24)
+    assert report.buckets == 2
+    assert (report.totals.checks, report.totals.stuck, report.totals.error, report.totals.offline) == (2, 1, 1, 1)
+    assert report.totals.reboot_success_rate == 0.5
+    assert report.worst_sites[0].key == "SITE1"
+    assert report.worst_stations[0].key == "ST001"
+
+    station = incidents.report(hours=1, station_id="ST001")
+    assert station.buckets == 1
+    assert (station.totals.checks, station.totals.reboots) == (1, 2)
+
+
+def test_buckets_outside_retention_are_dropped(incidents):
+    now = time.time()
+    incidents.record_check("ST001", None, "stuck", True, now=now - 72 * 3600)
+    incidents.record_check("ST001", None, "available", True, now=now)
+
+    assert incidents.report(hours=24 * 7).totals.checks == 1
+
+
+def test_live_counts_follow_the_latest_check_and_expire(incidents):
+    now = time.time()
+    incidents.record_check("ST001", None, "stuck", True, now=now - 900)
+    incidents.record_check("ST002", None, "stuck", False, now=now)
+    incidents.record_check("ST002", None, "available", True, now=now)
+
+    report = incidents.report()
+    assert (report.live_stuck, report.live_offline, report.live_tracked) == (0, 0, 1)
+
+
+def test_snapshot_round_trip(incidents):
+    incidents.record_check("ST001", "SITE1", "error", True)
+    incidents.record_reboot("ST001", "SITE1", True)
+    asyncio.run(incidents.save())
+    before = incidents.report()
+
+    IncidentService._instance = None
+    restored = IncidentService()
+    assert restored.load()
+    after = restored.report()
+    assert (after.totals, after.live_error) == (before.totals, before.live_error)
+
+
+def test_agent_turns_record_checks_and_reboots(incidents, fake_backends):
+    chatbot = ChatbotAgent(
+        "user", "session", settings.llm_provider, LLMService(), ChatService(), FakeStationService(),
+        incident_service=incidents
+    )
+
+    async def run():
+        for message in ("Is station ST003 online?", "Reboot station ST001"):
+            async for mode, chunk in chatbot.stream_message(message, ["updates"]):
+                assert mode != "error", chunk
+
+    asyncio.run(run())
+
+    report = incidents.report()
+    assert (report.totals.checks, report.totals.stuck, report.totals.reboots) == (2, 1, 1)
+    assert report.totals.reboot_success_rate == 1.0
+    assert [station.key for station in report.worst_stations] == ["ST001"]
+    assert (report.live_stuck, report.live_tracked) == (1, 2)
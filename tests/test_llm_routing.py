@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.config.settings import settings
+from src.dependencies.services import get_or_create_agent
+from src.loadtest.fake_llm import ScriptedChatModel
+from src.loadtest.fake_station import FakeStationService
+from src.services.admission_service import AdmissionService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+from src.services.streaming_service import StreamingService
+from src.services.usage_service import UsageService
+
+BACKUP = "backup"
+
+
+@pytest.fixture
+def routing(fake_backends, monkeypatch) -> LLMService:
+    monkeypatch.setattr(settings, "llm_routing_enabled", True)
+    monkeypatch.setattr(settings, "llm_routing_order", [settings.llm_provider, BACKUP])
+    monkeypatch.setattr(settings, "llm_daily_token_budgets", {})
+    monkeypatch.setattr(settings, "llm_latency_budgets_ms", {})
+    llm_service = LLMService()
+    monkeypatch.setitem(llm_service._clients, BACKUP, ScriptedChatModel(latency_ms=0, tokens_per_second=0))
+    return llm_service
+
+
+def spend(provider: str, tokens: int, seconds: float = 0.1) -> None:
+    UsageService().record("session", provider, SimpleNamespace(usage_metadata={"input_tokens": tokens}), seconds)
+
+
+def routed(source: str, target: str, reason: str) -> float:
+    labels = {"source": source, "target": target, "reason": reason}
+    return REGISTRY.get_sample_value("ev_llm_routed_total", labels) or 0.0
+
+
+def test_spent_token_budget_routes_to_the_next_provider(routing, monkeypatch):
+    provider = settings.llm_provider
+    monkeypatch.setitem(settings.llm_daily_token_budgets, provider, 100)
+    spend(provider, 99)
+    assert routing.route(provider) == provider
+
+    before = routed(provider, BACKUP, "tokens")
+    spend(provider, 1)
+    assert routing.route(provider) == BACKUP
+    assert routed(provider, BACKUP, "tokens") == before + 1
+
+    # With the fallback over budget too, the turn stays where it was.
+    monkeypatch.setitem(settings.llm_daily_token_budgets, BACKUP, 10)
+    spend(BACKUP, 10)
+    assert routing.route(provider) == provider
+
+
+def test_slow_provider_is_routed_around_until_its_average_goes_stale(routing, monkeypatch):
+    provider = settings.llm_provider
+    monkeypatch.setitem(settings.llm_latency_budgets_ms, provider, 500)
+    spend(provider, 1, seconds=2.0)
+    assert routing.route(provider) == BACKUP
+
+    UsageService()._latency_updated_at[provider] -= settings.llm_routing_cooldown_seconds + 1
+    assert routing.route(provider) == provider
+
+
+def test_routing_is_off_by_default(routing, monkeypatch):
+    monkeypatch.setattr(settings, "llm_routing_enabled", False)
+    monkeypatch.setitem(settings.llm_daily_token_budgets, settings.llm_provider, 1)
+    spend(settings.llm_provider, 10)
+    assert routing.route(settings.llm_provider) == settings.llm_provider
+
+
+def test_turn_is_admitted_against_the_provider_it_calls(routing, monkeypatch):
+    provider = settings.llm_provider
+    monkeypatch.setitem(settings.llm_daily_token_budgets, provider, 10)
+    chat_service = ChatService()
+    agent = get_or_create_agent("session", "user", provider, None, routing, chat_service, FakeStationService())
+    spend(provider, 10)
+    service = StreamingService(
+        llm_service=routing, chat_service=chat_service, station_service=FakeStationService(), chatbot_agent=agent
+    )
+    admission = AdmissionService()
+
+    async def run():
+        lease, ticket = await service.admit("Hello")
+        assert admission.stats()[BACKUP]["in_flight"] == 1
+        # Routing changing its mind mid-turn does not move the turn off its lease.
+        monkeypatch.setattr(settings, "llm_routing_enabled", False)
+        return [event async for event in service.turn_events(lease, ticket)]
+
+    events = asyncio.run(run())
+
+    assert events and all(kind == "content" for kind, _ in events)
+    assert provider not in admission.stats()
+    assert admission.stats()[BACKUP]["in_flight"] == 0
+    summary = UsageService().summary()["providers"]
+    assert summary[BACKUP]["requests"] == 1
+    # Only the usage spent above; the turn itself never called the provider over budget.
+    assert summary[provider]["requests"] == 1
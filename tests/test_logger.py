@@ -0,0 +1,39 @@
+import logging
+
+from src.config.settings import settings
+from src.utils import logger as logger_module
+from src.utils.logger import RateLimitFilter, resolve_level, setup_logger
+
+
+def test_invalid_levels_fall_back_with_a_warning(monkeypatch, caplog):
+    monkeypatch.setattr(logger_module, "_invalid_levels", set())
+    monkeypatch.setattr(settings, "log_level", "warning")
+    monkeypatch.setattr(settings, "log_levels", {"src.services": "VERBOSE", "src.services.chat_service": "10"})
+
+    with caplog.at_level(logging.WARNING, logger="src.utils.logger"):
+        assert resolve_level("src.services.chat_service") == logging.DEBUG
+        assert resolve_level("src.services.station_service") == logging.WARNING
+        assert resolve_level("src.services.usage_service") == logging.WARNING
+    assert len(caplog.records) == 1
+    assert "VERBOSE" in caplog.records[0].getMessage()
+
+    monkeypatch.setattr(settings, "log_level", "LOUD")
+    monkeypatch.setattr(settings, "log_levels", {})
+    assert resolve_level("src.api") == logging.INFO
+
+
+def test_only_listed_loggers_are_rate_limited(monkeypatch):
+    monkeypatch.setattr(settings, "log_rate_limited", ["tests.hot"])
+    monkeypatch.setattr(logger_module, "_rate_limit_filter", RateLimitFilter(rate_per_second=1, burst=2))
+
+    hot, quiet = setup_logger("tests.hot.path"), setup_logger("tests.quiet")
+    try:
+        assert logger_module._rate_limit_filter in hot.filters
+        assert not quiet.filters
+
+        records = [logging.LogRecord(hot.name, logging.INFO, "", 0, "chunk %s", (i,), None) for i in range(5)]
+        assert sum(hot.filter(record) for record in records) == 2
+        warning = logging.LogRecord(hot.name, logging.WARNING, "", 0, "chunk %s", (0,), None)
+        assert hot.filter(warning)
+    finally:
+        hot.filters.clear()
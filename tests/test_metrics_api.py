@@ -0,0 +1,15 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from src.api.routes.metrics import router
+
+
+def test_metrics_are_served_in_the_prometheus_text_format():
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE_LATEST
+    assert "ev_turn_duration_seconds" in response.text
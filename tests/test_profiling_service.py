@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from src.config.settings import settings
+from src.services import profiling_service
+from src.services.profiling_service import ProfilingService
+
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path) -> ProfilingService:
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_mode", "sample")
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_keep", 50)
+    monkeypatch.setattr(ProfilingService, "_instance", None)
+    return ProfilingService()
+
+
+@pytest.mark.parametrize("requested, rate, mode", [
+    ("cprofile", 0.0, "cprofile"),
+    (" Sample ", 0.0, "sample"),
+    ("flamegraph", 0.0, "sample"),
+    (None, 0.0, None),
+    (None, 1.0, "sample"),
+])
+def test_choose_honours_requests_and_the_sample_rate(profiling, monkeypatch, requested, rate, mode):
+    monkeypatch.setattr(settings, "profiling_sample_rate", rate)
+    assert ProfilingService.choose(requested) == mode
+
+
+def test_nothing_is_profiled_while_disabled(profiling, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_enabled", False)
+    monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+    assert ProfilingService.choose("sample") is None
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def slow_tool() -> None:
+    await asyncio.sleep(0.05)
+
+
+async def profiled_turn(service: ProfilingService):
+    profile = service.start("session/1", "sample")
+    token = service.activate(profile)
+    try:
+        busy(0.05)
+        await asyncio.create_task(slow_tool())
+    finally:
+        service.deactivate(token)
+    return await service.stop(profile)
+
+
+def names(speedscope: dict, sample: list) -> list:
+    return [speedscope["shared"]["frames"][index]["name"] for index in sample]
+
+
+def test_sampled_turn_is_written_as_speedscope(profiling):
+    path = asyncio.run(profiled_turn(profiling))
+
+    assert path.name.endswith("-session_1.speedscope.json")
+    speedscope = json.loads(path.read_text())
+    (profile,) = speedscope["profiles"]
+    assert profile["type"] == "sampled" and profile["endValue"] >= 100
+    assert len(profile["weights"]) == len(profile["samples"]) > 0
+    stacks = [names(speedscope, sample) for sample in profile["samples"]]
+    # Running code shows its live stack; the awaited tool shows its await chain.
+    assert any("busy" in stack for stack in stacks)
+    assert any(stack[-3:] == ["slow_tool", "sleep", "<awaiting>"] for stack in stacks)
+
+
+def test_without_the_running_task_only_live_stacks_are_kept(profiling, monkeypatch):
+    monkeypatch.setattr(profiling_service, "_CURRENT_TASKS", None)
+
+    speedscope = json.loads(asyncio.run(profiled_turn(profiling)).read_text())
+
+    stacks = [names(speedscope, sample) for sample in speedscope["profiles"][0]["samples"]]
+    assert any("busy" in stack for stack in stacks)
+    assert not any("<awaiting>" in stack for stack in stacks)
+
+
+def test_profiles_are_pruned_and_found_by_exact_name(profiling, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profiling_keep", 2)
+    for age, name in enumerate(["new.speedscope.json", "mid.pstats", "old.speedscope.json"]):
+        path = tmp_path / name
+        path.write_text("{}")
+        os.utime(path, (time.time() - 100 * (age + 1),) * 2)
+    (tmp_path / "notes.txt").write_text("not a profile")
+
+    written = asyncio.run(profiled_turn(profiling))
+
+    assert [profile["name"] for profile in profiling.list_profiles()] == [written.name, "new.speedscope.json"]
+    assert (tmp_path / "notes.txt").exists()
+    assert profiling.get_path("new.speedscope.json") == tmp_path / "new.speedscope.json"
+    assert profiling.get_path("old.speedscope.json") is None
+    assert profiling.get_path("notes.txt") is None
+    assert profiling.get_path("new.speedscope") is None
+    assert profiling.get_path("../new.speedscope.json") is None
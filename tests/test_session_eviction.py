@@ -0,0 +1,119 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.turn_queue import SessionTurnQueue, TurnQueueFull
+from src.config.settings import settings
+from src.dependencies import services
+from src.services.admission_service import AdmissionRejected
+from src.services.chat_service import ChatService
+from src.services.station_event_service import StationEventService
+from src.services.streaming_service import StreamingService
+from src.services.usage_service import UsageService
+
+
+@pytest.fixture
+def chat_service(monkeypatch) -> ChatService:
+    monkeypatch.setattr(settings, "archive_dir", None)
+    monkeypatch.setattr(settings, "session_idle_ttl_seconds", 60)
+    monkeypatch.setattr(ChatService, "_instance", None)
+    monkeypatch.setattr(StationEventService, "_instance", None)
+    monkeypatch.setattr(UsageService, "_instance", None)
+    monkeypatch.setattr(services, "agent_sessions", {})
+    return ChatService()
+
+
+def go_idle(chat_service: ChatService, *session_ids: str) -> None:
+    for session_id in session_ids:
+        chat_service._sessions[session_id].last_active -= 3600
+    chat_service._last_sweep -= 3600
+
+
+def test_held_sessions_are_not_evicted(chat_service):
+    chat_service.create_session("user", "idle")
+    chat_service.hold_session("user", "busy")
+    go_idle(chat_service, "idle", "busy")
+
+    assert chat_service.evict_idle_sessions() == ["idle"]
+    assert chat_service.get_session("busy") is not None
+
+    chat_service.release_session("busy")
+    go_idle(chat_service, "busy")
+    assert chat_service.evict_idle_sessions() == ["busy"]
+
+
+def test_reboot_count_survives_a_sweep_during_a_turn(chat_service):
+    chat_service.hold_session("user", "session")
+    chat_service.increment_reboot_count("session")
+    go_idle(chat_service, "session")
+
+    chat_service.evict_idle_sessions()
+    assert chat_service.get_reboot_count("session") == 1
+    assert chat_service.increment_reboot_count("session")
+
+
+def test_eviction_drops_the_agent_and_per_session_state(chat_service):
+    events = StationEventService()
+    usage = UsageService()
+    for session_id in ("idle", "active"):
+        chat_service.create_session("user", session_id)
+        services.agent_sessions[session_id] = object()
+        events.watch(session_id, "ST001")
+        events.notify(session_id, "Station ST001 went offline.")
+        usage.record(session_id, "openai", None, 0.1)
+    chat_service.hold_session("user", "active")
+    go_idle(chat_service, "idle", "active")
+
+    assert services.evict_idle_sessions(chat_service) == ["idle"]
+    assert list(services.agent_sessions) == ["active"]
+    assert list(events._watchers["ST001"]) == ["active"]
+    assert list(events._pending) == ["active"]
+    assert usage.session_usage("idle") is None
+    assert usage.session_usage("active") is not None
+
+
+class _Admission:
+    def __init__(self, reject: bool = False):
+        self.reject = reject
+        self.released = 0
+
+    async def acquire(self, provider: str, voice: bool = False):
+        if self.reject:
+            raise AdmissionRejected(provider, "queue_full", 1)
+        return SimpleNamespace(release=self.release)
+
+    def release(self) -> None:
+        self.released += 1
+
+
+def streaming(chat_service: ChatService, admission: _Admission, max_depth: int = 4) -> StreamingService:
+    agent = SimpleNamespace(
+        chat_service=chat_service, user_id="user", session_id="session", provider="openai",
+        route_provider=lambda: "openai",
+        turn_queue=SessionTurnQueue("session", max_depth)
+    )
+    return StreamingService(
+        llm_service=None, chat_service=chat_service, station_service=None, chatbot_agent=agent,
+        admission_service=admission
+    )
+
+
+def test_admitted_turn_holds_the_session(chat_service):
+    service = streaming(chat_service, _Admission())
+    asyncio.run(service.admit("hello"))
+    assert chat_service._sessions["session"].in_use == 1
+
+    service._release_session()
+    service._release_session()
+    assert chat_service._sessions["session"].in_use == 0
+
+
+@pytest.mark.parametrize("reject, max_depth, error", [(True, 4, AdmissionRejected), (False, 0, TurnQueueFull)])
+def test_refused_turn_releases_the_session(chat_service, reject, max_depth, error):
+    admission = _Admission(reject=reject)
+    with pytest.raises(error):
+        asyncio.run(streaming(chat_service, admission, max_depth).admit("hello"))
+
+    assert chat_service._sessions["session"].in_use == 0
+    assert admission.released == (0 if reject else 1)
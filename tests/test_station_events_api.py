@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.api.routes import stations
+from src.config.settings import settings
+from src.services.station_event_service import StationEventService
+
+EVENT = {"station_id": "ST001", "kind": "status", "is_online": True, "connector_status": "available"}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(stations.router)
+    return TestClient(app)
+
+
+def test_ingest_is_disabled_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "station_events_token", None)
+
+    assert client.post("/stations/events", json=EVENT).status_code == 503
+    assert client.post("/stations/events", json=EVENT, headers={"X-Station-Events-Token": ""}).status_code == 503
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/stations/events/ws") as websocket:
+            websocket.receive_text()
+
+
+def test_ingest_requires_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "station_events_token", "secret")
+
+    assert client.post("/stations/events", json=EVENT).status_code == 401
+    assert client.post("/stations/events", json=EVENT, headers={"X-Station-Events-Token": "wrong"}).status_code == 401
+
+    response = client.post("/stations/events", json=[EVENT], headers={"X-Station-Events-Token": "secret"})
+    assert response.status_code == 200
+    assert response.json() == {"accepted": 1}
+
+
+def test_notifications_require_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "station_events_token", "secret")
+
+    for headers in ({}, {"X-Station-Events-Token": "wrong"}):
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/stations/notifications/ws?session_id=s1", headers=headers) as websocket:
+                websocket.receive_text()
+
+
+def test_watching_session_is_notified_live(fake_backends, monkeypatch):
+    monkeypatch.setattr(settings, "station_events_token", "secret")
+    headers = {"X-Station-Events-Token": "secret"}
+    app = FastAPI()
+    app.include_router(stations.router)
+    StationEventService().watch("s1", "ST002")
+
+    # One portal, so the listener and the publisher share an event loop.
+    with TestClient(app) as client:
+        with client.websocket_connect("/stations/notifications/ws?session_id=s1", headers=headers) as websocket:
+            event = {"station_id": "ST002", "kind": "status", "is_online": True, "connector_status": "available"}
+            assert client.post("/stations/events", json=event, headers=headers).status_code == 200
+            assert websocket.receive_json() == {
+                "session_id": "s1", "message": "Station ST002 is back online (connector available)."
+            }
+
+
+class _Socket:
+    """Client that sends one frame in the same instant a notification arrives, then leaves."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.headers = {"x-station-events-token": "secret"}
+        self.sent = []
+        self._frames = iter([
+            {"type": "websocket.receive", "text": "ping"},
+            {"type": "websocket.disconnect", "code": 1000},
+        ])
+
+    async def accept(self) -> None:
+        pass
+
+    async def receive(self) -> dict:
+        frame = next(self._frames)
+        if frame["type"] == "websocket.receive":
+            StationEventService().notify(self.session_id, "Station ST001 went offline.")
+        return frame
+
+    async def send_json(self, data: dict) -> None:
+        self.sent.append(data)
+
+
+def test_notification_is_not_dropped_when_the_client_sends_at_once(monkeypatch):
+    monkeypatch.setattr(settings, "station_events_token", "secret")
+    monkeypatch.setattr(StationEventService, "_instance", None)
+    socket = _Socket("s1")
+
+    asyncio.run(stations.session_notifications_ws(socket, "s1", StationEventService()))
+
+    assert socket.sent == [{"session_id": "s1", "message": "Station ST001 went offline."}]
+    assert not StationEventService()._listeners["s1"]
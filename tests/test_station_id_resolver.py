@@ -0,0 +1,53 @@
+import pytest
+
+from src.services.station_id_resolver import StationIdResolver
+from src.services.station_registry import StationRegistry
+
+
+@pytest.fixture
+def resolver() -> StationIdResolver:
+    registry = StationRegistry.from_records(
+        {"station_id": station_id} for station_id in ["ST001", "ST002", "ST003", "ST004", "ST005"]
+    )
+    return StationIdResolver(registry)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("S T zero zero three", "ST003"),
+    ("est 003", "ST003"),
+    ("ST 3", "ST003"),
+    ("st double zero five", "ST005"),
+])
+def test_spoken_ids_are_normalized(resolver, text, expected):
+    assert resolver.normalize_text(text) == expected
+    assert resolver.resolve(text) == expected
+
+
+def test_bare_number_is_annotated(resolver):
+    assert resolver.normalize_text("station three is stuck") == "station three (ST003) is stuck"
+
+
+@pytest.mark.parametrize("station_id", ["ST011", "ST010", "ST051"])
+def test_well_formed_unknown_ids_are_never_fuzzed(resolver, station_id):
+    assert resolver.normalize_text(f"please reboot {station_id}") == f"please reboot {station_id}"
+    assert resolver.resolve(station_id) == station_id
+    assert resolver.summary()["inbound"]["unresolved"] == 1
+
+
+def test_near_miss_is_suggested_not_substituted(resolver):
+    text = resolver.normalize_text("S T zero three zero is stuck")
+
+    assert text.startswith("S T zero three zero (unknown ID, possibly ST003")
+    assert resolver.summary()["inbound"] == {
+        "ambiguous": 1, "attempts": 1, "resolution_rate": 0.0
+    }
+
+
+def test_tools_get_canonical_spelling_for_malformed_unknown_ids(resolver):
+    assert resolver.resolve("st 030") == "ST030"
+    assert resolver.summary()["tool"]["unresolved"] == 1
+
+
+def test_ordinary_words_are_left_alone(resolver):
+    text = "I want to go for a charge at two"
+    assert resolver.normalize_text(text) == text
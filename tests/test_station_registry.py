@@ -0,0 +1,116 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.models.schemas import StationStatus
+from src.services.station_registry import StationRegistry
+
+RECORDS = [
+    {"station_id": "ST001", "site_id": "SITE1", "is_online": "true", "connector_status": "stuck", "last_seen": 100},
+    {"station_id": "ST002", "site_id": "SITE2", "is_online": "0", "connector_status": "Error",
+     "last_seen": "1970-01-01T00:03:20Z"},
+    {"station_id": "ST003", "site_id": "SITE1", "is_online": "yes", "connector_status": "available", "last_seen": ""},
+    {"station_id": "ST004", "site_id": "", "is_online": "no", "connector_status": "melted", "last_seen": 0},
+]
+
+
+def write_csv(path) -> None:
+    lines = ["station_id,site_id,is_online,connector_status,last_seen"]
+    lines += [",".join(str(record[key]) for key in ("station_id", "site_id", "is_online", "connector_status",
+                                                       "last_seen")) for record in RECORDS]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def assert_fleet(registry: StationRegistry) -> None:
+    assert len(registry) == 4
+    first = registry.get("ST001")
+    assert (first.site_id, first.is_online, first.connector_status) == ("SITE1", True, "stuck")
+    assert first.last_seen == datetime.fromtimestamp(100)
+    second = registry.get("ST002")
+    assert (second.is_online, second.connector_status, second.last_seen) == (False, "error", datetime.fromtimestamp(200))
+    # Unknown statuses are kept as errors; an empty site is no site.
+    assert registry.get("ST004").connector_status == "error"
+    assert registry.get("ST004").site_id is None
+    assert registry.get("ST999") is None
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_fleet_exports_load(tmp_path, suffix):
+    path = tmp_path / f"fleet{suffix}"
+    if suffix == ".csv":
+        write_csv(path)
+    else:
+        path.write_text("\n".join(json.dumps(record) for record in RECORDS) + "\n\n")
+
+    assert_fleet(StationRegistry.from_file(str(path)))
+
+
+def test_unknown_export_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported fleet export format"):
+        StationRegistry.from_file(str(tmp_path / "fleet.xlsx"))
+
+
+def test_long_and_non_ascii_ids_are_kept_whole():
+    registry = StationRegistry.from_records([
+        {"station_id": "SITE-NORTH-CHARGER-000001-A"},
+        {"station_id": "SITE-NORTH-CHARGER-000001-B"},
+        {"station_id": "ŁÓDŹ-01"},
+    ])
+    assert registry.row("SITE-NORTH-CHARGER-000001-A") == 0
+    assert registry.row("SITE-NORTH-CHARGER-000001-B") == 1
+    assert registry.get("ŁÓDŹ-01").station_id == "ŁÓDŹ-01"
+    assert registry.station_ids() == ["SITE-NORTH-CHARGER-000001-A", "SITE-NORTH-CHARGER-000001-B", "ŁÓDŹ-01"]
+
+
+def test_site_and_status_indexes_follow_updates():
+    registry = StationRegistry.from_records(RECORDS)
+    assert sorted(registry.site_rows("SITE1").tolist()) == [0, 2]
+    assert registry.site_rows("SITE9").size == 0
+    assert registry.status_rows("stuck") == {0}
+    assert registry.status_rows("error") == {1, 3}
+
+    status = registry.update("ST001", is_online=False, connector_status="available", last_seen=datetime.fromtimestamp(500))
+    assert (status.is_online, status.connector_status, status.last_seen) == (False, "available", datetime.fromtimestamp(500))
+    assert registry.status_rows("stuck") == set()
+    assert registry.status_rows("available") == {0, 2}
+    assert registry.update("ST999", is_online=True) is None
+
+
+def test_added_stations_join_every_index():
+    registry = StationRegistry.from_records(RECORDS)
+    registry.status_rows("stuck")
+    registry.row("ST001")
+
+    registry.add(StationStatus(
+        station_id="SITE-SOUTH-CHARGER-000042-LONG", site_id="SITE3", is_online=True, connector_status="stuck",
+        last_seen=datetime.fromtimestamp(300)
+    ))
+    assert registry.row("SITE-SOUTH-CHARGER-000042-LONG") == 4
+    assert registry.get("ST001").station_id == "ST001"
+    assert registry.status_rows("stuck") == {0, 4}
+    assert registry.site_rows("SITE3").tolist() == [4]
+
+
+def test_cache_round_trip_is_memory_mapped(tmp_path):
+    export = tmp_path / "fleet.csv"
+    write_csv(export)
+    cache = tmp_path / "cache"
+
+    loaded = StationRegistry.load(str(export), str(cache))
+    assert (cache / "sites.json").exists()
+
+    cached = StationRegistry.load(str(export), str(cache))
+    assert isinstance(cached.ids, np.memmap)
+    assert_fleet(cached)
+    assert cached.sites == loaded.sites
+
+    # Updates stay in memory; the cache files are opened copy-on-write.
+    cached.update("ST001", connector_status="available")
+    assert StationRegistry.open(str(cache)).get("ST001").connector_status == "stuck"
+
+    # A newer export invalidates the cache.
+    os.utime(export, (os.path.getmtime(cache / "sites.json") + 10,) * 2)
+    assert not isinstance(StationRegistry.load(str(export), str(cache)).ids, np.memmap)
@@ -0,0 +1,33 @@
+import asyncio
+
+from src.loadtest.fake_station import FAKE_STATION_PROFILES, FakeStationService
+from src.models.schemas import RebootRequest
+from src.services.station_registry import StationRegistry
+from src.services.station_service import StationService
+
+
+def test_injected_registry_replaces_the_configured_one(monkeypatch):
+    monkeypatch.setattr(StationService, "_instance", None)
+    registry = StationRegistry.from_records(
+        [{"station_id": "ST100", "is_online": True, "connector_status": "available", "last_seen": 0}]
+    )
+
+    service = StationService(registry)
+    assert service.registry is registry
+    assert service.id_resolver.resolve("ST100") == "ST100"
+    assert StationService() is service
+
+
+def test_fake_backend_is_a_station_service(monkeypatch):
+    monkeypatch.setattr(FakeStationService, "_instance", None)
+    monkeypatch.setattr(StationService, "_instance", None)
+
+    service = FakeStationService()
+    assert StationService._instance is None
+    assert len(service.registry) == len(FAKE_STATION_PROFILES)
+    assert all(station_id in service.registry for station_id in FAKE_STATION_PROFILES)
+
+    service.check_latency = service.reboot_latency = 0
+    response = asyncio.run(service.reboot_station(RebootRequest(station_id="ST001")))
+    assert response.success
+    assert service.recent_reboots("ST001") == 1
@@ -0,0 +1,154 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+from starlette.requests import ClientDisconnect
+
+from src.agents.turn_queue import SessionTurnQueue
+from src.config.settings import settings
+from src.dependencies.services import get_or_create_agent
+from src.loadtest.fake_station import FakeStationService
+from src.models.schemas import LLMRequest
+from src.services.admission_service import AdmissionService
+from src.services.chat_service import ChatService
+from src.services.llm_service import LLMService
+from src.services.streaming_service import StreamingService
+
+SCOPE = {"type": "http", "asgi": {"spec_version": "2.4"}}
+
+
+@pytest.fixture
+def admission(monkeypatch) -> AdmissionService:
+    monkeypatch.setattr(settings, "admission_max_concurrency", 1)
+    monkeypatch.setattr(settings, "admission_provider_limits", {})
+    monkeypatch.setattr(settings, "admission_max_queue", 0)
+    monkeypatch.setattr(AdmissionService, "_instance", None)
+    monkeypatch.setattr(ChatService, "_instance", None)
+    return AdmissionService()
+
+
+def streaming(admission: AdmissionService) -> StreamingService:
+    chat_service = ChatService()
+    agent = SimpleNamespace(
+        chat_service=chat_service, user_id="user", session_id="session", provider="openai",
+        route_provider=lambda: "openai",
+        turn_queue=SessionTurnQueue("session", 4)
+    )
+    return StreamingService(
+        llm_service=None, chat_service=chat_service, station_service=None, chatbot_agent=agent,
+        admission_service=admission
+    )
+
+
+def request() -> LLMRequest:
+    return LLMRequest(messages=[{"role": "user", "content": "Is station ST001 online?"}])
+
+
+async def receive():
+    return {"type": "http.disconnect"}
+
+
+async def gone(message):
+    raise OSError("client went away")
+
+
+def test_turn_is_released_when_the_stream_never_starts(admission):
+    service = streaming(admission)
+
+    async def run():
+        response = await service.streaming_chat(request())
+        assert admission.stats()["openai"]["in_flight"] == 1
+        assert service.chatbot_agent.turn_queue.depth == 1
+        with pytest.raises(ClientDisconnect):
+            await response(SCOPE, receive, gone)
+
+    asyncio.run(run())
+
+    assert admission.stats()["openai"]["in_flight"] == 0
+    assert service.chatbot_agent.turn_queue.depth == 0
+    assert service.chat_service._sessions["session"].in_use == 0
+
+
+def test_busy_provider_is_refused_up_front(admission):
+    first, second = streaming(admission), streaming(admission)
+
+    async def run():
+        await first.streaming_chat(request())
+        with pytest.raises(HTTPException) as refused:
+            await second.streaming_chat(request())
+        return refused.value
+
+    refused = asyncio.run(run())
+    assert refused.status_code == 429
+    assert "Retry-After" in refused.headers
+    assert admission.stats()["openai"]["shed"] == {"queue_full": 1}
+    assert first.chat_service._sessions["session"].in_use == 1
+
+
+def test_full_turn_queue_asks_the_client_to_retry(admission):
+    service = streaming(admission)
+    service.chatbot_agent.turn_queue.max_depth = 0
+
+    with pytest.raises(HTTPException) as refused:
+        asyncio.run(service.streaming_chat(request()))
+
+    assert refused.value.status_code == 429
+    assert refused.value.headers["Retry-After"] == "1"
+    assert admission.stats()["openai"]["in_flight"] == 0
+
+
+class _Request:
+    """Stands in for the HTTP request; the client goes away after ``polls`` disconnect checks."""
+
+    def __init__(self, polls: int):
+        self.polls = polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls -= 1
+        return self.polls < 0
+
+
+def cancellations(reason: str) -> float:
+    return REGISTRY.get_sample_value("ev_turn_cancellations_total", {"reason": reason}) or 0.0
+
+
+def test_client_disconnect_cancels_the_graph(fake_backends, monkeypatch):
+    monkeypatch.setattr(settings, "disconnect_poll_interval_ms", 10)
+    fake_backends.latency_ms = 5000
+    chat_service = ChatService()
+    agent = get_or_create_agent(
+        "session", "user", settings.llm_provider, None, LLMService(), chat_service, FakeStationService()
+    )
+    graph_tasks = []
+    stream_message = agent.stream_message
+
+    async def recording(*args, **kwargs):
+        graph_tasks.append(asyncio.current_task())
+        async for item in stream_message(*args, **kwargs):
+            yield item
+
+    monkeypatch.setattr(agent, "stream_message", recording)
+    service = StreamingService(
+        llm_service=LLMService(), chat_service=chat_service, station_service=FakeStationService(),
+        chatbot_agent=agent, http_request=_Request(polls=3)
+    )
+    before = cancellations("disconnect")
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        response = await service.streaming_chat(request())
+        await asyncio.wait_for(response(SCOPE, receive, send), 2)
+
+    asyncio.run(run())
+
+    assert service.cancelled
+    assert len(graph_tasks) == 1 and graph_tasks[0].cancelled()
+    assert agent.turn_queue.active_task is None
+    assert cancellations("disconnect") == before + 1
+    assert [message.role for message in chat_service.get_session("session").messages] == ["user"]
+    assert b"[DONE]" not in b"".join(message.get("body", b"") for message in sent)
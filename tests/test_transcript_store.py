@@ -0,0 +1,45 @@
+import pytest
+
+from src.config.settings import settings
+from src.services.transcript_store import Transcript
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(settings, "transcript_live_messages", 4)
+    monkeypatch.setattr(settings, "transcript_compress_batch", 3)
+
+
+def filled(count: int) -> Transcript:
+    transcript = Transcript()
+    for i in range(count):
+        transcript.append("user" if i % 2 == 0 else "assistant", f"message {i}", timestamp=float(i))
+    return transcript
+
+
+def test_oldest_messages_are_compressed_in_batches():
+    transcript = filled(10)
+    assert len(transcript) == 10
+    assert transcript._compressed == 6
+    assert len(transcript._blocks) == 2
+    assert len(transcript._contents) == 4
+
+
+def test_compressed_messages_read_back_in_order():
+    entries = list(filled(10))
+    assert [entry.content for entry in entries] == [f"message {i}" for i in range(10)]
+    assert [entry.timestamp for entry in entries] == [float(i) for i in range(10)]
+    assert [entry.role for entry in entries[:2]] == ["user", "assistant"]
+    assert filled(10).to_messages()[0].content == "message 0"
+
+
+@pytest.mark.parametrize("count", [0, 2, 4, 7, 10])
+def test_tail_spans_live_and_compressed_messages(count):
+    assert [entry.content for entry in filled(10).tail(count)] == [f"message {i}" for i in range(10 - count, 10)]
+
+
+def test_compression_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(settings, "transcript_live_messages", 0)
+    transcript = filled(10)
+    assert transcript._compressed == 0
+    assert len(transcript._contents) == 10
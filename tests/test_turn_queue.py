@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.agents.turn_queue import SessionTurnQueue, TurnQueueFull
+
+
+def test_waiting_utterances_fold_into_the_newest_turn():
+    async def run():
+        queue = SessionTurnQueue("session", max_depth=4)
+        first = queue.submit("my station is stuck")
+        async with queue.turn(first) as text:
+            assert text == "my station is stuck"
+            tickets = [queue.submit(utterance) for utterance in ("it's ST001", "actually ST002")]
+
+            async def take(ticket):
+                async with queue.turn(ticket) as text:
+                    return text
+
+            waiting = [asyncio.create_task(take(ticket)) for ticket in tickets]
+            await asyncio.sleep(0)
+        return await asyncio.gather(*waiting), queue.depth
+
+    texts, depth = asyncio.run(run())
+    assert texts == [None, "it's ST001\nactually ST002"]
+    assert depth == 0
+
+
+def test_new_utterance_supersedes_the_turn_in_flight():
+    async def run():
+        queue = SessionTurnQueue("session", max_depth=4)
+        queue.active_task = asyncio.create_task(asyncio.sleep(10))
+        queue.submit("reboot ST001")
+        with pytest.raises(asyncio.CancelledError):
+            await queue.active_task
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_and_discarded_tickets_leave_it():
+    queue = SessionTurnQueue("session", max_depth=2)
+    ticket = queue.submit("one")
+    queue.submit("two")
+    with pytest.raises(TurnQueueFull):
+        queue.submit("three")
+
+    queue.discard(ticket)
+    queue.discard(ticket)
+    assert queue.depth == 1
+    queue.submit("three")
+
+
+def test_cancelled_waiter_gives_up_its_ticket():
+    async def run():
+        queue = SessionTurnQueue("session", max_depth=4)
+        async with queue.turn(queue.submit("first")):
+            ticket = queue.submit("second")
+
+            async def take():
+                async with queue.turn(ticket):
+                    pass
+
+            waiter = asyncio.create_task(take())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            return queue.depth
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.usage_service import UsageService, extract_usage
+
+
+@pytest.fixture
+def usage(monkeypatch) -> UsageService:
+    monkeypatch.setattr(UsageService, "_instance", None)
+    return UsageService()
+
+
+def response(input_tokens: int, output_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens})
+
+
+def test_usage_is_read_from_either_response_shape():
+    assert extract_usage(response(12, 3)) == (12, 3)
+    openai_style = SimpleNamespace(
+        usage_metadata=None, response_metadata={"token_usage": {"prompt_tokens": 7, "completion_tokens": 2}}
+    )
+    assert extract_usage(openai_style) == (7, 2)
+    assert extract_usage(SimpleNamespace(response_metadata={"usage": {"input_tokens": 5}})) == (5, 0)
+    assert extract_usage(None) == (0, 0)
+
+
+def test_calls_are_totalled_per_session_provider_scenario_and_day(usage):
+    usage.record("a", "openai", response(100, 20), 1.0, scenario="reboot")
+    usage.record("a", "groq", response(50, 10), 0.5)
+    usage.record("b", "openai", response(30, 5), 2.0, scenario="reboot")
+
+    assert usage.session_usage("a") == {
+        "requests": 2, "input_tokens": 150, "output_tokens": 30, "total_tokens": 180, "llm_seconds": 1.5
+    }
+    assert usage.tokens_today("openai") == 155
+    assert usage.tokens_today("ollama") == 0
+
+    summary = usage.summary()
+    assert summary["providers"]["openai"]["requests"] == 2
+    assert summary["providers"]["groq"]["total_tokens"] == 60
+    assert summary["scenarios"] == {"reboot": {
+        "requests": 2, "input_tokens": 130, "output_tokens": 25, "total_tokens": 155, "llm_seconds": 3.0
+    }}
+    (day,) = summary["days"]
+    assert summary["days"][day]["openai"]["total_tokens"] == 155
+    assert summary["sessions"] == 2
+
+    usage.forget_session("a")
+    assert usage.session_usage("a") is None
+    # Provider and daily totals outlive the session.
+    assert usage.tokens_today("groq") == 60
+
+
+def test_latency_is_a_moving_average_that_goes_stale(usage):
+    assert usage.latency("openai") is None
+    usage.record("a", "openai", None, 1.0)
+    usage.record("a", "openai", None, 2.0)
+    assert usage.latency("openai") == pytest.approx(1.2)
+    assert usage.summary()["latency_ewma_seconds"] == {"openai": 1.2}
+
+    usage._latency_updated_at["openai"] -= 120
+    assert usage.latency("openai", max_age=60) is None
+    assert usage.latency("openai") == pytest.approx(1.2)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from vapi import Vapi
+
+from src.api.routes import chat
+from src.config.settings import settings
+from src.loadtest.fake_vapi import FakeVapiApi
+from src.services.vapi_service import VapiService
+
+FAKE_VAPI_URL = "http://fake-vapi"
+ASSISTANTS = 25
+
+
+@pytest.fixture
+def fake_vapi(monkeypatch) -> FakeVapiApi:
+    monkeypatch.setattr(settings, "vapi_page_size", 10)
+    monkeypatch.setattr(settings, "vapi_assistant_name", "EV Support")
+    monkeypatch.setattr(settings, "vapi_custom_llm_url", "http://localhost:8000/chat")
+    monkeypatch.setattr(VapiService, "_instance", None)
+    fake = FakeVapiApi(assistants=ASSISTANTS)
+    # The same client VapiService builds, with its HTTP calls served in-process by the stub.
+    VapiService()._client = Vapi(
+        token="test", base_url=FAKE_VAPI_URL, httpx_client=TestClient(fake.build_app(), base_url=FAKE_VAPI_URL)
+    )
+    return fake
+
+
+def post(path: str, **params) -> httpx.Response:
+    app = FastAPI()
+    app.include_router(chat.router)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, params=params)
+
+    return asyncio.run(run())
+
+
+def test_pages_follow_the_cursor_to_the_end(fake_vapi):
+    names, cursor = [], None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        page = post("/chat/load_assistants", **params).json()
+        names += [assistant["name"] for assistant in page["names"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert names == [f"assistant-{index:05d}" for index in reversed(range(ASSISTANTS))]
+    assert fake_vapi.list_calls == 3
+
+
+def test_streamed_listing_is_one_page_per_line(fake_vapi):
+    response = post("/chat/load_assistants", stream="true", limit=10)
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    pages = [json.loads(line) for line in response.text.splitlines()]
+    assert [len(page["names"]) for page in pages] == [10, 10, 5]
+    assert [page["next_cursor"] is None for page in pages] == [False, False, True]
+    assert datetime.fromisoformat(pages[0]["next_cursor"]) > datetime.fromisoformat(pages[1]["next_cursor"])
+
+
+def test_name_index_is_reused_until_its_ttl_expires(fake_vapi):
+    service = VapiService()
+
+    async def run():
+        first = await service.find_assistant_id("assistant-00003")
+        assert fake_vapi.list_calls == 3
+        assert await service.find_assistant_id("assistant-00003") == first
+        assert await service.find_assistant_id("assistant-00007") is not None
+        assert fake_vapi.list_calls == 3
+
+        service._index_loaded_at -= settings.vapi_index_ttl_seconds
+        assert await service.find_assistant_id("assistant-00003") == first
+        assert fake_vapi.list_calls == 6
+
+    asyncio.run(run())
+
+
+def test_created_assistant_is_found_without_a_reload(fake_vapi):
+    service = VapiService()
+
+    async def run():
+        created = await service.create_new_assistant()
+        list_calls = fake_vapi.list_calls
+        assert await service.find_assistant_id("EV Support") == created.id
+        assert (await service.create_new_assistant()).id == created.id
+        return created, list_calls
+
+    created, list_calls = asyncio.run(run())
+
+    assert created.name == "EV Support"
+    assert fake_vapi.create_calls == 1
+    assert fake_vapi.list_calls == list_calls
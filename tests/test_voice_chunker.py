@@ -0,0 +1,37 @@
+from src.utils.voice_chunker import SentenceChunker
+
+
+def test_sentences_are_cut_as_soon_as_they_end():
+    chunker = SentenceChunker()
+    assert chunker.push("Station ST001 is onl") == []
+    assert chunker.push("ine. It was last seen ") == ["Station ST001 is online."]
+    assert chunker.pending
+    assert chunker.flush() == "It was last seen"
+    assert not chunker.pending
+
+
+def test_short_sentences_wait_for_more_text():
+    chunker = SentenceChunker(min_chars=10)
+    assert chunker.push("Done! ") == []
+    assert chunker.push("Station is rebooting. ") == ["Done! Station is rebooting."]
+
+
+def test_long_clauses_are_cut_at_punctuation():
+    chunker = SentenceChunker(clause_min_chars=30)
+    assert chunker.push("The connector reported an error, ") == ["The connector reported an error,"]
+    assert chunker.push("so, ") == []
+
+
+def test_run_on_text_is_cut_at_a_word_boundary():
+    chunker = SentenceChunker(max_chars=40)
+    pieces = chunker.push("word " * 20)
+    assert pieces
+    assert all(len(piece) <= 40 and not piece.endswith("wor") for piece in pieces)
+
+
+def test_partial_flush_keeps_the_unfinished_word():
+    chunker = SentenceChunker(min_chars=10)
+    chunker.push("Checking station ST0")
+    assert chunker.flush_partial() == "Checking station"
+    assert chunker.flush() == "ST0"
+    assert chunker.flush_partial() is None
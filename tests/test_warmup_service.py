@@ -0,0 +1,44 @@
+import asyncio
+import copy
+
+from src.config.settings import settings
+from src.loadtest.fake_station import FakeStationService
+from src.services.archive_service import ArchiveService
+from src.services.cascade_service import CascadeService
+from src.services.chat_service import ChatService
+from src.services.incident_service import IncidentService
+from src.services.llm_service import LLMService
+from src.services.station_event_service import StationEventService
+from src.services.usage_service import UsageService
+from src.services.warmup_service import WARMUP_PROVIDER, WarmupService
+
+
+def shared_state() -> dict:
+    station_service = FakeStationService()
+    events = StationEventService()
+    return copy.deepcopy({
+        "usage": UsageService().summary(),
+        "cascade": CascadeService().summary(),
+        "incidents": IncidentService().snapshot(),
+        "sessions": sorted(ChatService()._sessions),
+        "watchers": dict(events._watchers),
+        "pending": {session: list(updates) for session, updates in events._pending.items()},
+        "stations": sorted(station_service._stations),
+        "resolver": dict(station_service.id_resolver.stats),
+        "archive_queue": ArchiveService()._queue.qsize(),
+    })
+
+
+def test_dry_run_leaves_shared_services_untouched(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "warmup_dry_run", True)
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "llm_cascade_enabled", True)
+    monkeypatch.setattr(settings, "llm_cascade_providers", [])
+    before = shared_state()
+
+    detail = asyncio.run(WarmupService()._warm_agent())
+
+    assert detail["dry_run"] is True and detail["chunks"] > 0
+    assert shared_state() == before
+    assert WARMUP_PROVIDER not in LLMService()._clients
+    assert not list(tmp_path.iterdir())
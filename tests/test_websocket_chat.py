@@ -0,0 +1,111 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import chat
+from src.services.streaming_service import StreamingService
+
+FINAL_FRAMES = {"done", "cancelled", "error"}
+
+
+@pytest.fixture
+def client(fake_backends) -> TestClient:
+    app = FastAPI()
+    app.include_router(chat.router)
+    return TestClient(app)
+
+
+def until_final(websocket, turn_id: str) -> list:
+    """Frames received up to and including the final frame of ``turn_id``."""
+    frames = []
+    while True:
+        frame = websocket.receive_json()
+        frames.append(frame)
+        if frame["type"] in FINAL_FRAMES and frame.get("turn_id") == turn_id:
+            return frames
+
+
+def text(frames: list, turn_id: str) -> str:
+    return "".join(frame["content"] for frame in frames if frame["type"] == "delta" and frame["turn_id"] == turn_id)
+
+
+def message(content: str, turn_id: str) -> dict:
+    return {"type": "message", "content": content, "turn_id": turn_id}
+
+
+def test_turns_share_one_connection(client):
+    with client.websocket_connect("/chat/ws?session_id=ws-session") as websocket:
+        assert websocket.receive_json()["type"] == "session"
+
+        websocket.send_json(message("Hello", "1"))
+        first = until_final(websocket, "1")
+        websocket.send_json(message("Is station ST003 online?", "2"))
+        second = until_final(websocket, "2")
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
+
+    assert first[-1] == {"type": "done", "turn_id": "1"}
+    assert text(first, "1").startswith("Welcome")
+    assert second[-1] == {"type": "done", "turn_id": "2"}
+    assert any(frame["type"] == "intermediate" for frame in second)
+    assert "ST003" in text(second, "2")
+
+
+def test_cancel_stops_the_running_turn(client, fake_backends):
+    fake_backends.latency_ms = 2000
+    with client.websocket_connect("/chat/ws") as websocket:
+        websocket.receive_json()
+        websocket.send_json(message("Hello", "1"))
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
+        websocket.send_json({"type": "cancel"})
+        assert until_final(websocket, "1") == [{"type": "cancelled", "turn_id": "1"}]
+
+
+def test_newer_message_supersedes_the_running_turn(client, fake_backends):
+    fake_backends.latency_ms = 300
+    with client.websocket_connect("/chat/ws") as websocket:
+        websocket.receive_json()
+        websocket.send_json(message("Hello", "1"))
+        websocket.send_json({"type": "ping"})
+        websocket.receive_json()
+        websocket.send_json(message("Is station ST003 online?", "2"))
+        frames = until_final(websocket, "2")
+
+    assert {"type": "cancelled", "turn_id": "1"} in frames
+    assert not text(frames, "1")
+    assert frames[-1] == {"type": "done", "turn_id": "2"}
+    assert "ST003" in text(frames, "2")
+
+
+def test_reused_turn_id_is_refused_while_the_turn_runs(client, fake_backends):
+    fake_backends.latency_ms = 300
+    with client.websocket_connect("/chat/ws") as websocket:
+        websocket.receive_json()
+        websocket.send_json(message("Hello", "1"))
+        websocket.send_json(message("Hello again", "1"))
+        refused = websocket.receive_json()
+        frames = until_final(websocket, "1")
+
+        # Once the turn is over its id may be used again.
+        fake_backends.latency_ms = 0
+        websocket.send_json(message("Thanks", "1"))
+        again = until_final(websocket, "1")
+
+    assert refused["type"] == "error" and refused["status"] == 409
+    assert frames[-1] == {"type": "done", "turn_id": "1"}
+    assert again[-1] == {"type": "done", "turn_id": "1"}
+
+
+def test_unexpected_failure_ends_the_turn_with_an_error(client, monkeypatch):
+    async def failing(self, lease, ticket):
+        raise RuntimeError("graph exploded")
+        yield
+
+    monkeypatch.setattr(StreamingService, "turn_events", failing)
+    with client.websocket_connect("/chat/ws") as websocket:
+        websocket.receive_json()
+        websocket.send_json(message("Hello", "1"))
+        frames = until_final(websocket, "1")
+
+    assert frames == [{"type": "error", "turn_id": "1", "status": 500, "detail": "graph exploded"}]